@@ -1,16 +1,46 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 class DescriptivePlotter:
-    def __init__(self, df):
+    def __init__(self, df, registry=None, weights=None):
         self.df = df
+        # Optional scripts.EDA_src.ConstructRegistry built for df's schema
+        self.registry = registry
+        # Optional survey weights aligned with df (e.g. scripts.EDA_src.rake_weights);
+        # counts become weighted totals
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+
+    def _value_counts(self, column):
+        if self.weights is None:
+            return self.df[column].value_counts().sort_index()
+        codes, levels = pd.factorize(self.df[column], sort=True)
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], weights=self.weights[valid], minlength=len(levels))
+        return pd.Series(counts, index=levels)
+
+    def _column_totals(self, columns):
+        if self.weights is None:
+            return self.df[columns].sum()
+        return pd.Series(self.weights @ self.df[columns].to_numpy(dtype=np.float64), index=columns)
+
+    def _total(self):
+        return len(self.df) if self.weights is None else self.weights.sum()
+
+    def _prefix_columns(self, prefix):
+        if self.registry is not None:
+            try:
+                return self.registry.prefix_columns(prefix)
+            except KeyError:
+                pass
+        return [col for col in self.df.columns if col.startswith(prefix)]
 
     def plot_gender_distribution(self):
         if 'gender_encoded' not in self.df.columns:
             print("Error: 'gender_encoded' column not found.")
             return
 
-        counts = self.df['gender_encoded'].value_counts().sort_index()
+        counts = self._value_counts('gender_encoded')
         labels = ["Male", "Female", "Prefer not to Say"]
 
         fig, ax = plt.subplots(figsize=(6, 4))
@@ -23,7 +53,7 @@ class DescriptivePlotter:
 
         for bar in bars:
             height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(height),
+            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(round(height)),
                     ha='center', va='bottom', fontsize=10)
         plt.tight_layout()
         plt.show()
@@ -33,7 +63,7 @@ class DescriptivePlotter:
             print("Error: 'age_encoded' column not found.")
             return
 
-        counts = self.df['age_encoded'].value_counts().sort_index()
+        counts = self._value_counts('age_encoded')
         labels = ["18-25", "25-35", "35-45", "45-55"]
 
         fig, ax = plt.subplots(figsize=(6, 4))
@@ -46,7 +76,7 @@ class DescriptivePlotter:
 
         for bar in bars:
             height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(height),
+            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(round(height)),
                     ha='center', va='bottom', fontsize=10)
         plt.tight_layout()
         plt.show()
@@ -56,7 +86,12 @@ class DescriptivePlotter:
             print("Error: Required columns not found.")
             return
 
-        age_gender_counts = self.df.groupby(['age_encoded', 'gender_encoded']).size().unstack(fill_value=0)
+        if self.weights is None:
+            age_gender_counts = self.df.groupby(['age_encoded', 'gender_encoded']).size().unstack(fill_value=0)
+        else:
+            age_gender_counts = (pd.Series(self.weights, index=self.df.index)
+                                 .groupby([self.df['age_encoded'], self.df['gender_encoded']]).sum()
+                                 .unstack(fill_value=0))
         age_labels = ["18-25", "25-35", "35-45", "45-55"]
         gender_labels = ["Male", "Female", "Prefer not to Say"]
         colors = ['skyblue', 'orchid', 'lightgreen']
@@ -74,13 +109,13 @@ class DescriptivePlotter:
         plt.show()
 
     def plot_occupation_distribution(self, prefix='prof_'):
-        job_cols = [col for col in self.df.columns if col.startswith(prefix)]
+        job_cols = self._prefix_columns(prefix)
         if not job_cols:
             print(f"No columns with prefix '{prefix}' found.")
             return
 
-        counts = self.df[job_cols].sum().sort_values(ascending=False)
-        total = len(self.df)
+        counts = self._column_totals(job_cols).sort_values(ascending=False)
+        total = self._total()
         percentages = (counts / total * 100).round(2)
 
         clean_labels = [col.replace(prefix, '').replace('_', ' ').capitalize() for col in counts.index]
@@ -93,7 +128,7 @@ class DescriptivePlotter:
 
         for bar in bars:
             height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(height),
+            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(round(height)),
                     ha='center', va='bottom', fontsize=9)
 
         plt.tight_layout()
@@ -101,16 +136,16 @@ class DescriptivePlotter:
 
         print("\nOccupation Counts and Percentages:")
         for label, count, pct in zip(clean_labels, counts, percentages):
-            print(f"{label}: {int(count)} ({pct}%)")
+            print(f"{label}: {int(round(count))} ({pct}%)")
 
     def plot_multilabel_platform(self, prefix, title):
-        platform_cols = [col for col in self.df.columns if col.startswith(prefix)]
+        platform_cols = self._prefix_columns(prefix)
         if not platform_cols:
             print(f"No columns with prefix '{prefix}' found.")
             return
 
-        counts = self.df[platform_cols].sum().sort_values(ascending=False)
-        total_rows = len(self.df)
+        counts = self._column_totals(platform_cols).sort_values(ascending=False)
+        total_rows = self._total()
         percentages = (counts / total_rows * 100).round(2)
 
         def clean_name(col):
@@ -126,7 +161,7 @@ class DescriptivePlotter:
 
         for bar in bars:
             height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(height),
+            ax.text(bar.get_x() + bar.get_width()/2.0, height, int(round(height)),
                     ha='center', va='bottom', fontsize=9)
 
         plt.tight_layout()
@@ -134,7 +169,7 @@ class DescriptivePlotter:
 
         print(f"\n{title} Platform Counts and Percentages:")
         for label, count, pct in zip(clean_labels, counts, percentages):
-            print(f"{label}: {int(count)} ({pct}%)")
+            print(f"{label}: {int(round(count))} ({pct}%)")
 
 
 # plotter = DescriptivePlotter(df)
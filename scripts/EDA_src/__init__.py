@@ -3,8 +3,20 @@
 from .univariate import univariate_numeric, univariate_categorical, univariate_binary
 from .bivariate import bivariate_numeric_numeric, bivariate_categorical_numeric, bivariate_categorical_categorical
 from .multivariate import correlation_matrix, pca_analysis, cluster_analysis
-from .constructs import create_construct_groups, identify_column_types, analyze_construct, create_aggregate_features
-from .platform_analysis import analyze_purchase_behavior, analyze_platform_usage, correlation_analysis, multivariate_analysis
+from .constructs import create_construct_groups, identify_column_types, analyze_construct, create_aggregate_features, compute_aggregate_features
+from .platform_analysis import (analyze_purchase_behavior, analyze_platform_usage, correlation_analysis, multivariate_analysis,
+                                conceptual_path_model, conceptual_model_edges)
+from .registry import ConstructRegistry, get_registry
+from .batch_report import run_batch_report, build_tasks
+from .summaries import (numeric_summary, categorical_summary, pair_correlation, group_comparison,
+                        contingency_summary, strong_correlations)
+from .correlations import (correlation_engine, pearson_matrix, spearman_matrix, weighted_pearson_matrix,
+                           kendall_tau_b_matrix, benjamini_hochberg)
+from .group_tests import compare_groups
+from .clustering import select_kmeans, sampled_silhouette, cluster_profiles, ClusterProfileAccumulator
+from .decomposition import decompose, incremental_decompose, Decomposition, clear_decomposition_cache
+from .weighting import (RAKING_COLUMNS, rake_weights, poststratify_weights, effective_sample_size, weighted_summary,
+                        weighted_group_means, weighted_counts)
 
 
 __all__ = [
@@ -12,6 +24,19 @@ __all__ = [
     'bivariate_numeric_numeric', 'bivariate_categorical_numeric', 'bivariate_categorical_categorical',
     'correlation_matrix', 'pca_analysis', 'cluster_analysis',
     'create_construct_groups', 'identify_column_types', 'analyze_construct', 'create_aggregate_features',
-    'analyze_purchase_behavior', 'analyze_platform_usage', 'correlation_analysis', 'multivariate_analysis'
+    'compute_aggregate_features',
+    'analyze_purchase_behavior', 'analyze_platform_usage', 'correlation_analysis', 'multivariate_analysis',
+    'conceptual_path_model', 'conceptual_model_edges',
+    'ConstructRegistry', 'get_registry',
+    'run_batch_report', 'build_tasks',
+    'numeric_summary', 'categorical_summary', 'pair_correlation', 'group_comparison',
+    'contingency_summary', 'strong_correlations',
+    'correlation_engine', 'pearson_matrix', 'spearman_matrix', 'weighted_pearson_matrix', 'kendall_tau_b_matrix',
+    'benjamini_hochberg',
+    'compare_groups',
+    'select_kmeans', 'sampled_silhouette', 'cluster_profiles', 'ClusterProfileAccumulator',
+    'decompose', 'incremental_decompose', 'Decomposition', 'clear_decomposition_cache',
+    'RAKING_COLUMNS', 'rake_weights', 'poststratify_weights', 'effective_sample_size', 'weighted_summary',
+    'weighted_group_means', 'weighted_counts'
     
 ]
\ No newline at end of file
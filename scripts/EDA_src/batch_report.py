@@ -0,0 +1,252 @@
+import io
+import os
+import re
+import json
+import html
+import time
+import argparse
+import warnings
+from datetime import datetime
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .constructs import identify_column_types
+from ..data_io.paths import REPO_ROOT, DEFAULT_DATA_PATH
+
+DEFAULT_OUTPUT_DIR = os.path.join(REPO_ROOT, 'outputs', 'eda_report')
+
+# Worker-side state, set once per process by _init_worker
+_WORKER = {}
+
+
+def _task_functions():
+    """Analysis functions by task kind; imported after the backend is set"""
+    from .univariate import univariate_numeric, univariate_categorical, univariate_binary
+    from .bivariate import bivariate_numeric_numeric, bivariate_categorical_numeric, bivariate_categorical_categorical
+    return {
+        'univariate_numeric': univariate_numeric,
+        'univariate_categorical': univariate_categorical,
+        'univariate_binary': univariate_binary,
+        'bivariate_numeric_numeric': bivariate_numeric_numeric,
+        'bivariate_categorical_numeric': bivariate_categorical_numeric,
+        'bivariate_categorical_categorical': bivariate_categorical_categorical
+    }
+
+
+def _jsonable(value):
+    """Convert the structured result of an analysis into JSON-ready values"""
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return {str(key): _jsonable(item) for key, item in value.to_dict(orient='index').items()}
+    if isinstance(value, pd.Series):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def _init_worker(df, output_dir, formats, dpi, plot=True):
+    """Switch to the Agg backend and keep the frame for every task of this process"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+    # plt.show() is a no-op on Agg; its "non-interactive" warning is expected here
+    warnings.filterwarnings('ignore', message='.*non-interactive.*')
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    _WORKER.update({
+        'df': df,
+        'output_dir': output_dir,
+        'formats': tuple(formats),
+        'dpi': dpi,
+        'plot': plot,
+        'functions': _task_functions()
+    })
+
+
+def _file_stem(kind, columns):
+    return re.sub(r'[^\w.-]+', '_', '__'.join([kind] + list(columns))).strip('_')
+
+
+def _run_task(task):
+    """Run one analysis headless; return its captured output and figure paths"""
+    import matplotlib.pyplot as plt
+
+    kind, columns = task
+    # Figures already open (the caller's, when running in-process) are left alone
+    existing = set(plt.get_fignums())
+    buffer = io.StringIO()
+    error = None
+    result = None
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(buffer):
+            result = _WORKER['functions'][kind](_WORKER['df'], *columns, plot=_WORKER['plot'])
+    except Exception as exc:
+        error = f'{type(exc).__name__}: {exc}'
+
+    figures = []
+    stem = _file_stem(kind, columns)
+    created = [number for number in plt.get_fignums() if number not in existing]
+    for i, number in enumerate(created):
+        figure = plt.figure(number)
+        suffix = '' if i == 0 else f'_{i}'
+        for fmt in _WORKER['formats']:
+            filename = f'{stem}{suffix}.{fmt}'
+            figure.savefig(os.path.join(_WORKER['output_dir'], filename), format=fmt, dpi=_WORKER['dpi'])
+            figures.append(filename)
+        plt.close(figure)
+
+    return {
+        'task': kind,
+        'columns': list(columns),
+        'result': _jsonable(result),
+        'stdout': buffer.getvalue(),
+        'figures': figures,
+        'error': error,
+        'seconds': round(time.perf_counter() - start, 4)
+    }
+
+
+def _pair_kind(column_types, x_col, y_col):
+    """Pick the bivariate function (and argument order) for a column pair"""
+    numeric = set(column_types['numeric'])
+    if x_col in numeric and y_col in numeric:
+        return 'bivariate_numeric_numeric', (x_col, y_col)
+    if y_col in numeric:
+        return 'bivariate_categorical_numeric', (x_col, y_col)
+    if x_col in numeric:
+        return 'bivariate_categorical_numeric', (y_col, x_col)
+    return 'bivariate_categorical_categorical', (x_col, y_col)
+
+
+def build_tasks(df, columns=None, target=None, pairs=(), univariate=True):
+    """
+    List the (task kind, columns) jobs of a full-column EDA.
+
+    Every column gets the univariate analysis matching its type (from
+    ``identify_column_types``). Bivariate jobs come from explicit ``pairs``
+    and, when ``target`` is given, from pairing every column with it.
+    """
+    all_types = identify_column_types(df)
+    column_types = all_types
+    if columns is not None:
+        keep = set(columns)
+        column_types = {kind: [col for col in cols if col in keep] for kind, cols in all_types.items()}
+
+    tasks = []
+    if univariate:
+        for kind in ['numeric', 'categorical', 'binary']:
+            tasks.extend((f'univariate_{kind}', (col,)) for col in column_types[kind])
+
+    all_pairs = list(pairs)
+    if target is not None:
+        selected = [col for cols in column_types.values() for col in cols]
+        all_pairs.extend((col, target) for col in selected if col != target)
+    for x_col, y_col in all_pairs:
+        tasks.append(_pair_kind(all_types, x_col, y_col))
+    return tasks
+
+
+def _to_html(report):
+    """Single-page HTML view of the JSON report"""
+    parts = [
+        '<!DOCTYPE html>',
+        '<html><head><meta charset="utf-8"><title>EDA batch report</title>',
+        '<style>body{font-family:sans-serif;margin:2em}pre{background:#f6f6f6;padding:1em;overflow-x:auto}'
+        'img{max-width:100%}.error{color:#b00}section{border-top:1px solid #ccc;margin-top:2em}</style>',
+        '</head><body>',
+        f'<h1>EDA batch report</h1><p>Generated {html.escape(report["generated"])}: '
+        f'{report["n_tasks"]} analyses in {report["wall_seconds"]:.1f}s on {report["n_jobs"]} processes, '
+        f'{report["n_errors"]} errors.</p>'
+    ]
+    for result in report['results']:
+        title = f'{result["task"]}: {", ".join(result["columns"])}'
+        parts.append(f'<section><h2>{html.escape(title)}</h2>')
+        if result['error']:
+            parts.append(f'<p class="error">{html.escape(result["error"])}</p>')
+        if result['stdout'].strip():
+            parts.append(f'<pre>{html.escape(result["stdout"])}</pre>')
+        for filename in result['figures']:
+            if filename.endswith(('.png', '.svg')):
+                parts.append(f'<img src="{html.escape(filename)}" alt="{html.escape(filename)}">')
+        parts.append('</section>')
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+def run_batch_report(df, output_dir=DEFAULT_OUTPUT_DIR, columns=None, target=None, pairs=(), univariate=True,
+                     formats=('png',), dpi=100, n_jobs=None, tasks=None, plot=True):
+    """
+    Run the univariate/bivariate EDA functions headless and write the report.
+
+    Each analysis runs on the Agg backend inside a process pool (``n_jobs``
+    workers, all cores by default; ``n_jobs=1`` runs in this process). Its
+    figures are saved to ``output_dir`` in every format of ``formats``, and
+    its structured result and printed statistics are captured. With
+    ``plot=False`` only the compute layer runs and no figures are drawn.
+    ``report.json`` and ``report.html`` collect all results in task order.
+    Returns the report dict.
+    """
+    if tasks is None:
+        tasks = build_tasks(df, columns=columns, target=target, pairs=pairs, univariate=univariate)
+    os.makedirs(output_dir, exist_ok=True)
+    n_workers = n_jobs if n_jobs not in (None, -1) else (os.cpu_count() or 1)
+    init_args = (df, output_dir, formats, dpi, plot)
+
+    start = time.perf_counter()
+    if n_workers == 1:
+        # In-process: keep the warning filters and backend switch local to this call
+        import matplotlib
+        import matplotlib.pyplot as plt
+        backend = matplotlib.get_backend()
+        try:
+            with warnings.catch_warnings():
+                _init_worker(*init_args)
+                results = [_run_task(task) for task in tasks]
+        finally:
+            _WORKER.clear()
+            plt.switch_backend(backend)
+    else:
+        chunksize = max(1, len(tasks) // (n_workers * 4))
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=init_args) as pool:
+            results = list(pool.map(_run_task, tasks, chunksize=chunksize))
+
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'n_tasks': len(tasks),
+        'n_jobs': n_workers,
+        'n_errors': sum(result['error'] is not None for result in results),
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'results': results
+    }
+    with open(os.path.join(output_dir, 'report.json'), 'w') as handle:
+        json.dump(report, handle, indent=1)
+    with open(os.path.join(output_dir, 'report.html'), 'w', encoding='utf-8') as handle:
+        handle.write(_to_html(report))
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Headless EDA batch report')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--target', default=None)
+    parser.add_argument('--formats', default='png', help='comma separated, e.g. png,svg')
+    parser.add_argument('--n-jobs', type=int, default=None)
+    parser.add_argument('--no-plots', action='store_true', help='compute statistics only')
+    args = parser.parse_args()
+
+    summary = run_batch_report(pd.read_csv(args.data), output_dir=args.output_dir, target=args.target,
+                               formats=args.formats.split(','), n_jobs=args.n_jobs, plot=not args.no_plots)
+    print(f"{summary['n_tasks']} analyses in {summary['wall_seconds']:.1f}s "
+          f"({summary['n_errors']} errors), report in {args.output_dir}")
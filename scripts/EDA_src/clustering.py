@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+
+class ClusterProfileAccumulator:
+    """
+    Incremental ``data.groupby('Cluster').mean()`` and cluster sizes over
+    chunks. Each update adds per-cluster sums and non-missing counts of all
+    columns with one ``np.bincount`` on (cluster, column) cell codes.
+    """
+
+    def __init__(self, columns, n_clusters):
+        self.columns = list(columns)
+        self.n_clusters = n_clusters
+        self.sums = np.zeros((n_clusters, len(self.columns)))
+        self.counts = np.zeros((n_clusters, len(self.columns)))
+        self.sizes = np.zeros(n_clusters, dtype=np.int64)
+
+    def update(self, chunk, labels):
+        X = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        labels = np.asarray(labels, dtype=np.int64)
+        p = len(self.columns)
+        cells = (labels[:, None] * p + np.arange(p)).ravel()
+        valid = ~np.isnan(X).ravel()
+        size = self.n_clusters * p
+        self.sums += np.bincount(cells[valid], weights=X.ravel()[valid], minlength=size).reshape(self.n_clusters, p)
+        self.counts += np.bincount(cells[valid], minlength=size).reshape(self.n_clusters, p)
+        self.sizes += np.bincount(labels, minlength=self.n_clusters)
+        return self
+
+    def result(self):
+        present = self.sizes > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.sums[present] / self.counts[present]
+        index = pd.Index(np.flatnonzero(present), name='Cluster')
+        return {
+            'profiles': pd.DataFrame(means, index=index, columns=self.columns),
+            'sizes': pd.Series(self.sizes[present], index=index, name='count')
+        }
+
+
+def cluster_profiles(data, labels, n_clusters=None, chunksize=100_000):
+    """
+    Per-cluster means and sizes of ``data`` streamed through a
+    ``ClusterProfileAccumulator`` ``chunksize`` rows at a time
+    """
+    labels = np.asarray(labels)
+    if n_clusters is None:
+        n_clusters = int(labels.max()) + 1 if len(labels) else 0
+    accumulator = ClusterProfileAccumulator(data.columns, n_clusters)
+    for start in range(0, len(data), chunksize):
+        accumulator.update(data.iloc[start:start + chunksize], labels[start:start + chunksize])
+    return accumulator.result()
+
+
+def sampled_silhouette(X, labels, sample_size=10_000, random_state=42):
+    """
+    Silhouette score on at most ``sample_size`` rows (exact when the data is
+    smaller). sklearn computes the distances in row chunks, so memory stays
+    bounded by the sample, not by the data. NaN when the sample holds fewer
+    than two clusters.
+    """
+    n = X.shape[0]
+    if sample_size is None or sample_size >= n:
+        sample = np.arange(n)
+    else:
+        sample = np.random.default_rng(random_state).choice(n, sample_size, replace=False)
+    n_labels = len(np.unique(labels[sample]))
+    if n_labels < 2 or n_labels >= len(sample):
+        return np.nan
+    return float(silhouette_score(X[sample], labels[sample]))
+
+
+def _next_center(X, centers, rng):
+    """k-means++ seeding step: a new center drawn with probability proportional to D^2"""
+    distances = ((X[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+    total = distances.sum()
+    if total == 0:
+        return X[rng.integers(len(X))]
+    return X[rng.choice(len(X), p=distances / total)]
+
+
+def select_kmeans(X, k_range=range(2, 6), scalable=False, batch_size=1024, sample_size=10_000,
+                  random_state=42, max_iter=100):
+    """
+    Fit one k-means model per k in ``k_range`` and score each by silhouette.
+
+    The default mode fits a full ``KMeans`` per k and scores it with the
+    exact silhouette. With ``scalable=True`` each k is fitted by
+    ``MiniBatchKMeans`` twice, warm-started from the k-1 solution (its
+    centers plus one k-means++ draw from a row sample) and with k-means++
+    restarts; the fit with the lower inertia is kept and scored with
+    ``sampled_silhouette`` on ``sample_size`` rows. Mini-batch fits are
+    approximate, so near-tied silhouettes can still pick a different k than
+    the default mode.
+
+    Returns a dict with the fitted 'models' and 'scores' per k and the
+    'optimal_k' (highest silhouette); the caller reuses the fitted model of
+    the optimal k instead of refitting it.
+    """
+    k_range = list(k_range)
+    rng = np.random.default_rng(random_state)
+    seed_rows = X[rng.choice(X.shape[0], min(sample_size or X.shape[0], X.shape[0]), replace=False)]
+
+    models, scores = {}, {}
+    centers = None
+    for k in k_range:
+        if not scalable:
+            model = KMeans(n_clusters=k, random_state=random_state)
+            labels = model.fit_predict(X)
+            scores[k] = float(silhouette_score(X, labels))
+        else:
+            inits = [('k-means++', 3)]
+            if centers is not None and len(centers) == k - 1:
+                inits.append((np.vstack([centers, _next_center(seed_rows, centers, rng)]), 1))
+            # The warm start only competes with fresh k-means++ restarts, so a
+            # poor k-1 solution cannot carry over into the choice of k
+            model = min((MiniBatchKMeans(n_clusters=k, init=init, n_init=n_init, batch_size=batch_size,
+                                         max_iter=max_iter, random_state=random_state).fit(X)
+                         for init, n_init in inits), key=lambda fitted: fitted.inertia_)
+            centers = model.cluster_centers_
+            scores[k] = sampled_silhouette(X, model.labels_, sample_size=sample_size, random_state=random_state)
+        models[k] = model
+
+    finite = {k: score for k, score in scores.items() if np.isfinite(score)}
+    optimal_k = max(finite, key=finite.get) if finite else k_range[0]
+    return {'models': models, 'scores': scores, 'optimal_k': optimal_k}
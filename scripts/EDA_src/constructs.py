@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from .registry import DEMOGRAPHIC_COLUMNS, get_registry
+
 def identify_column_types(df):
     """
     Identify numeric, categorical, and binary columns
@@ -33,49 +35,142 @@ def identify_column_types(df):
         'categorical': categorical_cols
     }
 
-def create_construct_groups(df):
+def create_construct_groups(df, registry=None):
     """
     Group columns by their prefixes (constructs)
     """
+    registry = get_registry(df, registry)
     constructs = {
-        'peou': [col for col in df.columns if col.startswith('peou_')],
-        'pu': [col for col in df.columns if col.startswith('pu_')],
-        'sa': [col for col in df.columns if col.startswith('sa_')],
-        'si': [col for col in df.columns if col.startswith('si_')],
-        'att': [col for col in df.columns if col.startswith('att_')],
-        'risk': [col for col in df.columns if col.startswith('risk_')],
-        'opi': [col for col in df.columns if col.startswith('opi_')],
-        'platforms': [col for col in df.columns if col.startswith('gecp_')],
-        'online_pharmacy': [col for col in df.columns if col.startswith('op_')],
-        'fashion_brands': [col for col in df.columns if col.startswith('fabr_')],
-        'grocery_delivery': [col for col in df.columns if col.startswith('gds_')],
-        'automobile': [col for col in df.columns if col.startswith('sos_automobile_')],
-        'demographic': ['gender_encoded', 'age_encoded', 'marital_status_encoded', 
-                       'education_encoded', 'used_online_shopping_encoded'] + 
-                       [col for col in df.columns if col.startswith('prof_')]
+        'peou': registry.columns('peou'),
+        'pu': registry.columns('pu'),
+        'sa': registry.columns('sa'),
+        'si': registry.columns('si'),
+        'att': registry.columns('att'),
+        'risk': registry.columns('risk'),
+        'opi': registry.columns('opi'),
+        'platforms': registry.columns('gecp'),
+        'online_pharmacy': registry.columns('op'),
+        'fashion_brands': registry.columns('fabr'),
+        'grocery_delivery': registry.columns('gds'),
+        'automobile': registry.columns('sos_automobile'),
+        'demographic': DEMOGRAPHIC_COLUMNS + registry.columns('prof')
     }
     return constructs
 
-def create_aggregate_features(df):
+# Aggregate column name -> construct holding the binary service columns it counts
+SERVICE_COUNT_GROUPS = [
+    ('platform_count', 'gecp'),
+    ('pharmacy_count', 'op'),
+    ('fashion_count', 'fabr'),
+    ('grocery_count', 'gds'),
+    ('automobile_count', 'sos_automobile')
+]
+
+# Likert constructs that get an '<construct>_avg' column
+AVERAGED_CONSTRUCTS = ['peou', 'pu', 'sa', 'si', 'att', 'risk']
+
+def _block_matrix(df, positions):
+    """
+    Copy the columns at ``positions`` into one column-major array, column by column.
+    Integer/bool columns are narrowed to the smallest integer type holding their
+    range; anything else (or an empty frame, which has no range) becomes float64
+    so missing values survive as NaN. Returns the block and the largest
+    absolute value it holds.
+    """
+    columns = [df.iloc[:, pos] for pos in positions]
+    if len(df) and all((pd.api.types.is_bool_dtype(col) or pd.api.types.is_integer_dtype(col))
+                       and not col.hasnans for col in columns):
+        max_abs = max(max(abs(int(col.min())), abs(int(col.max()))) for col in columns)
+        dtype = np.min_scalar_type(-max(max_abs, 1))
+    else:
+        dtype = np.float64
+        max_abs = None
+
+    block = np.empty((len(df), len(columns)), dtype=dtype, order='F')
+    for j, col in enumerate(columns):
+        if dtype == np.float64:
+            block[:, j] = col.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            block[:, j] = col.to_numpy()
+    return block, max_abs
+
+def _grouped_row_reduce(df, registry, groups, exclude_none):
+    """
+    Row-wise sums and non-missing counts for several column groups from a
+    single ``np.add.reduceat`` over the concatenated block of all groups.
+    Integer blocks are reduced in the narrowest accumulator that cannot
+    overflow, so the block is never upcast as a whole. Groups without
+    columns get ``None``.
+    """
+    positions = [registry.positions(name, exclude_none) for name in groups]
+    sizes = [len(pos) for pos in positions]
+    nonempty = [i for i, size in enumerate(sizes) if size]
+    sums = [None] * len(groups)
+    valid = [None] * len(groups)
+    if not nonempty:
+        return sums, valid
+
+    block, max_abs = _block_matrix(df, np.concatenate([positions[i] for i in nonempty]))
+    offsets = np.concatenate([[0], np.cumsum([sizes[i] for i in nonempty])[:-1]])
+    max_size = max(sizes)
+
+    if max_abs is None:
+        mask = np.isnan(block)
+        if mask.any():
+            np.copyto(block, 0.0, where=mask)
+            count_dtype = np.result_type(np.min_scalar_type(max_size), np.int8)
+            counts = np.add.reduceat(~mask, offsets, axis=1, dtype=count_dtype)
+            for k, i in enumerate(nonempty):
+                valid[i] = counts[:, k]
+        reduced = np.add.reduceat(block, offsets, axis=1)
+    else:
+        acc_dtype = np.result_type(block.dtype, np.min_scalar_type(-max_abs * max_size))
+        reduced = np.add.reduceat(block, offsets, axis=1, dtype=acc_dtype)
+
+    for k, i in enumerate(nonempty):
+        sums[i] = reduced[:, k]
+        if valid[i] is None:
+            valid[i] = sizes[i]
+    return sums, valid
+
+def compute_aggregate_features(df, registry=None):
+    """
+    Compute the service counts, total services used and construct averages
+    without modifying ``df``. Returns a new frame indexed like ``df``.
+    """
+    registry = get_registry(df, registry)
+    n_rows = len(df)
+    dtypes = df.dtypes
+    result = {}
+
+    # Counts of platforms/services used, one reduction over the binary block
+    counts, _ = _grouped_row_reduce(df, registry, [name for _, name in SERVICE_COUNT_GROUPS], exclude_none=True)
+    for (feature, name), count in zip(SERVICE_COUNT_GROUPS, counts):
+        group_dtypes = dtypes.iloc[registry.positions(name, exclude_none=True)]
+        if all(pd.api.types.is_bool_dtype(t) or pd.api.types.is_integer_dtype(t) for t in group_dtypes):
+            dtype = np.int64
+        else:
+            dtype = np.float64
+        result[feature] = np.zeros(n_rows, dtype=dtype) if count is None else count.astype(dtype)
+
+    result['total_services_used'] = sum(result[feature] for feature, _ in SERVICE_COUNT_GROUPS)
+
+    # Average scores, one reduction over the Likert block
+    sums, valid = _grouped_row_reduce(df, registry, AVERAGED_CONSTRUCTS, exclude_none=False)
+    for name, group_sum, count in zip(AVERAGED_CONSTRUCTS, sums, valid):
+        if group_sum is not None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[f'{name}_avg'] = np.true_divide(group_sum, count, dtype=np.float64)
+
+    return pd.DataFrame(result, index=df.index, copy=False)
+
+def create_aggregate_features(df, registry=None):
     """
     Create aggregate features from binary platform/service columns
     """
-    # Count number of platforms/services used by each respondent
-    df['platform_count'] = df[[col for col in df.columns if col.startswith('gecp_') and col != 'gecp_None']].sum(axis=1)
-    df['pharmacy_count'] = df[[col for col in df.columns if col.startswith('op_') and col != 'op_None']].sum(axis=1)
-    df['fashion_count'] = df[[col for col in df.columns if col.startswith('fabr_') and col != 'fabr_None']].sum(axis=1)
-    df['grocery_count'] = df[[col for col in df.columns if col.startswith('gds_') and col != 'gds_None']].sum(axis=1)
-    df['automobile_count'] = df[[col for col in df.columns if col.startswith('sos_automobile_') and col != 'sos_automobile_None']].sum(axis=1)
-    
-    # Total services used
-    df['total_services_used'] = df['platform_count'] + df['pharmacy_count'] + df['fashion_count'] + df['grocery_count'] + df['automobile_count']
-    
-    # Average scores for each construct
-    construct_prefixes = ['peou_', 'pu_', 'sa_', 'si_', 'att_', 'risk_']
-    for prefix in construct_prefixes:
-        cols = [col for col in df.columns if col.startswith(prefix)]
-        if cols:
-            df[f'{prefix}avg'] = df[cols].mean(axis=1)
+    features = compute_aggregate_features(df, registry)
+    for col in features.columns:
+        df[col] = features[col]
     
     return df
 
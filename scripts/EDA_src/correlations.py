@@ -0,0 +1,307 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+CORRELATION_METHODS = ('pearson', 'spearman', 'kendall')
+
+
+def _numeric_block(df, columns):
+    if columns is None:
+        columns = df.select_dtypes(include=['number', 'bool']).columns
+    columns = list(columns)
+    return df[columns].to_numpy(dtype=np.float64, na_value=np.nan), columns
+
+
+def pearson_matrix(X):
+    """
+    Pearson correlation of all column pairs of ``X`` (n, p) and the number of
+    complete pairs behind each coefficient.
+
+    Without missing values the columns are standardized once and the matrix
+    is a single matmul. With missing values the pairwise-complete sums come
+    from a handful of masked matmuls, so no pair is ever sliced out.
+    """
+    valid = ~np.isnan(X)
+    if valid.all():
+        n = X.shape[0]
+        Z = X - X.mean(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            Z /= np.sqrt((Z * Z).sum(axis=0))
+        r = Z.T @ Z
+        counts = np.full(r.shape, n, dtype=np.int64)
+    else:
+        M = valid.astype(np.float64)
+        # Center on column means for numerical stability (r is shift invariant)
+        X0 = np.where(valid, X - np.nanmean(X, axis=0), 0.0)
+        X2 = X0 * X0
+        n = M.T @ M
+        sx = X0.T @ M
+        sxx = X2.T @ M
+        sxy = X0.T @ X0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = n * sxy - sx * sx.T
+            r = cov / np.sqrt((n * sxx - sx * sx) * (n * sxx.T - sx.T * sx.T))
+        counts = np.rint(n).astype(np.int64)
+
+    r = np.clip(r, -1.0, 1.0)
+    np.fill_diagonal(r, np.where(counts.diagonal() > 1, 1.0, np.nan))
+    return r, counts
+
+
+def weighted_pearson_matrix(X, weights):
+    """
+    Weighted Pearson correlations of all column pairs of ``X`` (n, p) with
+    non-negative row ``weights``, and the weight total behind each pair.
+
+    The same masked crossproducts as ``pearson_matrix`` with the weights
+    folded into one side of every matmul, so rows are never replicated.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    valid = ~np.isnan(X)
+    M = valid.astype(np.float64)
+    MW = M * weights[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = (MW * np.where(valid, X, 0.0)).sum(axis=0) / MW.sum(axis=0)
+    X0 = np.where(valid, X - center, 0.0)
+    XW = X0 * weights[:, None]
+    w = MW.T @ M
+    sx = XW.T @ M
+    sxx = (XW * X0).T @ M
+    sxy = XW.T @ X0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = w * sxy - sx * sx.T
+        r = cov / np.sqrt((w * sxx - sx * sx) * (w * sxx.T - sx.T * sx.T))
+    r = np.clip(r, -1.0, 1.0)
+    np.fill_diagonal(r, np.where(w.diagonal() > 0, 1.0, np.nan))
+    return r, w
+
+
+def rank_columns(X):
+    """
+    Average ranks of every column (ties share their mean rank), computed once
+    per column over its non-missing values; missing cells stay NaN
+    """
+    ranks = stats.rankdata(X, axis=0, nan_policy='omit')
+    return np.where(np.isnan(X), np.nan, ranks)
+
+
+def spearman_matrix(X):
+    """
+    Pairwise-complete Spearman correlation of all column pairs of ``X`` and
+    the number of complete pairs behind each coefficient.
+
+    Every column is ranked once and the ranks go through ``pearson_matrix``.
+    That is exact for pairs whose complete rows are the non-missing rows of
+    both columns; pairs with mismatched missingness are re-ranked within
+    their own complete rows, as pandas and scipy do.
+    """
+    r, counts = pearson_matrix(rank_columns(X))
+    valid = ~np.isnan(X)
+    observed = valid.sum(axis=0)
+    mismatched = (observed[:, None] != counts) | (observed[None, :] != counts)
+    for i, j in zip(*np.nonzero(np.triu(mismatched, k=1))):
+        complete = valid[:, i] & valid[:, j]
+        pair_r, _ = pearson_matrix(rank_columns(X[complete][:, [i, j]]))
+        r[i, j] = r[j, i] = pair_r[0, 1]
+    return r, counts
+
+
+def correlation_pvalues(r, n):
+    """
+    Two-sided p-values of Pearson/Spearman coefficients from the t statistic
+    with n - 2 degrees of freedom (the test used by scipy's pearsonr/spearmanr)
+    """
+    dof = n - 2.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p = np.where(np.abs(r) >= 1.0, 0.0, p)
+    return np.where(dof > 0, p, np.nan)
+
+
+def _level_codes(x):
+    """Codes 0..k-1 of the sorted distinct values of x (-1 for NaN)"""
+    valid = ~np.isnan(x)
+    levels, codes = np.unique(x[valid], return_inverse=True)
+    full = np.full(x.shape[0], -1, dtype=np.int64)
+    full[valid] = codes
+    return full, len(levels)
+
+
+def _tie_sums(counts):
+    """Sums of t(t-1)/2, t(t-1)(t-2) and t(t-1)(2t+5) over tie groups, along the last axis"""
+    t = counts
+    return (t * (t - 1) / 2).sum(axis=-1), (t * (t - 1) * (t - 2)).sum(axis=-1), (t * (t - 1) * (2 * t + 5)).sum(axis=-1)
+
+
+def kendall_tau_b_matrix(X, max_levels=50):
+    """
+    Kendall's tau-b of all column pairs with asymptotic p-values (the
+    tie-corrected variance scipy's kendalltau uses).
+
+    Columns with at most ``max_levels`` distinct values (Likert items,
+    encoded demographics, one-hot flags) are one-hot encoded together, and a
+    single matmul gives the joint count table of every pair. Concordant and
+    discordant pair counts then come from 2-D suffix sums of those tables,
+    vectorized over all partners of a column. Other columns fall back to
+    ``scipy.stats.kendalltau`` pair by pair. Missing values are dropped
+    pairwise.
+    """
+    n_rows, p = X.shape
+    tau = np.full((p, p), np.nan)
+    pvalues = np.full((p, p), np.nan)
+    counts = np.zeros((p, p), dtype=np.int64)
+
+    codes, n_levels = zip(*[_level_codes(X[:, j]) for j in range(p)]) if p else ((), ())
+    n_levels = np.array(n_levels, dtype=np.int64)
+    discrete = np.flatnonzero(n_levels <= max_levels)
+
+    if len(discrete):
+        K = int(max(n_levels[discrete].max(), 1))
+        onehot = np.zeros((n_rows, len(discrete) * K))
+        for slot, j in enumerate(discrete):
+            valid = codes[j] >= 0
+            onehot[np.flatnonzero(valid), slot * K + codes[j][valid]] = 1.0
+        joint = (onehot.T @ onehot).reshape(len(discrete), K, len(discrete), K).transpose(0, 2, 1, 3)
+
+        for a_slot, a in enumerate(discrete):
+            T = joint[a_slot]                                       # (partners, K, K)
+            # below[i, j] = sum of T[i', j'] with i' > i and j' > j; above-left likewise for j' < j
+            suffix = T[:, ::-1, ::-1].cumsum(axis=1).cumsum(axis=2)[:, ::-1, ::-1]
+            greater = np.zeros_like(T)
+            greater[:, :-1, :-1] = suffix[:, 1:, 1:]
+            prefix_j = T[:, ::-1, :].cumsum(axis=1)[:, ::-1, :].cumsum(axis=2)
+            lesser = np.zeros_like(T)
+            lesser[:, :-1, 1:] = prefix_j[:, 1:, :-1]
+            concordant = (T * greater).sum(axis=(1, 2))
+            discordant = (T * lesser).sum(axis=(1, 2))
+
+            n = T.sum(axis=(1, 2))
+            row_totals = T.sum(axis=2)
+            col_totals = T.sum(axis=1)
+            xtie, x0, x1 = _tie_sums(row_totals)
+            ytie, y0, y1 = _tie_sums(col_totals)
+            pairs_total = n * (n - 1) / 2
+            s = concordant - discordant
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                tau_row = s / np.sqrt((pairs_total - xtie) * (pairs_total - ytie))
+                m = n * (n - 1)
+                var = ((m * (2 * n + 5) - x1 - y1) / 18
+                       + (2 * xtie * ytie) / m
+                       + x0 * y0 / (9 * m * (n - 2)))
+                p_row = 2 * stats.norm.sf(np.abs(s) / np.sqrt(var))
+
+            tau[a, discrete] = np.clip(tau_row, -1.0, 1.0)
+            pvalues[a, discrete] = p_row
+            counts[a, discrete] = np.rint(n).astype(np.int64)
+
+    continuous = np.flatnonzero(n_levels > max_levels)
+    for a in continuous:
+        for b in range(p):
+            if b in continuous and b < a:
+                continue
+            valid = ~np.isnan(X[:, a]) & ~np.isnan(X[:, b])
+            result = stats.kendalltau(X[valid, a], X[valid, b], method='asymptotic')
+            tau[a, b] = tau[b, a] = result.statistic
+            pvalues[a, b] = pvalues[b, a] = result.pvalue
+            counts[a, b] = counts[b, a] = int(valid.sum())
+
+    np.fill_diagonal(tau, np.where(counts.diagonal() > 1, 1.0, np.nan))
+    np.fill_diagonal(pvalues, 0.0)
+    return tau, pvalues, counts
+
+
+def benjamini_hochberg(pvalues):
+    """
+    Benjamini-Hochberg adjusted p-values of a 1-D array (NaNs are ignored)
+    """
+    pvalues = np.asarray(pvalues, dtype=np.float64)
+    adjusted = np.full(pvalues.shape, np.nan)
+    finite = np.flatnonzero(~np.isnan(pvalues))
+    m = len(finite)
+    if m == 0:
+        return adjusted
+    order = finite[np.argsort(pvalues[finite], kind='stable')]
+    scaled = pvalues[order] * m / np.arange(1, m + 1)
+    adjusted[order] = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    return adjusted
+
+
+def correlation_engine(df, columns=None, methods=('pearson', 'spearman'), top_k=20, threshold=None,
+                       rank_by=None, fdr_alpha=0.05, max_levels=50):
+    """
+    Correlation matrices, p-values and Benjamini-Hochberg adjusted p-values
+    for every column pair, plus a short list of the strongest pairs.
+
+    Each column is ranked once for Spearman (pairs with mismatched missing
+    values are re-ranked, see ``spearman_matrix``); Pearson and Spearman come
+    from one matmul on standardized data (see ``pearson_matrix``) and Kendall's
+    tau-b from one matmul of one-hot codes (``kendall_tau_b_matrix``).
+    P-values are vectorized over all pairs. The FDR adjustment runs over
+    the p(p-1)/2 distinct pairs of each method.
+
+    The pair list holds the ``top_k`` pairs with the largest |r| of
+    ``rank_by`` (the first method by default), or every pair above
+    ``threshold`` when one is given. It is built from the upper-triangle
+    indices directly, never from an unstacked matrix.
+
+    Returns a dict with, for each method, ``{'r', 'p', 'p_adj', 'n'}``
+    DataFrames, and ``'pairs'``, a DataFrame with one row per selected pair.
+    """
+    methods = [methods] if isinstance(methods, str) else list(methods)
+    unknown = set(methods) - set(CORRELATION_METHODS)
+    if unknown:
+        raise ValueError(f"Unknown correlation methods: {sorted(unknown)}")
+    rank_by = rank_by or methods[0]
+
+    X, columns = _numeric_block(df, columns)
+    p = len(columns)
+    upper_i, upper_j = np.triu_indices(p, k=1)
+
+    results = {}
+    for method in methods:
+        if method == 'pearson':
+            r, n = pearson_matrix(X)
+            pvalues = correlation_pvalues(r, n)
+        elif method == 'spearman':
+            r, n = spearman_matrix(X)
+            pvalues = correlation_pvalues(r, n)
+        else:
+            r, pvalues, n = kendall_tau_b_matrix(X, max_levels=max_levels)
+        np.fill_diagonal(pvalues, 0.0)
+
+        adjusted = np.zeros((p, p))
+        adjusted_upper = benjamini_hochberg(pvalues[upper_i, upper_j])
+        adjusted[upper_i, upper_j] = adjusted_upper
+        adjusted[upper_j, upper_i] = adjusted_upper
+
+        results[method] = {
+            'r': pd.DataFrame(r, index=columns, columns=columns),
+            'p': pd.DataFrame(pvalues, index=columns, columns=columns),
+            'p_adj': pd.DataFrame(adjusted, index=columns, columns=columns),
+            'n': pd.DataFrame(n, index=columns, columns=columns)
+        }
+
+    strength = np.abs(results[rank_by]['r'].to_numpy()[upper_i, upper_j])
+    strength = np.where(np.isnan(strength), -np.inf, strength)
+    if threshold is not None:
+        selected = np.flatnonzero(strength > threshold)
+    else:
+        k = min(top_k, len(strength))
+        selected = np.argpartition(-strength, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+    selected = selected[np.argsort(-strength[selected], kind='stable')]
+
+    rows_i, rows_j = upper_i[selected], upper_j[selected]
+    pairs = pd.DataFrame({
+        'var1': [columns[i] for i in rows_i],
+        'var2': [columns[j] for j in rows_j]
+    })
+    for method in methods:
+        for key in ['r', 'p', 'p_adj']:
+            pairs[f'{method}_{key}'] = results[method][key].to_numpy()[rows_i, rows_j]
+    pairs['n'] = results[rank_by]['n'].to_numpy()[rows_i, rows_j]
+    pairs['significant_fdr'] = pairs[f'{rank_by}_p_adj'] < fdr_alpha
+
+    results['pairs'] = pairs
+    return results
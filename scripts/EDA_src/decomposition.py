@@ -0,0 +1,215 @@
+import copy
+import hashlib
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.preprocessing import StandardScaler
+
+from .registry import schema_hash
+
+DECOMPOSITION_SOLVERS = ('auto', 'full', 'randomized', 'incremental')
+
+# Cells above which 'auto' switches from the full SVD to the randomized solver
+_RANDOMIZED_CELLS = 50_000_000
+
+_DECOMPOSITION_CACHE = {}
+_MAX_CACHED_DECOMPOSITIONS = 8
+
+
+def data_version(X):
+    """
+    Content hash of a numeric block; used with the column set as the cache key
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    digest = hashlib.sha1(str(X.shape).encode('utf-8'))
+    digest.update(X.view(np.uint8).ravel())
+    return digest.hexdigest()
+
+
+class Decomposition:
+    """
+    Standardized block of columns and its principal components.
+
+    ``X`` is the standardized complete-case matrix (what ``StandardScaler``
+    gives), ``model`` the fitted PCA/IncrementalPCA and ``scaler`` the
+    fitted StandardScaler. ``X`` is None for decompositions fitted on
+    chunks; ``transform`` then projects new data in chunks.
+    """
+
+    def __init__(self, columns, index, X, scaler, model, solver):
+        self.columns = list(columns)
+        self.index = index
+        self.X = X
+        self.scaler = scaler
+        self.model = model
+        self.solver = solver
+        self.n_components = model.n_components_
+        self._scores = None
+
+    @property
+    def explained_variance_ratio(self):
+        return self.model.explained_variance_ratio_
+
+    def pca(self, n_components=None):
+        """
+        The fitted model cut to its first ``n_components`` components, as a
+        PCA fitted with that ``n_components`` would be (the cached model is
+        not modified)
+        """
+        n_components = n_components or self.n_components
+        if n_components >= self.n_components:
+            return self.model
+        model = copy.copy(self.model)
+        model.n_components = model.n_components_ = n_components
+        for attr in ('components_', 'explained_variance_', 'explained_variance_ratio_', 'singular_values_'):
+            setattr(model, attr, getattr(self.model, attr)[:n_components])
+        if self.solver == 'full':
+            # The variance of the dropped components becomes noise, as in PCA.fit
+            model.noise_variance_ = float(self.model.explained_variance_[n_components:].mean())
+        return model
+
+    def component_names(self, n_components=None):
+        return [f'PC{i+1}' for i in range(n_components or self.n_components)]
+
+    def loadings(self, n_components=None):
+        """Components as a (columns x PCs) DataFrame, as ``pca_analysis`` prints them"""
+        n_components = n_components or self.n_components
+        return pd.DataFrame(self.model.components_[:n_components].T,
+                            columns=self.component_names(n_components), index=self.columns)
+
+    def correlation_loadings(self, n_components=None):
+        """Components scaled by the square root of their variance (the biplot arrows)"""
+        n_components = n_components or self.n_components
+        return (self.model.components_[:n_components].T
+                * np.sqrt(self.model.explained_variance_[:n_components]))
+
+    def scree(self):
+        """Explained variance and its (cumulative) share per component"""
+        ratio = self.model.explained_variance_ratio_
+        return pd.DataFrame({
+            'explained_variance': self.model.explained_variance_,
+            'explained_variance_ratio': ratio,
+            'cumulative_ratio': np.cumsum(ratio)
+        }, index=self.component_names())
+
+    def scores(self, n_components=None):
+        """Principal component scores of the fitted rows (computed once)"""
+        if self._scores is None:
+            if self.X is None:
+                raise ValueError("Decomposition was fitted on chunks; use transform() to project data")
+            self._scores = self.model.transform(self.X)
+        return self._scores[:, :n_components or self.n_components]
+
+    def transform(self, data, n_components=None, chunksize=100_000):
+        """Project the complete rows of ``data`` onto the components, ``chunksize`` rows at a time"""
+        values = data[self.columns].dropna().to_numpy(dtype=np.float64)
+        parts = [self.model.transform(self.scaler.transform(values[start:start + chunksize]))
+                 for start in range(0, len(values), chunksize)]
+        scores = np.vstack(parts) if parts else np.empty((0, self.n_components))
+        return scores[:, :n_components or self.n_components]
+
+
+def _fit_model(X, n_components, solver, batch_size, random_state):
+    n_rows, n_features = X.shape
+    max_components = min(n_rows, n_features)
+    if solver == 'auto':
+        solver = 'full' if n_rows * n_features <= _RANDOMIZED_CELLS else 'randomized'
+    if solver == 'full':
+        # All components are kept so any later request is served from the cache
+        model = PCA(n_components=max_components)
+    elif solver == 'randomized':
+        model = PCA(n_components=min(n_components or max_components, max_components),
+                    svd_solver='randomized', random_state=random_state)
+    else:
+        model = IncrementalPCA(n_components=min(n_components or max_components, max_components),
+                               batch_size=batch_size)
+    return model.fit(X), solver
+
+
+def _serves(cached, n_components, solver):
+    """Whether a cached decomposition can answer a request (the exact SVD answers any)"""
+    if cached.solver == 'full':
+        return True
+    if n_components is None or cached.n_components < n_components:
+        return False
+    return solver in ('auto', cached.solver)
+
+
+def decompose(df, columns, n_components=None, solver='auto', batch_size=None, version=None,
+              random_state=42, use_cache=True):
+    """
+    Standardize the complete rows of ``columns`` and fit their principal
+    components, once per (column set, data version).
+
+    ``solver`` is 'full' (exact SVD, all components), 'randomized'
+    (randomized SVD of the first ``n_components``), 'incremental'
+    (``IncrementalPCA`` in batches of ``batch_size`` rows) or 'auto' (full,
+    randomized above 50M cells). The data version is a content hash of the
+    block unless ``version`` is given. A cached decomposition is reused
+    whenever it has at least ``n_components`` components, so the loadings,
+    the scree data and the cluster projection of one run share a single
+    scaling and SVD.
+
+    Returns a ``Decomposition``.
+    """
+    if solver not in DECOMPOSITION_SOLVERS:
+        raise ValueError(f"Unknown solver: {solver}")
+    columns = list(columns)
+    data = df[columns].dropna()
+    values = data.to_numpy(dtype=np.float64)
+
+    key = (schema_hash(columns), version or data_version(values))
+    cached = _DECOMPOSITION_CACHE.get(key) if use_cache else None
+    if cached is not None and _serves(cached, n_components, solver):
+        return cached
+
+    scaler = StandardScaler()
+    X = scaler.fit_transform(values)
+    model, fitted_solver = _fit_model(X, n_components, solver, batch_size, random_state)
+    decomposition = Decomposition(columns, data.index, X, scaler, model, fitted_solver)
+
+    if use_cache:
+        if key not in _DECOMPOSITION_CACHE and len(_DECOMPOSITION_CACHE) >= _MAX_CACHED_DECOMPOSITIONS:
+            _DECOMPOSITION_CACHE.pop(next(iter(_DECOMPOSITION_CACHE)))
+        _DECOMPOSITION_CACHE[key] = decomposition
+    return decomposition
+
+
+def incremental_decompose(chunks, columns, n_components, batch_size=None):
+    """
+    Out-of-core PCA over data that does not fit in memory.
+
+    ``chunks`` is a callable returning a fresh iterator of DataFrame chunks
+    (e.g. ``lambda: iter_survey_chunks(path, usecols=columns)``). The first
+    pass fits the StandardScaler and the second the ``IncrementalPCA``,
+    both with ``partial_fit``; incomplete rows are dropped. Returns a
+    ``Decomposition`` without the scaled matrix.
+    """
+    columns = list(columns)
+    scaler = StandardScaler()
+    for chunk in chunks():
+        values = chunk[columns].dropna().to_numpy(dtype=np.float64)
+        if len(values):
+            scaler.partial_fit(values)
+
+    model = IncrementalPCA(n_components=n_components, batch_size=batch_size)
+    min_rows = max(n_components, batch_size or 0)
+    pending, carried = [], None
+    for chunk in chunks():
+        values = chunk[columns].dropna().to_numpy(dtype=np.float64)
+        if len(values):
+            pending.append(scaler.transform(values))
+        if sum(len(part) for part in pending) >= min_rows:
+            # partial_fit needs at least n_components rows per call, so one
+            # full batch is held back to absorb a short final remainder
+            if carried is not None:
+                model.partial_fit(carried)
+            carried, pending = np.vstack(pending), []
+    remainder = ([carried] if carried is not None else []) + pending
+    if remainder:
+        model.partial_fit(np.vstack(remainder))
+    return Decomposition(columns, None, None, scaler, model, 'incremental')
+
+
+def clear_decomposition_cache():
+    _DECOMPOSITION_CACHE.clear()
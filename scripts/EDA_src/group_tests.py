@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .correlations import rank_columns
+
+GROUP_TESTS = ('anova', 'kruskal', 'chi2')
+
+
+def _group_indicator(groups):
+    """Factorize the grouping column; returns (row mask, labels, codes, one-hot matrix) for rows with a group"""
+    codes, labels = pd.factorize(groups, sort=True)
+    keep = codes >= 0
+    codes = codes[keep]
+    indicator = np.zeros((len(codes), len(labels)))
+    indicator[np.arange(len(codes)), codes] = 1.0
+    return keep, labels, codes, indicator
+
+
+def _tie_correction(t):
+    """Kruskal-Wallis tie correction 1 - sum(t^3 - t) / (N^3 - N) from tie group sizes"""
+    n = t.sum()
+    return 1.0 - (t ** 3 - t).sum() / (n ** 3 - n) if n > 1 else np.nan
+
+
+def _anova(indicator, Y, valid):
+    """One-way ANOVA of every outcome column from group counts, sums and sums of squares"""
+    Y0 = np.where(valid, Y - np.nanmean(Y, axis=0), 0.0)
+    M = valid.astype(np.float64)
+    counts = indicator.T @ M
+    sums = indicator.T @ Y0
+    sq_sums = indicator.T @ (Y0 * Y0)
+
+    n = counts.sum(axis=0)
+    k = (counts > 0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        between_terms = np.where(counts > 0, sums ** 2 / counts, 0.0).sum(axis=0)
+        ss_between = between_terms - sums.sum(axis=0) ** 2 / n
+        ss_within = sq_sums.sum(axis=0) - between_terms
+        df_between, df_within = k - 1, n - k
+        f_stat = (ss_between / df_between) / (ss_within / df_within)
+        eta_sq = ss_between / (ss_between + ss_within)
+    p_value = stats.f.sf(f_stat, df_between, df_within)
+    f_stat = np.where(k > 1, f_stat, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (sums / counts) + np.nanmean(Y, axis=0)
+    return {
+        'n': n,
+        'n_groups': k,
+        'f_stat': f_stat,
+        'anova_p': np.where(k > 1, p_value, np.nan),
+        'eta_sq': np.where(k > 1, eta_sq, np.nan)
+    }, counts, means
+
+
+def _kruskal(indicator, Y, valid):
+    """Kruskal-Wallis H of every outcome from rank sums per group (ranks computed once per column)"""
+    ranks = np.where(valid, rank_columns(Y), 0.0)
+    counts = indicator.T @ valid.astype(np.float64)
+    rank_sums = indicator.T @ ranks
+    n = counts.sum(axis=0)
+    k = (counts > 0).sum(axis=0)
+
+    correction = np.empty(Y.shape[1])
+    for j in range(Y.shape[1]):
+        _, ties = np.unique(Y[valid[:, j], j], return_counts=True)
+        correction[j] = _tie_correction(ties.astype(np.float64))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = 12.0 / (n * (n + 1)) * np.where(counts > 0, rank_sums ** 2 / counts, 0.0).sum(axis=0) - 3 * (n + 1)
+        h = h / correction
+        epsilon_sq = h / (n - 1)
+    p_value = stats.chi2.sf(h, k - 1)
+    return {
+        'kruskal_h': np.where(k > 1, h, np.nan),
+        'kruskal_p': np.where(k > 1, p_value, np.nan),
+        'epsilon_sq': np.where(k > 1, epsilon_sq, np.nan)
+    }
+
+
+def _chi_square(codes, n_groups, Y, valid, max_levels, correction):
+    """
+    Chi-square test of independence between the groups and every outcome's
+    levels. Each outcome's contingency table is one ``np.bincount`` of
+    ``group * levels + level`` over its non-missing rows, so memory stays at
+    one table per outcome; empty rows and columns are dropped like
+    ``pd.crosstab`` does, and Yates' correction is applied to 1-dof tables
+    like ``scipy.stats.chi2_contingency``.
+    """
+    q = Y.shape[1]
+    chi2 = np.full(q, np.nan)
+    dof = np.full(q, np.nan)
+    cramers_v = np.full(q, np.nan)
+
+    testable = []
+    counts = []
+    for j in range(q):
+        rows = valid[:, j]
+        values, levels = np.unique(Y[rows, j], return_inverse=True)
+        if 1 <= len(values) <= max_levels:
+            testable.append(j)
+            counts.append(np.bincount(codes[rows] * len(values) + levels,
+                                      minlength=n_groups * len(values)).reshape(n_groups, len(values)))
+    if not testable:
+        return {'chi2': chi2, 'chi2_dof': dof, 'chi2_p': np.full(q, np.nan), 'cramers_v': cramers_v}
+
+    L = max(table.shape[1] for table in counts)
+    tables = np.zeros((len(testable), n_groups, L))
+    for slot, table in enumerate(counts):
+        tables[slot, :, :table.shape[1]] = table
+
+    row_totals = tables.sum(axis=2, keepdims=True)
+    col_totals = tables.sum(axis=1, keepdims=True)
+    total = tables.sum(axis=(1, 2))
+    n_rows_used = (row_totals[:, :, 0] > 0).sum(axis=1)
+    n_cols_used = (col_totals[:, 0, :] > 0).sum(axis=1)
+    table_dof = (n_rows_used - 1) * (n_cols_used - 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected = row_totals * col_totals / total[:, None, None]
+        diff = np.abs(tables - expected)
+        if correction:
+            yates = (table_dof == 1)[:, None, None]
+            diff = np.where(yates, np.maximum(diff - np.minimum(0.5, diff), 0.0), diff)
+        terms = np.where(expected > 0, diff ** 2 / expected, 0.0)
+        stat = terms.sum(axis=(1, 2))
+        min_dim = np.minimum(n_rows_used, n_cols_used) - 1
+        v = np.sqrt(stat / (total * min_dim))
+
+    ok = table_dof > 0
+    chi2[testable] = np.where(ok, stat, np.nan)
+    dof[testable] = np.where(ok, table_dof, np.nan)
+    cramers_v[testable] = np.where(ok, v, np.nan)
+    return {'chi2': chi2, 'chi2_dof': dof, 'chi2_p': stats.chi2.sf(chi2, dof), 'cramers_v': cramers_v}
+
+
+def compare_groups(df, group_col, outcomes=None, tests=GROUP_TESTS, max_levels=20, correction=True):
+    """
+    Compare every outcome column across the groups of ``group_col`` at once.
+
+    The grouping column is factorized once into an indicator matrix; group
+    counts, sums, sums of squares and rank sums of all outcomes then come
+    from a few matmuls with it, and the contingency tables from one bincount
+    per outcome. Per outcome this gives
+    one-way ANOVA (F, p, eta squared), Kruskal-Wallis (H with tie
+    correction, p, epsilon squared) and, for outcomes with at most
+    ``max_levels`` distinct values, the chi-square test of independence
+    (statistic, dof, p, Cramer's V). Missing outcome values are dropped per
+    outcome; rows without a group are dropped.
+
+    Returns a dict with 'tests' (one row per outcome), 'group_means' and
+    'group_counts' (groups x outcomes).
+    """
+    tests = [tests] if isinstance(tests, str) else list(tests)
+    unknown = set(tests) - set(GROUP_TESTS)
+    if unknown:
+        raise ValueError(f"Unknown group tests: {sorted(unknown)}")
+    if outcomes is None:
+        outcomes = [col for col in df.select_dtypes(include=['number', 'bool']).columns if col != group_col]
+    outcomes = list(outcomes)
+
+    keep, labels, codes, indicator = _group_indicator(df[group_col])
+    Y = df[outcomes].to_numpy(dtype=np.float64, na_value=np.nan)[keep]
+    valid = ~np.isnan(Y)
+
+    columns, counts, means = _anova(indicator, Y, valid)
+    result = dict(columns) if 'anova' in tests else {'n': columns['n'], 'n_groups': columns['n_groups']}
+    if 'kruskal' in tests:
+        result.update(_kruskal(indicator, Y, valid))
+    if 'chi2' in tests:
+        result.update(_chi_square(codes, len(labels), Y, valid, max_levels, correction))
+
+    table = pd.DataFrame(result, index=pd.Index(outcomes, name='outcome'))
+    table['n'] = table['n'].astype(np.int64)
+    table['n_groups'] = table['n_groups'].astype(np.int64)
+    group_index = pd.Index(labels, name=group_col)
+    return {
+        'tests': table,
+        'group_means': pd.DataFrame(means, index=group_index, columns=outcomes),
+        'group_counts': pd.DataFrame(counts.astype(np.int64), index=group_index, columns=outcomes)
+    }
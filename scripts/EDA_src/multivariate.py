@@ -2,66 +2,65 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
 
-def correlation_matrix(df, columns=None, figsize=(12, 10), title='Correlation Matrix'):
+from .summaries import strong_correlations
+from .clustering import select_kmeans, cluster_profiles
+from .decomposition import decompose
+
+def correlation_matrix(df, columns=None, figsize=(12, 10), title='Correlation Matrix', plot=True, weights=None):
     """
-    Plot correlation matrix for selected variables
+    Plot correlation matrix for selected variables.
+    Returns the ``strong_correlations`` dict (matrix and pairs with
+    |r| > 0.5); plotting is skipped with ``plot=False``. Survey ``weights``
+    give weighted correlations.
     """
-    if columns is None:
-        # Use all numeric columns
-        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-        columns = numeric_cols
-    
-    corr = df[columns].corr()
-    
-    plt.figure(figsize=figsize)
-    mask = np.triu(np.ones_like(corr, dtype=bool))
-    
-    # Create heatmap
-    sns.heatmap(corr, mask=mask, annot=True, fmt='.2f', cmap='coolwarm', 
-                square=True, linewidths=.5)
-    
-    plt.title(title)
-    plt.tight_layout()
-    plt.show()
-    
-    # Find strong correlations
-    strong_corr = corr.unstack()
-    strong_corr = strong_corr[strong_corr < 1.0]  # Remove self-correlations
-    strong_corr = strong_corr[abs(strong_corr) > 0.5]  # Filter for strong correlations
+    result = strong_correlations(df, columns, threshold=0.5, weights=weights)
+    corr = result['corr']
+
+    if plot:
+        plt.figure(figsize=figsize)
+        mask = np.triu(np.ones_like(corr, dtype=bool))
+        
+        # Create heatmap
+        sns.heatmap(corr, mask=mask, annot=True, fmt='.2f', cmap='coolwarm', 
+                    square=True, linewidths=.5)
+        
+        plt.title(title)
+        plt.tight_layout()
+        plt.show()
     
+    # Report strong correlations
+    strong_corr = result['strong_pairs']
     if not strong_corr.empty:
-        strong_corr = strong_corr.sort_values(ascending=False)
         print("Strong correlations (|r| > 0.5):")
         print(strong_corr)
     else:
         print("No strong correlations (|r| > 0.5) found.")
 
+    return result
+
 
-def pca_analysis(df, columns=None, n_components=2, figsize=(16, 7)):
+def pca_analysis(df, columns=None, n_components=2, figsize=(16, 7), solver='auto', batch_size=None):
     """
-    Perform PCA analysis for dimensionality reduction and visualization
+    Perform PCA analysis for dimensionality reduction and visualization.
+    The scaling and SVD come from the shared ``decompose`` cache (``solver``
+    'full', 'randomized', 'incremental' or 'auto'); the returned model holds
+    ``n_components`` components.
     """
     if columns is None:
         # Use all numeric columns
         numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
         columns = numeric_cols
     
-    # Standardize the data
-    data = df[columns].dropna()
-    if data.shape[0] < 10:  # Too few observations
+    # Complete observations are standardized inside decompose
+    if df[columns].dropna().shape[0] < 10:  # Too few observations
         print("Not enough complete observations for PCA analysis")
         return
     
-    X = StandardScaler().fit_transform(data)
-    
     # Perform PCA
-    pca = PCA(n_components=n_components)
-    principal_components = pca.fit_transform(X)
+    decomposition = decompose(df, columns, n_components=n_components, solver=solver, batch_size=batch_size)
+    pca = decomposition.pca(n_components)
+    principal_components = decomposition.scores(n_components)
     
     # Create DataFrame with principal components
     pca_df = pd.DataFrame(
@@ -74,7 +73,7 @@ def pca_analysis(df, columns=None, n_components=2, figsize=(16, 7)):
     
     # Plot explained variance
     plt.subplot(1, 2, 1)
-    explained_var = pca.explained_variance_ratio_ * 100
+    explained_var = pca.explained_variance_ratio_[:n_components] * 100
     plt.bar(range(n_components), explained_var)
     plt.xlabel('Principal Components')
     plt.ylabel('Explained Variance (%)')
@@ -98,7 +97,7 @@ def pca_analysis(df, columns=None, n_components=2, figsize=(16, 7)):
         
         # Plot feature vectors
         features = columns
-        loadings = pca.components_.T * np.sqrt(pca.explained_variance_)
+        loadings = decomposition.correlation_loadings(n_components)
         
         for i, feature in enumerate(features):
             if i < len(loadings):  # Safety check
@@ -117,19 +116,20 @@ def pca_analysis(df, columns=None, n_components=2, figsize=(16, 7)):
     print(f"Total explained variance: {sum(explained_var):.2f}%")
     
     # Display component loadings
-    loadings_df = pd.DataFrame(
-        pca.components_.T,
-        columns=[f'PC{i+1}' for i in range(n_components)],
-        index=columns
-    )
+    loadings_df = decomposition.loadings(n_components)
     print("\nComponent Loadings:")
     print(loadings_df)
     
     return pca, loadings_df
 
-def cluster_analysis(df, columns=None, n_clusters=3, figsize=(15, 5)):
+def cluster_analysis(df, columns=None, n_clusters=3, figsize=(15, 5), scalable=False, batch_size=1024,
+                     sample_size=10_000, random_state=42):
     """
-    Perform cluster analysis to identify groups in the data
+    Perform cluster analysis to identify groups in the data.
+    With ``scalable=True`` the k search uses MiniBatchKMeans (warm start
+    and k-means++ restarts) and a silhouette on ``sample_size`` rows (see
+    ``select_kmeans``; the chosen k can differ from the default mode), and
+    only a sample of the points is drawn.
     """
     if columns is None:
         # Use all numeric columns
@@ -142,28 +142,32 @@ def cluster_analysis(df, columns=None, n_clusters=3, figsize=(15, 5)):
         print("Not enough complete observations for cluster analysis")
         return
     
-    X = StandardScaler().fit_transform(data)
+    # Scaling and PCA projection are shared with pca_analysis through the cache
+    decomposition = decompose(df, columns, n_components=2, solver='randomized' if scalable else 'auto')
+    X = decomposition.X
     
     # Find optimal number of clusters using silhouette score
-    sil_scores = []
     k_range = range(2, min(6, data.shape[0]))  # Test 2 to 5 clusters
-    
-    for k in k_range:
-        kmeans = KMeans(n_clusters=k, random_state=42)
-        labels = kmeans.fit_predict(X)
-        sil_scores.append(silhouette_score(X, labels))
+    selection = select_kmeans(X, k_range, scalable=scalable, batch_size=batch_size,
+                              sample_size=sample_size, random_state=random_state)
+    sil_scores = [selection['scores'][k] for k in k_range]
     
     # Find optimal K
-    optimal_k = k_range[np.argmax(sil_scores)]
+    optimal_k = selection['optimal_k']
     print(f"Optimal number of clusters based on silhouette score: {optimal_k}")
     
-    # Perform clustering with optimal K
-    kmeans = KMeans(n_clusters=optimal_k, random_state=42)
-    labels = kmeans.fit_predict(X)
+    # Reuse the model already fitted for the optimal K
+    kmeans = selection['models'][optimal_k]
+    labels = kmeans.labels_
     
     # Add cluster labels to the original data
     data_with_clusters = data.copy()
     data_with_clusters['Cluster'] = labels
+
+    # Only a sample of the points is drawn in scalable mode
+    shown = np.arange(len(data))
+    if scalable and sample_size is not None and sample_size < len(data):
+        shown = np.sort(np.random.default_rng(random_state).choice(len(data), sample_size, replace=False))
     
     # Plot results
     plt.figure(figsize=figsize)
@@ -180,7 +184,8 @@ def cluster_analysis(df, columns=None, n_clusters=3, figsize=(15, 5)):
     if len(columns) >= 2:
         # Plot clusters on first two features
         plt.subplot(1, 3, 2)
-        scatter = plt.scatter(data[columns[0]], data[columns[1]], c=labels, cmap='viridis', alpha=0.7)
+        scatter = plt.scatter(data[columns[0]].iloc[shown], data[columns[1]].iloc[shown], c=labels[shown],
+                              cmap='viridis', alpha=0.7)
         plt.xlabel(columns[0])
         plt.ylabel(columns[1])
         plt.title(f'Clusters on First Two Features')
@@ -188,11 +193,10 @@ def cluster_analysis(df, columns=None, n_clusters=3, figsize=(15, 5)):
         
         # If we performed PCA, plot clusters on PC space
         try:
-            pca = PCA(n_components=2)
-            X_pca = pca.fit_transform(X)
+            X_pca = decomposition.scores(2)
             
             plt.subplot(1, 3, 3)
-            scatter = plt.scatter(X_pca[:, 0], X_pca[:, 1], c=labels, cmap='viridis', alpha=0.7)
+            scatter = plt.scatter(X_pca[shown, 0], X_pca[shown, 1], c=labels[shown], cmap='viridis', alpha=0.7)
             plt.xlabel('PC1')
             plt.ylabel('PC2')
             plt.title('Clusters in PCA Space')
@@ -205,13 +209,14 @@ def cluster_analysis(df, columns=None, n_clusters=3, figsize=(15, 5)):
     
     # Analyze cluster characteristics
     print("\nCluster Profiles:")
-    cluster_profiles = data_with_clusters.groupby('Cluster').mean()
-    print(cluster_profiles)
+    profiles = cluster_profiles(data, labels, n_clusters=optimal_k)
+    cluster_profiles_df = profiles['profiles']
+    print(cluster_profiles_df)
     
     # Count observations in each cluster
-    cluster_counts = data_with_clusters['Cluster'].value_counts().sort_index()
+    cluster_counts = profiles['sizes']
     print("\nCluster Sizes:")
     for cluster, count in cluster_counts.items():
         print(f"Cluster {cluster}: {count} observations ({count/len(data_with_clusters)*100:.1f}%)")
     
-    return kmeans, data_with_clusters
\ No newline at end of file
+    return kmeans, data_with_clusters
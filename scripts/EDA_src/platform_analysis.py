@@ -9,20 +9,45 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from .multivariate import correlation_matrix, pca_analysis, cluster_analysis
+from .registry import get_registry
+from .weighting import resolve_weights, weighted_group_means, weighted_summary, effective_sample_size
+from ..inference.path_model import fit_path_model
 
-def analyze_purchase_behavior(df):
+# Column measuring each construct of the conceptual model
+CONCEPTUAL_MODEL_COLUMNS = {
+    'peou': 'peou_avg', 'pu': 'pu_avg', 'sa': 'sa_avg', 'si': 'si_avg',
+    'att': 'att_avg', 'risk': 'risk_avg', 'opi': 'opi_satisfaction'
+}
+
+def analyze_purchase_behavior(df, weights=None):
     """
-    Analyze purchase behavior during crisis
+    Analyze purchase behavior during crisis.
+    With survey ``weights`` (a column name or an array aligned with ``df``,
+    e.g. from ``rake_weights``) the rates, construct averages and the
+    logistic GLM are weighted.
     """
     print("\n" + "="*80)
     print("ANALYZING PURCHASE BEHAVIOR DURING CRISIS")
     print("="*80)
+    weights = resolve_weights(df, weights)
+    if weights is not None:
+        ess = effective_sample_size(weights)
+        print(f"Survey-weighted estimates (effective sample size {ess['n_effective']:.1f} "
+              f"of {ess['n']}, design effect {ess['design_effect']:.2f})")
+
+    def group_rate(group_col, value_col):
+        if weights is None:
+            return df.groupby(group_col)[value_col].mean()
+        return weighted_group_means(df, group_col, value_col, weights)
     
     # Check if the purchase indicator exists
     purchase_col = 'opi_purchased?'
     if purchase_col in df.columns:
         # Basic stats
-        purchase_rate = df[purchase_col].mean() * 100
+        if weights is None:
+            purchase_rate = df[purchase_col].mean() * 100
+        else:
+            purchase_rate = weighted_summary(df, [purchase_col], weights)['mean'].iloc[0] * 100
         print(f"Online purchase rate during crisis: {purchase_rate:.2f}%")
         
         # Visualize purchase rates
@@ -31,7 +56,7 @@ def analyze_purchase_behavior(df):
         # Purchase rate by gender
         if 'gender_encoded' in df.columns:
             plt.subplot(1, 3, 1)
-            purchase_by_gender = df.groupby('gender_encoded')[purchase_col].mean() * 100
+            purchase_by_gender = group_rate('gender_encoded', purchase_col) * 100
             purchase_by_gender.plot(kind='bar')
             plt.title('Purchase Rate by Gender')
             plt.ylabel('Percentage (%)')
@@ -40,7 +65,7 @@ def analyze_purchase_behavior(df):
         # Purchase rate by age
         if 'age_encoded' in df.columns:
             plt.subplot(1, 3, 2)
-            purchase_by_age = df.groupby('age_encoded')[purchase_col].mean() * 100
+            purchase_by_age = group_rate('age_encoded', purchase_col) * 100
             purchase_by_age.plot(kind='bar')
             plt.title('Purchase Rate by Age Group')
             plt.ylabel('Percentage (%)')
@@ -49,7 +74,7 @@ def analyze_purchase_behavior(df):
         # Purchase satisfaction
         if 'opi_satisfaction' in df.columns:
             plt.subplot(1, 3, 3)
-            df.groupby(purchase_col)['opi_satisfaction'].mean().plot(kind='bar')
+            group_rate(purchase_col, 'opi_satisfaction').plot(kind='bar')
             plt.title('Avg. Satisfaction by Purchase Status')
             plt.ylabel('Satisfaction Score')
             plt.xlabel('Made Purchase (0=No, 1=Yes)')
@@ -70,6 +95,10 @@ def analyze_purchase_behavior(df):
                 avg_col = f'{prefix}avg'
                 if avg_col in df.columns:
                     key_vars.append(avg_col)
+
+            if weights is not None and key_vars:
+                print("\nWeighted construct averages:")
+                print(weighted_summary(df, key_vars, weights))
             
             # Add demographic variables
             demo_vars = ['gender_encoded', 'age_encoded', 'education_encoded']
@@ -79,16 +108,25 @@ def analyze_purchase_behavior(df):
             formula = f"purchase_status ~ " + " + ".join(key_vars)
             
             # Fit model
-            model = glm(formula=formula, data=temp_df, family=sm.families.Binomial()).fit()
+            if weights is None:
+                model = glm(formula=formula, data=temp_df, family=sm.families.Binomial()).fit()
+            else:
+                # Pseudo-likelihood fit with sandwich standard errors, the usual
+                # design-based inference for survey weights
+                model = glm(formula=formula, data=temp_df, family=sm.families.Binomial(),
+                            var_weights=weights).fit(cov_type='HC0')
             print(model.summary())
         except Exception as e:
             print(f"Could not build logistic regression model: {e}")
 
 
-def analyze_platform_usage(df):
+def analyze_platform_usage(df, registry=None, weights=None):
     """
     Analyze platform usage patterns
+    (service averages and platform counts are weighted with survey ``weights``)
     """
+    registry = get_registry(df, registry)
+    weights = resolve_weights(df, weights)
     print("\n" + "="*80)
     print("ANALYZING PLATFORM USAGE PATTERNS")
     print("="*80)
@@ -115,14 +153,13 @@ def analyze_platform_usage(df):
     
     # Breakdown by service type
     plt.subplot(1, 2, 2)
-    service_avgs = []
-    labels = []
-    
-    for col in ['platform_count', 'pharmacy_count', 'fashion_count', 
-                'grocery_count', 'automobile_count']:
-        if col in df.columns:
-            service_avgs.append(df[col].mean())
-            labels.append(col.replace('_count', ''))
+    service_cols = [col for col in ['platform_count', 'pharmacy_count', 'fashion_count',
+                                    'grocery_count', 'automobile_count'] if col in df.columns]
+    if weights is None or not service_cols:
+        service_avgs = [df[col].mean() for col in service_cols]
+    else:
+        service_avgs = weighted_summary(df, service_cols, weights)['mean'].tolist()
+    labels = [col.replace('_count', '') for col in service_cols]
     
     plt.bar(labels, service_avgs)
     plt.title('Average Usage by Service Type')
@@ -133,9 +170,13 @@ def analyze_platform_usage(df):
     plt.show()
     
     # Top platforms analysis
-    platform_cols = [col for col in df.columns if col.startswith('gecp_') and col != 'gecp_None']
-    if platform_cols:
-        platform_usage = df[platform_cols].sum().sort_values(ascending=False)
+    if len(registry.positions('gecp', exclude_none=True)):
+        platform_block = registry.block(df, 'gecp', exclude_none=True)
+        if weights is None:
+            platform_usage = platform_block.sum()
+        else:
+            platform_usage = pd.Series(weights @ platform_block.to_numpy(dtype=np.float64), index=platform_block.columns)
+        platform_usage = platform_usage.sort_values(ascending=False)
         
         plt.figure(figsize=(12, 6))
         platform_usage.head(10).plot(kind='bar')
@@ -146,20 +187,27 @@ def analyze_platform_usage(df):
         plt.tight_layout()
         plt.show()
 
-def correlation_analysis(df, constructs):
+def correlation_analysis(df, constructs=None, registry=None, weights=None):
     """
     Perform correlation analysis between key constructs
+    (weighted Pearson correlations with survey ``weights``)
     """
+    weights = resolve_weights(df, weights)
+    if constructs is None:
+        registry = get_registry(df, registry)
+        constructs = {name: registry.columns(name) for name in ['peou', 'pu', 'sa', 'si', 'att', 'risk', 'opi']}
+    
     print("\n" + "="*80)
     print("CORRELATION ANALYSIS BETWEEN CONSTRUCTS")
     print("="*80)
     
     # Get average scores for each construct
-    avg_cols = [col for col in df.columns if col.endswith('avg')]
+    avg_cols = [f'{name}_avg' for name in ['peou', 'pu', 'sa', 'si', 'att', 'risk']
+                if f'{name}_avg' in df.columns]
     
     if len(avg_cols) >= 2:
         # Correlation matrix for construct averages
-        correlation_matrix(df, avg_cols, title='Correlation between Constructs')
+        correlation_matrix(df, avg_cols, title='Correlation between Constructs', weights=weights)
     
     # Correlation between key constructs and outcomes
     outcome_vars = constructs['opi']
@@ -173,17 +221,27 @@ def correlation_analysis(df, constructs):
     # Create correlation matrix between predictors and outcomes
     all_vars = predictor_vars + outcome_vars
     if len(all_vars) >= 2:
-        correlation_matrix(df, all_vars, title='Correlation between Predictors and Outcomes')
+        correlation_matrix(df, all_vars, title='Correlation between Predictors and Outcomes', weights=weights)
 
-def create_conceptual_model(df, constructs):
+def create_conceptual_model(df, constructs, estimates='path', return_fit=False):
     """
     Create a visualization of the online purchase intention conceptual model
-    with correlation information and styling improvements
+    with correlation information and styling improvements.
+    With ``estimates='path'`` the arrows show standardized ML path
+    coefficients (see ``conceptual_path_model``) and the figure notes the
+    model fit; ``estimates='correlation'`` shows the bivariate correlations.
+    Falls back to correlations when the model columns are missing.
+    ``return_fit=True`` also returns the fit indices (None for correlations).
     """
     from matplotlib.patches import FancyBboxPatch
     
-    # 1. Setup the figure and calculate correlations
-    correlations = _calculate_correlations(df)
+    # 1. Setup the figure and calculate path estimates or correlations
+    fit = None
+    if estimates == 'path' and _has_model_columns(df):
+        correlations, fit = _calculate_path_estimates(df)
+    else:
+        correlations = _calculate_correlations(df)
+    symbol = 'β' if fit else 'r'
     fig, ax = _setup_figure()
     
     # 2. Define and draw the constructs (boxes)
@@ -192,16 +250,43 @@ def create_conceptual_model(df, constructs):
     
     # 3. Define and draw relationship arrows
     arrow_props = _get_arrow_properties()
-    _draw_arrows(ax, arrow_props, correlations)
+    _draw_arrows(ax, arrow_props, correlations, symbol)
     
     # 4. Add explanatory text and legend
-    _add_legend_and_notes(fig)
+    _add_legend_and_notes(fig, fit)
     
     plt.tight_layout()
     plt.show()
     
+    if return_fit:
+        return correlations, fit
     return correlations
 
+def conceptual_model_edges():
+    """(source, target) construct pairs of the conceptual model, in arrow order"""
+    return [tuple(key.split('_')) for *_, key, _ in _get_arrow_properties()]
+
+def conceptual_path_model(df, n_boot=0, seed=None):
+    """
+    Fit the conceptual model's arrows as an ML path model on the construct
+    columns of ``CONCEPTUAL_MODEL_COLUMNS`` (see ``fit_path_model``)
+    """
+    edges = [(CONCEPTUAL_MODEL_COLUMNS[source], CONCEPTUAL_MODEL_COLUMNS[target])
+             for source, target in conceptual_model_edges()]
+    return fit_path_model(df, edges, n_boot=n_boot, seed=seed)
+
+def _has_model_columns(df):
+    return all(col in df.columns for col in CONCEPTUAL_MODEL_COLUMNS.values())
+
+def _calculate_path_estimates(df):
+    """Standardized path coefficients keyed like the correlations, and the model fit"""
+    model = conceptual_path_model(df)
+    estimates = {
+        f'{source}_{target}': round(float(value), 2)
+        for (source, target), value in zip(conceptual_model_edges(), model['paths']['std_estimate'])
+    }
+    return estimates, model['fit']
+
 def _calculate_correlations(df):
     """Calculate correlations between model constructs"""
     correlations = {}
@@ -306,8 +391,8 @@ def _get_arrow_properties():
         (3, 4, 5, 3.1, 'sa_risk', False)     # SA -> RISK
     ]
 
-def _draw_arrows(ax, arrow_props, correlations):
-    """Draw the relationship arrows with correlation information"""
+def _draw_arrows(ax, arrow_props, correlations, symbol='r'):
+    """Draw the relationship arrows with correlation (or path estimate) information"""
     for x1, y1, x2, y2, corr_key, is_positive in arrow_props:
         # Get correlation value if available
         corr_value = correlations.get(corr_key, None)
@@ -333,7 +418,7 @@ def _draw_arrows(ax, arrow_props, correlations):
         
         # Add correlation label if available
         if corr_value is not None:
-            _add_correlation_label(ax, x1, y1, x2, y2, corr_value, color)
+            _add_correlation_label(ax, x1, y1, x2, y2, corr_value, color, symbol)
 
 def _get_arrow_style(corr_value, is_positive):
     """Determine arrow width and color based on correlation"""
@@ -351,8 +436,8 @@ def _get_arrow_style(corr_value, is_positive):
         
     return width, color
 
-def _add_correlation_label(ax, x1, y1, x2, y2, corr_value, color):
-    """Add a label showing the correlation value"""
+def _add_correlation_label(ax, x1, y1, x2, y2, corr_value, color, symbol='r'):
+    """Add a label showing the correlation value (or path estimate)"""
     # Calculate midpoint for label position with slight offset
     mid_x = (x1 + x2) / 2
     mid_y = (y1 + y2) / 2
@@ -362,7 +447,7 @@ def _add_correlation_label(ax, x1, y1, x2, y2, corr_value, color):
     # Add correlation text
     ax.text(
         mid_x + offset_x, mid_y + offset_y,
-        f'r = {corr_value}',
+        f'{symbol} = {corr_value}',
         fontsize=8,
         color=color,
         fontweight='bold',
@@ -371,14 +456,15 @@ def _add_correlation_label(ax, x1, y1, x2, y2, corr_value, color):
         bbox=dict(facecolor='white', alpha=0.7, edgecolor='none', boxstyle='round,pad=0.2')
     )
 
-def _add_legend_and_notes(fig):
-    """Add legend and explanatory notes to the figure"""
+def _add_legend_and_notes(fig, fit=None):
+    """Add legend and explanatory notes (and the path model fit, if any) to the figure"""
     # Add legend explaining the model
+    strength = 'Path strength' if fit else 'Correlation strength'
     legend_text = (
         'Model Components:\n'
         '• Blue boxes: Mediating variables\n'
         '• Green box: Outcome variable\n'
-        '• Arrow width: Correlation strength\n'
+        f'• Arrow width: {strength}\n'
         '• Blue arrows: Positive relationships\n'
         '• Red arrows: Negative relationships'
     )
@@ -386,18 +472,29 @@ def _add_legend_and_notes(fig):
              bbox=dict(facecolor='white', alpha=0.8, boxstyle='round,pad=0.5'))
     
     # Add a research context note
-    note_text = (
-        'Note: This model illustrates key relationships in online purchase intention.\n'
-        'Arrows indicate causal paths, with correlation values (r) where available.'
-    )
+    if fit:
+        note_text = (
+            'Note: This model illustrates key relationships in online purchase intention.\n'
+            'Arrows show standardized ML path coefficients (β); '
+            f'CFI = {fit["cfi"]:.3f}, RMSEA = {fit["rmsea"]:.3f}, SRMR = {fit["srmr"]:.3f}.'
+        )
+    else:
+        note_text = (
+            'Note: This model illustrates key relationships in online purchase intention.\n'
+            'Arrows indicate causal paths, with correlation values (r) where available.'
+        )
     fig.text(0.98, 0.02, note_text, fontsize=9, ha='right',
             bbox=dict(facecolor='white', alpha=0.8, boxstyle='round,pad=0.5'))
 
 # Use in the multivariate_analysis function
-def multivariate_analysis(df, constructs):
+def multivariate_analysis(df, constructs=None, registry=None):
     """
     Perform advanced multivariate analysis
     """
+    if constructs is None:
+        registry = get_registry(df, registry)
+        constructs = {name: registry.columns(name) for name in ['peou', 'pu', 'sa', 'si', 'att', 'risk', 'opi']}
+    
     print("\n" + "="*80)
     print("ADVANCED MULTIVARIATE ANALYSIS")
     print("="*80)
@@ -416,11 +513,15 @@ def multivariate_analysis(df, constructs):
         cluster_analysis(df, outcome_vars)
     
     # Create improved conceptual model visualization
-    correlations = create_conceptual_model(df, constructs)
+    correlations, fit = create_conceptual_model(df, constructs, return_fit=True)
     
-    # Print key correlations for interpretation
+    # Print key path estimates (or correlations) for interpretation
     if correlations:
-        print("\nKey Correlations in Conceptual Model:")
+        has_paths = fit is not None
+        symbol = 'β' if has_paths else 'r'
+        print(f"\nKey {'Path Estimates' if has_paths else 'Correlations'} in Conceptual Model:")
         for relation, value in correlations.items():
             from_var, to_var = relation.split('_')
-            print(f"• {from_var.upper()} → {to_var.upper()}: r = {value}")
\ No newline at end of file
+            print(f"• {from_var.upper()} → {to_var.upper()}: {symbol} = {value}")
+        if has_paths:
+            print(f"Model fit: CFI = {fit['cfi']:.3f}, RMSEA = {fit['rmsea']:.3f}, SRMR = {fit['srmr']:.3f}")
\ No newline at end of file
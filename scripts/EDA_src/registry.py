@@ -0,0 +1,162 @@
+import hashlib
+import numpy as np
+
+# Construct name -> column prefix used in the cleaned survey export
+CONSTRUCT_PREFIXES = {
+    'peou': 'peou_',
+    'pu': 'pu_',
+    'sa': 'sa_',
+    'si': 'si_',
+    'att': 'att_',
+    'risk': 'risk_',
+    'opi': 'opi_',
+    'gecp': 'gecp_',
+    'op': 'op_',
+    'fabr': 'fabr_',
+    'gds': 'gds_',
+    'sos_automobile': 'sos_automobile_',
+    'prof': 'prof_'
+}
+
+DEMOGRAPHIC_COLUMNS = ['gender_encoded', 'age_encoded', 'marital_status_encoded',
+                       'education_encoded', 'used_online_shopping_encoded']
+
+_REGISTRY_CACHE = {}
+_MAX_CACHED_SCHEMAS = 32
+
+
+def schema_hash(columns):
+    """
+    Hash an ordered sequence of column names
+    """
+    digest = hashlib.sha1()
+    for col in columns:
+        digest.update(str(col).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+class ConstructRegistry:
+    """
+    Integer column positions for every construct of a DataFrame schema.
+
+    The columns are scanned once when the registry is built; afterwards every
+    lookup is a dictionary access returning a position array that can be used
+    for positional slicing with ``df.iloc[:, positions]``. Positions stay valid
+    when new columns are appended to the frame (e.g. by
+    ``create_aggregate_features``).
+    """
+
+    def __init__(self, columns):
+        self.column_names = [str(col) for col in columns]
+        self.n_columns = len(self.column_names)
+        self.schema_hash = schema_hash(self.column_names)
+
+        # Longest prefix first so that e.g. 'sos_automobile_' is never
+        # shadowed by a shorter prefix
+        ordered = sorted(CONSTRUCT_PREFIXES.items(), key=lambda item: len(item[1]), reverse=True)
+        positions = {name: [] for name in CONSTRUCT_PREFIXES}
+        none_positions = {}
+        name_to_position = {}
+
+        for pos, col in enumerate(self.column_names):
+            name_to_position[col] = pos
+            for name, prefix in ordered:
+                if col.startswith(prefix):
+                    positions[name].append(pos)
+                    if col == f'{prefix}None':
+                        none_positions[name] = pos
+                    break
+
+        self._name_to_position = name_to_position
+        self._positions = {name: np.asarray(pos, dtype=np.intp) for name, pos in positions.items()}
+        self._positions_without_none = {
+            name: pos[pos != none_positions[name]] if name in none_positions else pos
+            for name, pos in self._positions.items()
+        }
+        self._demographic_positions = np.asarray(
+            [name_to_position[col] for col in DEMOGRAPHIC_COLUMNS if col in name_to_position],
+            dtype=np.intp)
+
+    @classmethod
+    def for_frame(cls, df):
+        """
+        Return the cached registry for the schema of ``df``, building it on first use
+        """
+        key = schema_hash(df.columns)
+        registry = _REGISTRY_CACHE.get(key)
+        if registry is None:
+            if len(_REGISTRY_CACHE) >= _MAX_CACHED_SCHEMAS:
+                _REGISTRY_CACHE.pop(next(iter(_REGISTRY_CACHE)))
+            registry = cls(df.columns)
+            _REGISTRY_CACHE[key] = registry
+        return registry
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __repr__(self):
+        sizes = ', '.join(f'{name}={len(pos)}' for name, pos in self._positions.items() if len(pos))
+        return f'ConstructRegistry({self.n_columns} columns: {sizes})'
+
+    def positions(self, name, exclude_none=False):
+        """
+        Integer positions of the columns of construct ``name``
+        """
+        if name not in self._positions:
+            raise KeyError(f"Unknown construct '{name}'. Expected one of {list(self._positions)}")
+        if exclude_none:
+            return self._positions_without_none[name]
+        return self._positions[name]
+
+    def columns(self, name, exclude_none=False):
+        """
+        Column names of construct ``name`` in schema order
+        """
+        return [self.column_names[pos] for pos in self.positions(name, exclude_none)]
+
+    def prefix_columns(self, prefix, exclude_none=False):
+        """
+        Column names for a raw column prefix such as ``'gecp_'``
+        """
+        for name, known_prefix in CONSTRUCT_PREFIXES.items():
+            if known_prefix == prefix:
+                return self.columns(name, exclude_none)
+        raise KeyError(f"Prefix '{prefix}' is not a registered construct prefix")
+
+    def position(self, column):
+        """
+        Integer position of a single column, or None if it is not in the schema
+        """
+        return self._name_to_position.get(column)
+
+    def block(self, df, name, exclude_none=False):
+        """
+        Slice the columns of construct ``name`` out of ``df`` by position
+        """
+        return df.iloc[:, self.positions(name, exclude_none)]
+
+    def demographic_positions(self):
+        """
+        Integer positions of the encoded demographic columns followed by the profession dummies
+        """
+        return np.concatenate([self._demographic_positions, self._positions['prof']])
+
+    def is_compatible(self, df):
+        """
+        Check that ``df`` starts with the schema the registry was built for
+        """
+        if df.shape[1] < self.n_columns:
+            return False
+        if df.shape[1] == self.n_columns:
+            return schema_hash(df.columns) == self.schema_hash
+        return schema_hash(df.columns[:self.n_columns]) == self.schema_hash
+
+
+def get_registry(df, registry=None):
+    """
+    Return ``registry`` if given, otherwise the cached registry for ``df``
+    """
+    if registry is not None:
+        return registry
+    return ConstructRegistry.for_frame(df)
@@ -0,0 +1,252 @@
+import warnings
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .correlations import weighted_pearson_matrix
+
+NUMERIC_SUMMARY_COLUMNS = ['count', 'missing', 'missing_pct', 'mean', 'std', 'min', 'q1', 'median', 'q3', 'max',
+                           'skew', 'kurtosis', 'iqr', 'lower_fence', 'upper_fence', 'n_outliers']
+
+
+def numeric_summary(df, columns):
+    """
+    Moments, quantiles and IQR outliers of a block of numeric columns.
+
+    The block is converted to one float matrix and every statistic is taken
+    over it at once (one quantile call for Q1/median/Q3), instead of one
+    pandas reduction per statistic and column. Skewness and kurtosis use the
+    same bias-corrected estimators as pandas. Returns a DataFrame indexed by
+    column.
+    """
+    columns = list(columns)
+    X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    n_rows = X.shape[0]
+    valid = ~np.isnan(X)
+    n = valid.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(X, axis=0) / n
+        dev = np.where(valid, X - mean, 0.0)
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=0)
+        m3 = (dev2 * dev).sum(axis=0)
+        m4 = (dev2 * dev2).sum(axis=0)
+
+        std = np.sqrt(m2 / (n - 1))
+        skew = (n * np.sqrt(n - 1) / (n - 2)) * (m3 / m2 ** 1.5)
+        kurtosis = (n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+                    - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+        # pandas reports 0 for constant columns
+        skew = np.where(m2 == 0, 0.0, np.where(n < 3, np.nan, skew))
+        kurtosis = np.where(m2 == 0, 0.0, np.where(n < 4, np.nan, kurtosis))
+
+    if n_rows:
+        # All-NaN columns give NaN quantiles; their RuntimeWarning is expected
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            q1, median, q3 = np.nanquantile(X, [0.25, 0.5, 0.75], axis=0)
+            minimum, maximum = np.nanmin(X, axis=0), np.nanmax(X, axis=0)
+    else:
+        q1 = median = q3 = minimum = maximum = np.full(len(columns), np.nan)
+
+    iqr = q3 - q1
+    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    n_outliers = ((X < lower) | (X > upper)).sum(axis=0)
+    missing = n_rows - n
+
+    summary = pd.DataFrame({
+        'count': n,
+        'missing': missing,
+        'missing_pct': missing / n_rows * 100 if n_rows else np.zeros(len(columns)),
+        'mean': mean,
+        'std': std,
+        'min': minimum,
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'max': maximum,
+        'skew': skew,
+        'kurtosis': kurtosis,
+        'iqr': iqr,
+        'lower_fence': lower,
+        'upper_fence': upper,
+        'n_outliers': n_outliers
+    }, index=pd.Index(columns, name='column'), columns=NUMERIC_SUMMARY_COLUMNS)
+    return summary
+
+
+def categorical_summary(df, column, max_categories=20):
+    """
+    Counts, shares and missing values of a categorical or binary column.
+    ``top`` holds the ``max_categories`` most frequent values plus an
+    'Other' bucket when there are more categories.
+    """
+    series = df[column]
+    value_counts = series.value_counts()
+    total = len(df)
+    missing = int(series.isna().sum())
+
+    top = value_counts
+    if len(value_counts) > max_categories:
+        top = value_counts.nlargest(max_categories)
+        top = pd.concat([top, pd.Series([value_counts.sum() - top.sum()], index=['Other'])])
+
+    return {
+        'column': column,
+        'count': int(series.count()),
+        'n_unique': int(len(value_counts)),
+        'missing': missing,
+        'missing_pct': missing / total * 100 if total else 0.0,
+        'value_counts': value_counts,
+        'top': top,
+        'frequency': pd.DataFrame({
+            'Count': value_counts,
+            'Percentage': (value_counts / total * 100).round(2)
+        })
+    }
+
+
+def correlation_strength(r):
+    """
+    Verbal strength label used by the bivariate reports
+    """
+    r = abs(r)
+    if r > 0.7:
+        return "strong"
+    elif r > 0.4:
+        return "moderate"
+    elif r > 0.1:
+        return "weak"
+    return "very weak or no"
+
+
+def pair_correlation(df, x_col, y_col, alpha=0.05):
+    """
+    Pearson and Spearman correlation (with p-values) of two numeric columns
+    over their complete pairs
+    """
+    pair = df[[x_col, y_col]].dropna()
+    x = pair[x_col].to_numpy(dtype=np.float64)
+    y = pair[y_col].to_numpy(dtype=np.float64)
+    pearson_r, pearson_p = stats.pearsonr(x, y)
+    spearman_r, spearman_p = stats.spearmanr(x, y)
+    return {
+        'x': x_col,
+        'y': y_col,
+        'n': len(pair),
+        'pearson_r': float(pearson_r),
+        'pearson_p': float(pearson_p),
+        'spearman_r': float(spearman_r),
+        'spearman_p': float(spearman_p),
+        'strength': correlation_strength(pearson_r),
+        'direction': "positive" if pearson_r > 0 else "negative",
+        'significant': bool(pearson_p < alpha)
+    }
+
+
+def top_categories(df, column, max_categories=10):
+    """
+    Rows of ``df`` restricted to the ``max_categories`` most frequent values
+    of ``column`` (``df`` itself when there are no more than that)
+    """
+    if df[column].nunique() <= max_categories:
+        return df
+    keep = df[column].value_counts().nlargest(max_categories).index
+    return df[df[column].isin(keep)]
+
+
+def group_comparison(df, cat_col, num_col, max_categories=10, alpha=0.05):
+    """
+    Per-group statistics of ``num_col`` by ``cat_col`` and a one-way ANOVA.
+
+    The F statistic comes from group sums and sums of squares collected
+    with ``np.bincount`` over the group codes, so no per-group sample is
+    materialized.
+    """
+    subset = top_categories(df, cat_col, max_categories)
+    group_stats = subset.groupby(cat_col)[num_col].agg(['count', 'mean', 'std', 'min', 'median', 'max'])
+
+    pair = subset[[cat_col, num_col]].dropna()
+    codes, _ = pd.factorize(pair[cat_col])
+    values = pair[num_col].to_numpy(dtype=np.float64)
+    k = codes.max() + 1 if len(codes) else 0
+    if len(values):
+        # F is shift invariant; centering keeps the sums of squares well conditioned
+        values = values - values.mean()
+
+    result = {
+        'cat_col': cat_col,
+        'num_col': num_col,
+        'n_groups': int(k),
+        'group_stats': group_stats,
+        'f_stat': np.nan,
+        'p_value': np.nan,
+        'significant': False
+    }
+    if k < 2:
+        return result
+
+    counts = np.bincount(codes, minlength=k)
+    sums = np.bincount(codes, weights=values, minlength=k)
+    sq_sums = np.bincount(codes, weights=values * values, minlength=k)
+    n = counts.sum()
+    grand_mean = sums.sum() / n
+    ss_between = (sums ** 2 / counts).sum() - n * grand_mean ** 2
+    ss_within = sq_sums.sum() - (sums ** 2 / counts).sum()
+    df_between, df_within = k - 1, n - k
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        f_stat = (ss_between / df_between) / (ss_within / df_within)
+    p_value = stats.f.sf(f_stat, df_between, df_within)
+    result.update({
+        'f_stat': float(f_stat),
+        'p_value': float(p_value),
+        'df_between': int(df_between),
+        'df_within': int(df_within),
+        'significant': bool(p_value < alpha)
+    })
+    return result
+
+
+def contingency_summary(df, cat_col1, cat_col2, max_categories=10, alpha=0.05):
+    """
+    Contingency table (counts and % of total) of two categorical columns and
+    the chi-square test of independence
+    """
+    subset = top_categories(df, cat_col1, max_categories)
+    subset = top_categories(subset, cat_col2, max_categories)
+    counts = pd.crosstab(subset[cat_col1], subset[cat_col2])
+    chi2, p_value, dof, expected = stats.chi2_contingency(counts)
+    return {
+        'cat_col1': cat_col1,
+        'cat_col2': cat_col2,
+        'counts': counts,
+        'percentages': counts / counts.to_numpy().sum() * 100,
+        'chi2': float(chi2),
+        'p_value': float(p_value),
+        'dof': int(dof),
+        'expected': pd.DataFrame(expected, index=counts.index, columns=counts.columns),
+        'significant': bool(p_value < alpha)
+    }
+
+
+def strong_correlations(df, columns=None, threshold=0.5, weights=None):
+    """
+    Correlation matrix of ``columns`` and its off-diagonal entries with
+    |r| > ``threshold``, sorted descending (both orders of each pair, as
+    ``corr.unstack()`` gives them). With survey ``weights`` (an array
+    aligned with ``df``) the matrix holds weighted Pearson correlations.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=['int64', 'float64']).columns
+    if weights is None:
+        corr = df[columns].corr()
+    else:
+        X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        r, _ = weighted_pearson_matrix(X, weights)
+        corr = pd.DataFrame(r, index=list(columns), columns=list(columns))
+    pairs = corr.unstack()
+    pairs = pairs[pairs < 1.0]
+    pairs = pairs[abs(pairs) > threshold].sort_values(ascending=False)
+    return {'corr': corr, 'strong_pairs': pairs}
@@ -0,0 +1,193 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+# Demographics the quota sample is weighted on
+RAKING_COLUMNS = ['gender_encoded', 'age_encoded', 'education_encoded']
+
+
+def _cells(df, columns):
+    """
+    Collapse rows into the observed cells of ``columns``: the cell of every
+    row, the level codes of every cell (cells x columns), the levels of
+    each column and the row count of each cell
+    """
+    values = df[columns]
+    if values.isna().any().any():
+        missing = [col for col in columns if values[col].isna().any()]
+        raise ValueError(f"Weighting columns have missing values: {missing}")
+    codes, levels = [], []
+    for col in columns:
+        col_codes, col_levels = pd.factorize(values[col], sort=True)
+        codes.append(col_codes)
+        levels.append(col_levels)
+    cell_codes, row_cell = np.unique(np.column_stack(codes), axis=0, return_inverse=True)
+    row_cell = row_cell.ravel()
+    return row_cell, cell_codes, levels, np.bincount(row_cell, minlength=len(cell_codes))
+
+
+def _target_shares(target, levels, col):
+    """Target shares aligned with the sample levels of one column (normalized to 1)"""
+    target = pd.Series(target, dtype=np.float64)
+    unseen = [level for level in target.index[target > 0] if level not in set(levels)]
+    if unseen:
+        raise ValueError(f"Targets of {col} have levels without respondents: {unseen}")
+    shares = target.reindex(levels).fillna(0.0).to_numpy()
+    return shares / target.sum()
+
+
+def _trim_weights(cell_weight, cell_counts, trim, max_iter=100):
+    """
+    Scale cell weights to mean 1 and clip the positive ones to ``trim``,
+    repeated until clipping no longer moves the mean; zero weights stay 0
+    """
+    n = cell_counts.sum()
+    positive = cell_weight > 0
+    for _ in range(max_iter):
+        cell_weight = cell_weight * (n / (cell_weight * cell_counts).sum())
+        clipped = np.where(positive, np.clip(cell_weight, trim[0], trim[1]), 0.0)
+        if np.allclose(clipped, cell_weight, rtol=1e-12, atol=0.0):
+            break
+        cell_weight = clipped
+    return clipped
+
+
+def rake_weights(df, targets, columns=None, max_iter=100, tol=1e-10, trim=None):
+    """
+    Raking (iterative proportional fitting) weights that reproduce the
+    population margins in ``targets``.
+
+    ``targets`` maps each weighting column (typically the
+    ``RAKING_COLUMNS`` gender, age and education) to its population shares
+    per level ({level: share}; shares are normalized); ``columns`` defaults
+    to the columns of ``targets``. Rows are first collapsed into their
+    demographic cells, so each IPF sweep is one ``np.bincount`` of cell
+    weights per margin followed by a rescale of every cell, whatever the
+    number of rows. ``trim`` = (low, high) bounds the mean-1 weights of the
+    cells with a positive target after every sweep, so the margins are then
+    matched only as closely as the bounds allow.
+
+    Returns the weights as a Series indexed like ``df`` with mean 1, so
+    weighted totals stay on the scale of the sample size. Levels with a
+    zero (or no) target get weight 0.
+    """
+    columns = list(targets) if columns is None else list(columns)
+    row_cell, cell_codes, levels, cell_counts = _cells(df, columns)
+    shares = [_target_shares(targets[col], levels[j], col) for j, col in enumerate(columns)]
+    n = cell_counts.sum()
+
+    cell_weight = np.ones(len(cell_codes))
+    converged = False
+    for _ in range(max_iter):
+        for j, target in enumerate(shares):
+            margin = np.bincount(cell_codes[:, j], weights=cell_weight * cell_counts, minlength=len(target))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                factor = np.where(margin > 0, target * n / margin, 0.0)
+            cell_weight *= factor[cell_codes[:, j]]
+        if trim is not None:
+            cell_weight = _trim_weights(cell_weight, cell_counts, trim)
+        errors = [np.abs(np.bincount(cell_codes[:, j], weights=cell_weight * cell_counts, minlength=len(target)) / n
+                         - target).max() for j, target in enumerate(shares)]
+        if max(errors) < tol:
+            converged = True
+            break
+    if not converged:
+        warnings.warn(f"Raking did not converge in {max_iter} iterations (max margin error {max(errors):.2e})")
+
+    if trim is None:
+        cell_weight *= n / (cell_weight * cell_counts).sum()
+    return pd.Series(cell_weight[row_cell], index=df.index, name='weight')
+
+
+def poststratify_weights(df, targets, columns=None):
+    """
+    Post-stratification weights from a joint population distribution:
+    ``targets`` is a Series of shares indexed by the (MultiIndex) cells of
+    ``columns``. Each row gets target share / sample share of its cell,
+    scaled to mean 1; cells without a target get weight 0.
+    """
+    targets = pd.Series(targets, dtype=np.float64)
+    columns = list(targets.index.names) if columns is None else list(columns)
+    row_cell, cell_codes, levels, cell_counts = _cells(df, columns)
+    cells = pd.MultiIndex.from_arrays([levels[j][cell_codes[:, j]] for j in range(len(columns))], names=columns)
+    if len(columns) == 1:
+        cells = cells.get_level_values(0)
+    target = targets.reindex(cells).fillna(0.0).to_numpy() / targets.sum()
+    unseen = targets.index.difference(cells)
+    if (targets.reindex(unseen) > 0).any():
+        raise ValueError(f"Targets have cells without respondents: {list(unseen)}")
+
+    n = cell_counts.sum()
+    cell_weight = target * n / cell_counts
+    return pd.Series(cell_weight[row_cell], index=df.index, name='weight')
+
+
+def resolve_weights(df, weights):
+    """Weights as a float array aligned with ``df`` (a column name, Series or array)"""
+    if weights is None:
+        return None
+    if isinstance(weights, str):
+        weights = df[weights]
+    if isinstance(weights, pd.Series):
+        weights = weights.reindex(df.index)
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (len(df),):
+        raise ValueError(f"Expected {len(df)} weights, got shape {weights.shape}")
+    if np.isnan(weights).any() or (weights < 0).any():
+        raise ValueError("Weights must be non-negative and not missing")
+    return weights
+
+
+def effective_sample_size(weights):
+    """Kish effective sample size (sum w)^2 / sum w^2 and the design effect n / n_eff"""
+    weights = np.asarray(weights, dtype=np.float64)
+    n_eff = weights.sum() ** 2 / (weights @ weights)
+    return {'n': len(weights), 'n_effective': float(n_eff), 'design_effect': float(len(weights) / n_eff)}
+
+
+def weighted_summary(df, columns, weights):
+    """
+    Weighted mean, standard deviation (population form) and weight total of
+    every column, from three matrix-vector products over the (masked) block; missing
+    cells drop out of their own column only
+    """
+    columns = list(columns)
+    weights = resolve_weights(df, weights)
+    X = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(X)
+    X0 = np.where(valid, X, 0.0)
+    totals = weights @ valid
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (weights @ X0) / totals
+        variances = (weights @ (X0 * X0)) / totals - means ** 2
+    return pd.DataFrame({
+        'mean': means,
+        'std': np.sqrt(np.clip(variances, 0.0, None)),
+        'weight_total': totals
+    }, index=columns)
+
+
+def weighted_group_means(df, group_col, value_col, weights):
+    """
+    Weighted mean of ``value_col`` per level of ``group_col`` (one pair of
+    ``np.bincount`` calls), the weighted ``df.groupby(group_col)[value_col].mean()``
+    """
+    weights = resolve_weights(df, weights)
+    codes, levels = pd.factorize(df[group_col], sort=True)
+    values = df[value_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (codes >= 0) & ~np.isnan(values)
+    w = weights[valid]
+    sums = np.bincount(codes[valid], weights=w * values[valid], minlength=len(levels))
+    totals = np.bincount(codes[valid], weights=w, minlength=len(levels))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / totals
+    return pd.Series(means, index=pd.Index(levels, name=group_col), name=value_col)
+
+
+def weighted_counts(df, column, weights=None):
+    """Weighted ``value_counts().sort_index()`` of one column (plain counts without weights)"""
+    codes, levels = pd.factorize(df[column], sort=True)
+    valid = codes >= 0
+    w = None if weights is None else resolve_weights(df, weights)[valid]
+    counts = np.bincount(codes[valid], weights=w, minlength=len(levels))
+    return pd.Series(counts, index=pd.Index(levels, name=column), name='count')
@@ -0,0 +1,12 @@
+# src/data_io/__init__.py
+
+from .streaming import (iter_survey_chunks, survey_dtypes, summarize_survey, ValueCountsAccumulator,
+                        ColumnTypeAccumulator, DescribeAccumulator, AggregateFeatureAccumulator)
+from .loader import infer_compact_dtypes, downcast_frame, load_survey, build_cache, clear_cache
+
+
+__all__ = [
+    'iter_survey_chunks', 'survey_dtypes', 'summarize_survey', 'ValueCountsAccumulator',
+    'ColumnTypeAccumulator', 'DescribeAccumulator', 'AggregateFeatureAccumulator',
+    'infer_compact_dtypes', 'downcast_frame', 'load_survey', 'build_cache', 'clear_cache'
+]
@@ -0,0 +1,213 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+
+from .paths import DEFAULT_DATA_PATH
+from .streaming import ONE_HOT_PREFIXES
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.cache'
+
+
+def _smallest_int_dtype(lo, hi):
+    """Smallest of int8/uint8/int16/... that holds [lo, hi], preferring signed types"""
+    for dtype in (np.int8, np.uint8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def infer_compact_dtypes(df):
+    """
+    Infer the most compact lossless dtype for every column:
+    - one-hot columns holding only 0/1 become bool
+    - integer-valued columns without missing values become int8/uint8/int16/...
+    - floats become float32 when that round-trips exactly, otherwise stay float64
+    - text columns become category
+    """
+    dtypes = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) and not series.hasnans:
+            dtypes[col] = np.dtype(bool)
+        elif pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy()
+            if series.hasnans or len(values) == 0:
+                if values.dtype.kind == 'f' and np.array_equal(values.astype(np.float32), values, equal_nan=True):
+                    dtypes[col] = np.dtype(np.float32)
+                else:
+                    dtypes[col] = values.dtype
+                continue
+            if values.dtype.kind == 'f' and not np.array_equal(values, np.round(values)):
+                lossless = np.array_equal(values.astype(np.float32), values)
+                dtypes[col] = np.dtype(np.float32) if lossless else values.dtype
+                continue
+            lo, hi = values.min(), values.max()
+            if str(col).startswith(ONE_HOT_PREFIXES) and lo >= 0 and hi <= 1:
+                dtypes[col] = np.dtype(bool)
+            else:
+                dtypes[col] = _smallest_int_dtype(int(lo), int(hi))
+        else:
+            dtypes[col] = pd.CategoricalDtype()
+    return dtypes
+
+
+def downcast_frame(df, dtypes=None):
+    """
+    Return a copy of ``df`` converted to compact dtypes
+    """
+    if dtypes is None:
+        dtypes = infer_compact_dtypes(df)
+    return pd.DataFrame({col: df[col].astype(dtype) for col, dtype in dtypes.items()}, index=df.index)
+
+
+def file_sha256(path, block_size=1 << 20):
+    """
+    SHA-256 of a file, read in blocks
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_dir_for(path):
+    """
+    Directory holding the columnar cache of ``path`` (next to the CSV)
+    """
+    return os.path.abspath(path) + CACHE_SUFFIX
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json')) as handle:
+            meta = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('version') == CACHE_VERSION else None
+
+
+def _write_meta(cache_dir, meta):
+    tmp_path = os.path.join(cache_dir, 'meta.json.tmp')
+    with open(tmp_path, 'w') as handle:
+        json.dump(meta, handle, indent=1)
+    os.replace(tmp_path, os.path.join(cache_dir, 'meta.json'))
+
+
+def build_cache(path=DEFAULT_DATA_PATH, df=None):
+    """
+    Parse the CSV, downcast it and write one .npy block per storage dtype
+    (columns stored contiguously) plus a meta.json describing the layout
+    """
+    signature = _source_signature(path)
+    sha256 = file_sha256(path)
+    if df is None:
+        df = pd.read_csv(path)
+    compact = downcast_frame(df)
+
+    blocks = {}
+    columns = []
+    for col in compact.columns:
+        series = compact[col]
+        entry = {'name': col, 'dtype': str(series.dtype)}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            entry['categories'] = series.cat.categories.tolist()
+            entry['ordered'] = bool(series.cat.ordered)
+        else:
+            values = series.to_numpy()
+        block_name = values.dtype.name
+        blocks.setdefault(block_name, []).append(values)
+        entry['block'] = block_name
+        entry['position'] = len(blocks[block_name]) - 1
+        columns.append(entry)
+
+    cache_dir = cache_dir_for(path)
+    parent = os.path.dirname(cache_dir)
+    staging = tempfile.mkdtemp(prefix='.survey-cache-', dir=parent)
+    try:
+        for block_name, arrays in blocks.items():
+            np.save(os.path.join(staging, f'{block_name}.npy'), np.stack(arrays))
+        _write_meta(staging, {
+            'version': CACHE_VERSION,
+            'source': dict(signature, sha256=sha256),
+            'n_rows': len(compact),
+            'columns': columns
+        })
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.replace(staging, cache_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return compact
+
+
+def _cache_is_valid(path, meta):
+    """
+    Valid if size and mtime match; if only the mtime moved, fall back to the
+    content hash and refresh the stored mtime when the content is unchanged
+    """
+    if meta is None:
+        return False
+    signature = _source_signature(path)
+    source = meta['source']
+    if source['size'] != signature['size']:
+        return False
+    if source['mtime_ns'] == signature['mtime_ns']:
+        return True
+    if file_sha256(path) != source['sha256']:
+        return False
+    meta['source'].update(signature)
+    _write_meta(cache_dir_for(path), meta)
+    return True
+
+
+def _frame_from_cache(cache_dir, meta, mmap):
+    mode = 'c' if mmap else None
+    blocks = {}
+    data = {}
+    for entry in meta['columns']:
+        block_name = entry['block']
+        if block_name not in blocks:
+            blocks[block_name] = np.load(os.path.join(cache_dir, f'{block_name}.npy'), mmap_mode=mode)
+        values = blocks[block_name][entry['position']]
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(values, categories=entry['categories'], ordered=entry['ordered'])
+        data[entry['name']] = values
+    return pd.DataFrame(data, index=pd.RangeIndex(meta['n_rows']), copy=False)
+
+
+def load_survey(path=DEFAULT_DATA_PATH, use_cache=True, mmap=True):
+    """
+    Load the survey with compact dtypes. The first call parses the CSV and
+    writes the columnar cache next to it; later calls memory-map the cached
+    blocks, so numeric columns are views on the cache files (copy-on-write).
+    """
+    if not use_cache:
+        return downcast_frame(pd.read_csv(path))
+
+    cache_dir = cache_dir_for(path)
+    meta = _read_meta(cache_dir)
+    if not _cache_is_valid(path, meta):
+        build_cache(path)
+        meta = _read_meta(cache_dir)
+    return _frame_from_cache(cache_dir, meta, mmap)
+
+
+def clear_cache(path=DEFAULT_DATA_PATH):
+    """
+    Remove the columnar cache of ``path`` if it exists
+    """
+    shutil.rmtree(cache_dir_for(path), ignore_errors=True)
@@ -0,0 +1,4 @@
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DATA_PATH = os.path.join(REPO_ROOT, 'data', 'cleaned', 'cleaned_survey_data.csv')
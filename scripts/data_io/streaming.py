@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+
+from .paths import DEFAULT_DATA_PATH
+from ..EDA_src.constructs import compute_aggregate_features
+from ..EDA_src.registry import ConstructRegistry
+
+
+# Column prefixes holding 1-5 Likert items and 0/1 one-hot indicators
+LIKERT_PREFIXES = ('peou_', 'pu_', 'sa_', 'si_', 'att_', 'risk_', 'opi_')
+ONE_HOT_PREFIXES = ('gecp_', 'op_', 'fabr_', 'gds_', 'sos_automobile_', 'prof_')
+
+DESCRIBE_COLUMNS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def survey_dtypes(columns, nullable=False):
+    """
+    Map survey columns to compact dtypes: int8 for Likert items and encoded
+    demographics, bool for one-hot columns. With ``nullable=True`` the pandas
+    nullable types (Int8/boolean) are used so missing cells can be parsed.
+    """
+    int_type = 'Int8' if nullable else 'int8'
+    bool_type = 'boolean' if nullable else 'bool'
+    dtypes = {}
+    for col in columns:
+        if col.startswith(LIKERT_PREFIXES) or col.endswith('_encoded'):
+            dtypes[col] = int_type
+        elif col.startswith(ONE_HOT_PREFIXES):
+            dtypes[col] = bool_type
+    return dtypes
+
+
+def iter_survey_chunks(path=DEFAULT_DATA_PATH, chunksize=100_000, usecols=None, nullable=False):
+    """
+    Read the survey CSV in chunks of ``chunksize`` rows with compact dtypes.
+    The chunks keep a running RangeIndex, so concatenating them reproduces
+    ``pd.read_csv(path)`` row for row.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    if usecols is not None:
+        header = [col for col in header if col in set(usecols)]
+    dtypes = survey_dtypes(header, nullable=nullable)
+
+    reader = pd.read_csv(path, chunksize=chunksize, usecols=usecols, dtype=dtypes)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+
+
+class ValueCountsAccumulator:
+    """
+    Incremental ``df[column].value_counts()`` over chunks
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.counts = {}
+
+    def update(self, chunk):
+        # sort=False keeps first-appearance order, which decides ties in the final sort
+        for value, count in chunk[self.column].value_counts(sort=False).items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        return self
+
+    def result(self):
+        counts = pd.Series(list(self.counts.values()), index=list(self.counts.keys()),
+                           name='count', dtype='int64')
+        counts.index.name = self.column
+        return counts.sort_values(ascending=False)
+
+
+class ColumnTypeAccumulator:
+    """
+    Incremental ``identify_column_types``. Compact integer and bool columns
+    count as numeric, just like the int64 columns of a full CSV read.
+    """
+
+    def __init__(self, exclude=('timestamp',)):
+        self.exclude = set(exclude)
+        self.columns = None
+        self.numeric = {}
+        self.uniques = {}
+
+    def update(self, chunk):
+        if self.columns is None:
+            self.columns = [col for col in chunk.columns if col not in self.exclude]
+            self.numeric = {col: True for col in self.columns}
+            self.uniques = {col: set() for col in self.columns}
+
+        for col in self.columns:
+            if not _is_numeric(chunk[col]):
+                self.numeric[col] = False
+            seen = self.uniques[col]
+            # Only the first three distinct values matter for the binary test
+            if len(seen) <= 2:
+                seen.update(pd.unique(chunk[col].dropna())[:3].tolist())
+        return self
+
+    def result(self):
+        numeric_cols, binary_cols, categorical_cols = [], [], []
+        for col in self.columns or []:
+            if self.numeric[col]:
+                if len(self.uniques[col]) <= 2:
+                    binary_cols.append(col)
+                else:
+                    numeric_cols.append(col)
+            else:
+                categorical_cols.append(col)
+        return {
+            'numeric': numeric_cols,
+            'binary': binary_cols,
+            'categorical': categorical_cols
+        }
+
+
+class DescribeAccumulator:
+    """
+    Incremental ``df[columns].describe().T`` plus the missing counts that
+    ``analyze_construct`` prints. Every column is kept as a value histogram,
+    so quantiles are exact; memory grows with the number of distinct values,
+    which stays small for Likert items, one-hot columns and construct averages.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.histograms = {col: ValueCountsAccumulator(col) for col in self.columns}
+        self.missing = dict.fromkeys(self.columns, 0)
+        self.n_rows = 0
+
+    def update(self, chunk):
+        self.n_rows += len(chunk)
+        for col in self.columns:
+            series = chunk[col]
+            if pd.api.types.is_bool_dtype(series):
+                series = series.astype('Int8') if series.hasnans else series.astype(np.int8)
+            self.histograms[col].update(series.to_frame(col))
+            self.missing[col] += int(series.isna().sum())
+        return self
+
+    @staticmethod
+    def _describe_histogram(histogram):
+        if histogram.empty:
+            return [0.0] + [np.nan] * 7
+
+        values = histogram.index.to_numpy()
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        counts = histogram.to_numpy()[order]
+        n = int(counts.sum())
+
+        if pd.api.types.is_integer_dtype(values):
+            mean = int(np.dot(values.astype(object), counts.astype(object))) / n
+        else:
+            mean = float(np.dot(values.astype(np.float64), counts)) / n
+        std = np.sqrt(np.dot(counts, (values.astype(np.float64) - mean) ** 2) / (n - 1)) if n > 1 else np.nan
+
+        cumulative = np.cumsum(counts)
+        quantiles = []
+        for q in (0.25, 0.5, 0.75):
+            h = (n - 1) * q
+            lo = int(np.floor(h))
+            hi = min(lo + 1, n - 1)
+            x_lo = values[np.searchsorted(cumulative, lo, side='right')]
+            x_hi = values[np.searchsorted(cumulative, hi, side='right')]
+            # Same linear interpolation as np.percentile on the full column
+            quantiles.append(float(np.quantile(np.array([x_lo, x_hi], dtype=np.float64), h - lo)))
+
+        return [float(n), mean, std, float(values[0])] + quantiles + [float(values[-1])]
+
+    def result(self):
+        rows = [self._describe_histogram(self.histograms[col].result()) for col in self.columns]
+        summary = pd.DataFrame(rows, index=self.columns, columns=DESCRIBE_COLUMNS)
+        summary['missing'] = pd.Series(self.missing, dtype='int64')
+        summary['missing_pct'] = (summary['missing'] / max(self.n_rows, 1) * 100).round(2)
+        return summary
+
+
+class AggregateFeatureAccumulator:
+    """
+    Streaming ``create_aggregate_features``. Each chunk's features can be
+    appended to ``output_path``; their summary statistics are accumulated.
+    """
+
+    def __init__(self, output_path=None):
+        self.output_path = output_path
+        self.registry = None
+        self.summary = None
+        self._written = False
+
+    def update(self, chunk):
+        if self.registry is None:
+            self.registry = ConstructRegistry.for_frame(chunk)
+        features = compute_aggregate_features(chunk, self.registry)
+
+        if self.summary is None:
+            self.summary = DescribeAccumulator(features.columns)
+        self.summary.update(features)
+
+        if self.output_path is not None:
+            features.to_csv(self.output_path, mode='a' if self._written else 'w', header=not self._written)
+            self._written = True
+        return self
+
+    def result(self):
+        if self.summary is None:
+            return pd.DataFrame(columns=DESCRIBE_COLUMNS + ['missing', 'missing_pct'])
+        return self.summary.result()
+
+
+def summarize_survey(path=DEFAULT_DATA_PATH, chunksize=100_000, describe_columns=None,
+                     value_count_columns=(), aggregate_output=None, nullable=False):
+    """
+    Stream the survey once and return column types, describe() summaries,
+    value counts and aggregate-feature summaries in bounded memory
+    """
+    column_types = ColumnTypeAccumulator()
+    aggregates = AggregateFeatureAccumulator(output_path=aggregate_output)
+    value_counts = {col: ValueCountsAccumulator(col) for col in value_count_columns}
+    describe = None
+
+    for chunk in iter_survey_chunks(path, chunksize=chunksize, nullable=nullable):
+        if describe is None:
+            if describe_columns is None:
+                describe_columns = [col for col in chunk.columns if col.startswith(LIKERT_PREFIXES)]
+            describe = DescribeAccumulator(describe_columns)
+        for accumulator in [column_types, aggregates, describe] + list(value_counts.values()):
+            accumulator.update(chunk)
+
+    return {
+        'column_types': column_types.result(),
+        'describe': describe.result() if describe is not None else None,
+        'value_counts': {col: acc.result() for col, acc in value_counts.items()},
+        'aggregates': aggregates.result()
+    }
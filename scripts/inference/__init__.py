@@ -0,0 +1,22 @@
+# src/inference/__init__.py
+
+from .mediation import bootstrap_mediation, mediation_paths
+from .moderation import moderation_screen
+from .path_model import fit_path_model
+
+# The hypothesis runner reads the survey data and is imported on first use,
+# so importing the EDA layer (which uses path_model) stays free of cycles
+_LAZY_HYPOTHESES = ('HYPOTHESES', 'hypothesis_frame', 'run_hypotheses')
+
+
+def __getattr__(name):
+    if name in _LAZY_HYPOTHESES:
+        from . import hypotheses
+        return getattr(hypotheses, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'bootstrap_mediation', 'mediation_paths', 'moderation_screen', 'fit_path_model',
+    'HYPOTHESES', 'hypothesis_frame', 'run_hypotheses'
+]
@@ -0,0 +1,283 @@
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .moderation import _fit_logit, _fit_ols
+from ..EDA_src.correlations import rank_columns, pearson_matrix, correlation_pvalues, benjamini_hochberg
+from ..data_io.paths import REPO_ROOT, DEFAULT_DATA_PATH
+from ..psychometrics.scores import construct_scores, score_definitions
+
+DEFAULT_RESULTS_PATH = os.path.join(REPO_ROOT, 'outputs', 'hypotheses', 'results.csv')
+
+HYPOTHESIS_TESTS = ('spearman', 'ols', 'logit')
+
+# The study's hypotheses. Predictors and outcomes are composite names from
+# ``score_definitions`` ('peou', 'peou_navigation', 'opi', ...) or raw columns.
+HYPOTHESES = [
+    {'id': 'H1', 'description': 'Perceived ease of use increases purchase intention',
+     'predictors': ['peou'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'H2', 'description': 'Perceived usefulness increases purchase intention',
+     'predictors': ['pu'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'H3', 'description': 'Structural assurance increases purchase intention',
+     'predictors': ['sa'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'H4', 'description': 'Attitude increases purchase intention',
+     'predictors': ['att'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'H5', 'description': 'Perceived ease of use improves attitude',
+     'predictors': ['peou'], 'outcome': 'att', 'tests': ('spearman', 'ols')},
+    {'id': 'H6', 'description': 'Perceived usefulness lowers perceived risk',
+     'predictors': ['pu'], 'outcome': 'risk', 'tests': ('spearman', 'ols')},
+    {'id': 'H7', 'description': 'Ease of navigation increases purchase intention',
+     'predictors': ['peou_navigation'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'H8', 'description': 'Clear instructions increase purchase intention',
+     'predictors': ['peou_instructions'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'H9', 'description': 'Platform responsiveness increases purchase intention',
+     'predictors': ['peou_response'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'H10', 'description': 'Error handling increases purchase intention',
+     'predictors': ['peou_error'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+    {'id': 'NH4', 'description': 'Privacy and payment assurance drive behavior change',
+     'predictors': ['sa_privacy_1', 'sa_privacy_2', 'sa_payment_1', 'sa_payment_2'],
+     'outcome': 'opi_behavior_change', 'tests': ('ols',)},
+    {'id': 'NH5', 'description': 'Word of mouth, social media and reviews drive behavior change',
+     'predictors': ['si_wom_1', 'si_wom_2', 'si_social_media_1', 'si_social_media_2',
+                    'si_reviews_1', 'si_reviews_2'],
+     'outcome': 'opi_behavior_change', 'tests': ('ols',)},
+    {'id': 'NH11a', 'description': 'Navigation and learnability drive purchase intention',
+     'predictors': ['peou_navigation', 'peou_learning'], 'outcome': 'opi_behavior_change',
+     'tests': ('spearman', 'ols')},
+    {'id': 'NH11b', 'description': 'Navigation and learnability drive actual purchases',
+     'predictors': ['peou_navigation', 'peou_learning'], 'outcome': 'opi_purchased?', 'tests': ('logit',)},
+    {'id': 'NH12', 'description': 'Perceived risk lowers actual purchases given usefulness',
+     'predictors': ['risk'], 'outcome': 'opi_purchased?', 'tests': ('logit',),
+     'controls': ['pu_convenience']},
+    {'id': 'NH13', 'description': 'Demographics shape online purchasing',
+     'predictors': ['gender_encoded', 'age_encoded', 'education_encoded'], 'outcome': 'opi_purchased?',
+     'tests': ('logit',)},
+    {'id': 'NH18', 'description': 'Personalization drives behavior change',
+     'predictors': ['pu_personalization'], 'outcome': 'opi_behavior_change', 'tests': ('spearman', 'ols')},
+    {'id': 'NH19', 'description': 'Ease of use and risk affect behavior change beyond attitude',
+     'predictors': ['peou', 'risk'], 'outcome': 'opi_behavior_change', 'tests': ('spearman', 'ols'),
+     'controls': ['att']},
+    {'id': 'NH20', 'description': 'The learning curve affects purchase intention',
+     'predictors': ['peou_learning'], 'outcome': 'opi', 'tests': ('spearman', 'ols')},
+]
+
+RESULT_COLUMNS = ['hypothesis', 'description', 'test', 'outcome', 'term', 'n_obs', 'estimate', 'se',
+                  'statistic', 'p_value', 'odds_ratio', 'r2', 'converged']
+
+# Worker-side state, set once per process by _init_worker
+_WORKER = {}
+
+
+def _normalize_spec(spec):
+    """Validate one hypothesis dict and fill in the optional keys"""
+    missing = {'id', 'predictors', 'outcome'} - set(spec)
+    if missing:
+        raise ValueError(f"Hypothesis spec is missing {sorted(missing)}: {spec}")
+    predictors = spec['predictors']
+    tests = spec.get('tests', ('spearman', 'ols'))
+    normalized = {
+        'id': spec['id'],
+        'description': spec.get('description', ''),
+        'predictors': [predictors] if isinstance(predictors, str) else list(predictors),
+        'outcome': spec['outcome'],
+        'tests': (tests,) if isinstance(tests, str) else tuple(tests),
+        'controls': list(spec.get('controls', ()))
+    }
+    unknown = set(normalized['tests']) - set(HYPOTHESIS_TESTS)
+    if unknown:
+        raise ValueError(f"Unknown tests {sorted(unknown)} in hypothesis {spec['id']}")
+    return normalized
+
+
+def _variables(specs):
+    return list(dict.fromkeys(name for spec in specs
+                              for name in spec['predictors'] + spec['controls'] + [spec['outcome']]))
+
+
+def hypothesis_frame(df, specs, composites=None):
+    """
+    Numeric (n x variables) frame of everything the hypotheses refer to.
+    Composite names are row-mean scores from ``construct_scores`` (the
+    notebooks' ``df[cols].mean(axis=1)``); extra ``composites`` (name ->
+    items) extend ``score_definitions``. Any other name must be a column.
+    """
+    definitions = score_definitions(df.columns)
+    definitions.update(composites or {})
+    variables = _variables(specs)
+    needed = {name: definitions[name] for name in variables if name in definitions}
+    unknown = [name for name in variables if name not in needed and name not in df.columns]
+    if unknown:
+        raise ValueError(f"Hypotheses refer to unknown variables: {unknown}")
+
+    scores = construct_scores(df, definitions=needed).frame('raw') if needed else None
+    columns = {name: scores[name] if name in needed else df[name] for name in variables}
+    return pd.DataFrame({name: pd.to_numeric(values).astype(np.float64) for name, values in columns.items()},
+                        index=df.index)
+
+
+def _init_worker(memory_name, shape, variables):
+    """Attach to the shared data block once per process"""
+    block = shared_memory.SharedMemory(name=memory_name)
+    _WORKER.update({
+        'block': block,
+        'X': np.ndarray(shape, dtype=np.float64, buffer=block.buf),
+        'position': {name: j for j, name in enumerate(variables)}
+    })
+
+
+def _spearman_rows(spec, y, P):
+    """Rank correlation of each predictor with the outcome, ranked within its complete pairs"""
+    rows = []
+    for j, name in enumerate(spec['predictors']):
+        pair = np.column_stack([y, P[:, j]])
+        pair = pair[~np.isnan(pair).any(axis=1)]
+        r, counts = pearson_matrix(rank_columns(pair))
+        rows.append({'term': name, 'n_obs': int(counts[0, 1]), 'estimate': r[0, 1],
+                     'p_value': float(correlation_pvalues(r[0, 1], counts[0, 1])), 'converged': True})
+    return rows
+
+
+def _regression_rows(spec, test, y, P, C):
+    """OLS or logit of the outcome on the predictors and controls (complete rows only)"""
+    design = np.column_stack([np.ones(len(y)), P, C])
+    complete = ~np.isnan(design).any(axis=1) & ~np.isnan(y)
+    design, y = design[complete], y[complete]
+    weights = np.ones((1, len(y)))
+    if test == 'ols':
+        beta, cov, dof = _fit_ols(design[None], y, weights)
+        beta, cov, dof = beta[0], cov[0], dof[0]
+        statistic = beta / np.sqrt(np.diag(cov))
+        pvalues = 2 * stats.t.sf(np.abs(statistic), dof)
+        resid = y - design @ beta
+        r2 = 1 - resid @ resid / ((y - y.mean()) @ (y - y.mean()))
+        converged = True
+    else:
+        beta, cov, converged = _fit_logit(design[None], y, weights, max_iter=50, tol=1e-8)
+        beta, cov, converged = beta[0], cov[0], bool(converged[0])
+        statistic = beta / np.sqrt(np.diag(cov))
+        pvalues = 2 * stats.norm.sf(np.abs(statistic))
+        mu = np.clip(1.0 / (1.0 + np.exp(-design @ beta)), 1e-12, 1 - 1e-12)
+        rate = y.mean()
+        log_lik = (y * np.log(mu) + (1 - y) * np.log(1 - mu)).sum()
+        log_lik_null = len(y) * (rate * np.log(rate) + (1 - rate) * np.log(1 - rate))
+        # McFadden pseudo R^2
+        r2 = 1 - log_lik / log_lik_null
+
+    se = np.sqrt(np.diag(cov))
+    rows = []
+    for j, name in enumerate(spec['predictors'], start=1):
+        rows.append({
+            'term': name,
+            'n_obs': len(y),
+            'estimate': beta[j],
+            'se': se[j],
+            'statistic': statistic[j],
+            'p_value': pvalues[j],
+            'odds_ratio': np.exp(beta[j]) if test == 'logit' else np.nan,
+            'r2': r2,
+            'converged': converged
+        })
+    return rows
+
+
+def _run_hypothesis(spec):
+    """All tests of one hypothesis on the shared block; errors are reported, not raised"""
+    X, position = _WORKER['X'], _WORKER['position']
+    y = X[:, position[spec['outcome']]]
+    P = X[:, [position[name] for name in spec['predictors']]]
+    C = X[:, [position[name] for name in spec['controls']]]
+
+    rows = []
+    for test in spec['tests']:
+        try:
+            if test == 'spearman':
+                test_rows = _spearman_rows(spec, y, P)
+            else:
+                test_rows = _regression_rows(spec, test, y, P, C)
+        except (np.linalg.LinAlgError, ValueError) as exc:
+            test_rows = [{'term': name, 'error': f'{type(exc).__name__}: {exc}'} for name in spec['predictors']]
+        for row in test_rows:
+            row.update({'hypothesis': spec['id'], 'description': spec['description'],
+                        'test': test, 'outcome': spec['outcome']})
+        rows.extend(test_rows)
+    return rows
+
+
+def run_hypotheses(df=None, hypotheses=None, composites=None, data_path=DEFAULT_DATA_PATH, n_jobs=None,
+                   alpha=0.05, output_path=None):
+    """
+    Run every hypothesis of a declarative spec and collect one results table.
+
+    Each hypothesis is a dict with an 'id', 'predictors' (composite names
+    or columns), an 'outcome', the 'tests' to run ('spearman', 'ols',
+    'logit') and optional 'controls' and 'description' (see
+    ``HYPOTHESES``, the default). The data is read once (from
+    ``data_path`` unless ``df`` is given), reduced to the referenced
+    variables and placed in shared memory; every hypothesis then runs in
+    a process pool of ``n_jobs`` workers (all cores by default,
+    ``n_jobs=1`` runs in this process) that read the block without
+    copying it.
+
+    Spearman rows are the bivariate rank correlations of each predictor
+    with the outcome; OLS and logit rows are the predictors' coefficients
+    in one model with the controls, on the complete rows. 'p_adjusted'
+    holds Benjamini-Hochberg p-values over the whole table and
+    'significant' whether they fall below ``alpha``. The table is also
+    written to ``output_path`` as CSV when given.
+    """
+    specs = [_normalize_spec(spec) for spec in (HYPOTHESES if hypotheses is None else hypotheses)]
+    if df is None:
+        df = pd.read_csv(data_path)
+    data = hypothesis_frame(df, specs, composites=composites)
+    variables = list(data.columns)
+    values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    n_workers = n_jobs if n_jobs not in (None, -1) else (os.cpu_count() or 1)
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    start = time.perf_counter()
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=block.buf)[:] = values
+        init_args = (block.name, values.shape, variables)
+        if n_workers == 1:
+            _init_worker(*init_args)
+            try:
+                results = [_run_hypothesis(spec) for spec in specs]
+            finally:
+                _WORKER.pop('X', None)
+                _WORKER.pop('block').close()
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=init_args) as pool:
+                results = list(pool.map(_run_hypothesis, specs))
+    finally:
+        block.close()
+        block.unlink()
+
+    table = pd.DataFrame([row for rows in results for row in rows])
+    table = table.reindex(columns=RESULT_COLUMNS + [col for col in table.columns if col not in RESULT_COLUMNS])
+    table['p_adjusted'] = benjamini_hochberg(table['p_value'].to_numpy(dtype=np.float64))
+    table['significant'] = table['p_adjusted'] < alpha
+    table.attrs['wall_seconds'] = round(time.perf_counter() - start, 3)
+
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        table.to_csv(output_path, index=False)
+    return table
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run all study hypotheses into one results table')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH)
+    parser.add_argument('--n-jobs', type=int, default=None)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    args = parser.parse_args()
+
+    results = run_hypotheses(data_path=args.data, n_jobs=args.n_jobs, alpha=args.alpha, output_path=args.output)
+    print(f"{results['hypothesis'].nunique()} hypotheses, {len(results)} tests in "
+          f"{results.attrs['wall_seconds']:.2f}s, results in {args.output}")
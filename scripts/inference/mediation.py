@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from scipy.stats import norm
+
+
+def _design(data, predictors, mediator, outcome):
+    """Stack [1, X..., M, Y] into one (n, q) float matrix"""
+    Z = data[list(predictors) + [mediator, outcome]].dropna(axis=0, how='any').to_numpy(dtype=np.float64)
+    return np.column_stack([np.ones(len(Z)), Z])
+
+
+def _paths_from_gram(G, n_predictors, joint_a_paths=False):
+    """
+    Solve every regression of the mediation model from Gram matrices
+    ``G = Z'Z`` of shape (..., q, q) with Z = [1, X_1..X_p, M, Y].
+
+    All models are sub-blocks of the same Gram matrix, so one batched
+    ``np.linalg.solve`` per model covers all resamples:
+    - a paths: M ~ 1 + X_j for each j (or M ~ 1 + X when ``joint_a_paths``)
+    - b and c': Y ~ 1 + X + M
+    - c (total): Y ~ 1 + X
+    """
+    p = n_predictors
+    m, y = p + 1, p + 2
+    xs = np.arange(1, p + 1)
+
+    if joint_a_paths:
+        cols = np.concatenate([[0], xs])
+        a = np.linalg.solve(G[..., cols[:, None], cols], G[..., cols, m][..., None])[..., 1:, 0]
+    else:
+        a = np.empty(G.shape[:-2] + (p,))
+        for j in xs:
+            cols = np.array([0, j])
+            a[..., j - 1] = np.linalg.solve(G[..., cols[:, None], cols], G[..., cols, m][..., None])[..., 1, 0]
+
+    full = np.concatenate([[0], xs, [m]])
+    coef_full = np.linalg.solve(G[..., full[:, None], full], G[..., full, y][..., None])[..., 0]
+    b = coef_full[..., -1]
+    c_prime = coef_full[..., 1:-1]
+
+    reduced = np.concatenate([[0], xs])
+    c = np.linalg.solve(G[..., reduced[:, None], reduced], G[..., reduced, y][..., None])[..., 1:, 0]
+
+    return {
+        'a': a,
+        'b': b,
+        'c_prime': c_prime,
+        'c': c,
+        'indirect': a * b[..., None],
+        'total': c
+    }
+
+
+def _bootstrap_shard(args):
+    """Resample one shard of ``size`` replicates with its own seed"""
+    Z, size, seed, n_predictors, joint_a_paths = args
+    rng = np.random.default_rng(seed)
+    n = Z.shape[0]
+    idx = rng.integers(0, n, size=(size, n))
+    samples = Z[idx]
+    G = np.matmul(samples.transpose(0, 2, 1), samples)
+    paths = _paths_from_gram(G, n_predictors, joint_a_paths)
+    return paths['indirect'], paths['total']
+
+
+def _jackknife(Z, n_predictors, joint_a_paths):
+    """Leave-one-out estimates via rank-one downdates of the full Gram matrix"""
+    G = Z.T @ Z
+    G_loo = G[None, :, :] - Z[:, :, None] * Z[:, None, :]
+    paths = _paths_from_gram(G_loo, n_predictors, joint_a_paths)
+    return paths['indirect'], paths['total']
+
+
+def _bca_interval(boot, estimate, jackknife, ci):
+    """Bias-corrected and accelerated interval for one statistic"""
+    prop = (np.sum(boot < estimate) + 0.5 * np.sum(boot == estimate)) / len(boot)
+    prop = np.clip(prop, 1 / (len(boot) + 1), 1 - 1 / (len(boot) + 1))
+    z0 = norm.ppf(prop)
+
+    diffs = jackknife.mean() - jackknife
+    denom = 6 * np.sum(diffs ** 2) ** 1.5
+    accel = np.sum(diffs ** 3) / denom if denom > 0 else 0.0
+
+    tail = (1 - ci) / 2
+    bounds = []
+    for z_alpha in norm.ppf([tail, 1 - tail]):
+        adjusted = norm.cdf(z0 + (z0 + z_alpha) / (1 - accel * (z0 + z_alpha)))
+        bounds.append(np.percentile(boot, 100 * adjusted))
+    return tuple(bounds)
+
+
+def bootstrap_mediation(data, predictors, mediator, outcome, n_boot=5000, ci=0.95, seed=None,
+                        n_jobs=1, batch_size=1000, joint_a_paths=False, return_samples=False):
+    """
+    Bootstrap the indirect (a*b) and total (c) effects of one or more
+    predictors on ``outcome`` through ``mediator``.
+
+    Resample indices are drawn as an integer matrix per shard of
+    ``batch_size`` replicates; each shard gets its own child seed from
+    ``np.random.SeedSequence(seed)``, so results are identical for any
+    ``n_jobs``. With ``n_jobs > 1`` shards run in a process pool.
+
+    Returns a DataFrame with one row per predictor and effect holding the
+    point estimate, bootstrap mean and SE, and percentile and BCa intervals.
+    """
+    predictors = [predictors] if isinstance(predictors, str) else list(predictors)
+    Z = _design(data, predictors, mediator, outcome)
+    p = len(predictors)
+
+    estimate = _paths_from_gram(Z.T @ Z, p, joint_a_paths)
+    jack_indirect, jack_total = _jackknife(Z, p, joint_a_paths)
+
+    n_shards = -(-n_boot // batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    sizes = [min(batch_size, n_boot - i * batch_size) for i in range(n_shards)]
+    tasks = [(Z, size, child, p, joint_a_paths) for size, child in zip(sizes, seeds)]
+
+    if n_jobs is not None and n_jobs != 1 and n_shards > 1:
+        with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as pool:
+            shards = list(pool.map(_bootstrap_shard, tasks))
+    else:
+        shards = [_bootstrap_shard(task) for task in tasks]
+
+    boot = {
+        'indirect': np.concatenate([shard[0] for shard in shards]),
+        'total': np.concatenate([shard[1] for shard in shards])
+    }
+    jack = {'indirect': jack_indirect, 'total': jack_total}
+
+    tail = 100 * (1 - ci) / 2
+    rows = []
+    for j, predictor in enumerate(predictors):
+        for effect in ['indirect', 'total']:
+            samples = boot[effect][:, j]
+            point = estimate[effect][j]
+            bca_lower, bca_upper = _bca_interval(samples, point, jack[effect][:, j], ci)
+            rows.append({
+                'predictor': predictor,
+                'effect': effect,
+                'estimate': point,
+                'boot_mean': samples.mean(),
+                'boot_se': samples.std(ddof=1),
+                'ci_lower': np.percentile(samples, tail),
+                'ci_upper': np.percentile(samples, 100 - tail),
+                'bca_lower': bca_lower,
+                'bca_upper': bca_upper
+            })
+
+    results = pd.DataFrame(rows)
+    if return_samples:
+        return results, boot
+    return results
+
+
+def mediation_paths(data, predictors, mediator, outcome, joint_a_paths=False):
+    """
+    Point estimates of the a, b, c' and c paths and the indirect effects
+    """
+    predictors = [predictors] if isinstance(predictors, str) else list(predictors)
+    Z = _design(data, predictors, mediator, outcome)
+    paths = _paths_from_gram(Z.T @ Z, len(predictors), joint_a_paths)
+    return pd.DataFrame({
+        'a': paths['a'],
+        'b': np.repeat(paths['b'], len(predictors)),
+        'c_prime': paths['c_prime'],
+        'c': paths['c'],
+        'indirect': paths['indirect']
+    }, index=pd.Index(predictors, name='predictor'))
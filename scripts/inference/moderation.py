@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+COEF_NAMES = ['const', 'predictor', 'moderator', 'interaction']
+
+
+def _pair_designs(df, pairs, outcome, center):
+    """
+    Stack the design matrices [1, x, m, x*m] of every (predictor, moderator)
+    pair into one (P, n, 4) array. Rows with a missing x, m or y get weight 0
+    so every pair keeps its own listwise sample inside the same batch.
+    """
+    columns = sorted({col for pair in pairs for col in pair})
+    values = df[columns].to_numpy(dtype=np.float64)
+    # Moderator means locate the simple slopes whether or not the design is centered
+    means = np.nanmean(values, axis=0)
+    centers = means if center else np.zeros(len(columns))
+    sds = np.nanstd(values, axis=0, ddof=1)
+    index = {col: j for j, col in enumerate(columns)}
+
+    y = df[outcome].to_numpy(dtype=np.float64)
+    y_missing = np.isnan(y)
+
+    n = len(df)
+    X = np.ones((len(pairs), n, 4))
+    weights = np.ones((len(pairs), n))
+    for k, (pred, mod) in enumerate(pairs):
+        x = values[:, index[pred]] - centers[index[pred]]
+        m = values[:, index[mod]] - centers[index[mod]]
+        missing = np.isnan(x) | np.isnan(m) | y_missing
+        X[k, :, 1] = np.where(missing, 0.0, x)
+        X[k, :, 2] = np.where(missing, 0.0, m)
+        X[k, :, 3] = X[k, :, 1] * X[k, :, 2]
+        weights[k, missing] = 0.0
+
+    y = np.where(y_missing, 0.0, y)
+    mod_means = np.array([means[index[mod]] for _, mod in pairs])
+    mod_sds = np.array([sds[index[mod]] for _, mod in pairs])
+    return X, y, weights, mod_means, mod_sds
+
+
+def _batched_solve(H, g):
+    """Solve H b = g over the batch with a negligible ridge against singular fits"""
+    ridge = 1e-12 * np.trace(H, axis1=-2, axis2=-1)[:, None, None] * np.eye(H.shape[-1])
+    return np.linalg.solve(H + ridge, g[..., None])[..., 0]
+
+
+def _fit_logit(X, y, weights, max_iter, tol):
+    """
+    Batched IRLS: one vectorized Newton step per iteration for every pair.
+    Pairs that have converged keep their coefficients.
+    """
+    P, n, q = X.shape
+    beta = np.zeros((P, q))
+    converged = np.zeros(P, dtype=bool)
+    for _ in range(max_iter):
+        eta = np.einsum('pnq,pq->pn', X, beta)
+        mu = 1.0 / (1.0 + np.exp(-eta))
+        w = weights * mu * (1.0 - mu)
+        H = np.matmul(X.transpose(0, 2, 1), X * w[:, :, None])
+        g = np.einsum('pnq,pn->pq', X, weights * (y - mu))
+        step = _batched_solve(H, g)
+        step[converged] = 0.0
+        beta += step
+        converged |= np.abs(step).max(axis=1) < tol
+        if converged.all():
+            break
+
+    eta = np.einsum('pnq,pq->pn', X, beta)
+    mu = 1.0 / (1.0 + np.exp(-eta))
+    w = weights * mu * (1.0 - mu)
+    H = np.matmul(X.transpose(0, 2, 1), X * w[:, :, None])
+    cov = np.linalg.inv(H)
+    return beta, cov, converged
+
+
+def _fit_ols(X, y, weights):
+    """Batched weighted least squares with classical covariance"""
+    Xw = X * weights[:, :, None]
+    XtX = np.matmul(X.transpose(0, 2, 1), Xw)
+    beta = _batched_solve(XtX, np.einsum('pnq,n->pq', Xw, y))
+    resid = y[None, :] - np.einsum('pnq,pq->pn', X, beta)
+    dof = weights.sum(axis=1) - X.shape[2]
+    sigma2 = (weights * resid ** 2).sum(axis=1) / dof
+    cov = np.linalg.inv(XtX) * sigma2[:, None, None]
+    return beta, cov, dof
+
+
+def _johnson_neyman(b1, b3, v11, v13, v33, crit):
+    """
+    Moderator values where the conditional slope b1 + b3*m is exactly
+    significant: roots of (b1 + b3 m)^2 = crit^2 (v11 + 2 m v13 + m^2 v33).
+    Returns (lower, upper, significant_outside) with NaN bounds when there
+    is no real root.
+    """
+    a = b3 ** 2 - crit ** 2 * v33
+    b = 2 * (b1 * b3 - crit ** 2 * v13)
+    c = b1 ** 2 - crit ** 2 * v11
+    disc = b ** 2 - 4 * a * c
+    with np.errstate(invalid='ignore', divide='ignore'):
+        root = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        r1 = (-b - root) / (2 * a)
+        r2 = (-b + root) / (2 * a)
+    return np.minimum(r1, r2), np.maximum(r1, r2), a > 0
+
+
+def moderation_screen(df, predictors, moderators, outcome, family='logit', center=True,
+                      alpha=0.05, max_iter=50, tol=1e-8):
+    """
+    Fit ``outcome ~ x + m + x*m`` for every predictor x moderator pair in one
+    batched solve (IRLS for ``family='logit'``, least squares for 'ols').
+
+    Returns one row per pair with coefficients, standard errors, p-values,
+    odds ratios (logit), simple slopes of the predictor at the moderator
+    mean and +/-1 SD, and the Johnson-Neyman bounds of the moderator (in
+    the original, uncentered units) where the predictor's slope changes
+    significance.
+    """
+    predictors = [predictors] if isinstance(predictors, str) else list(predictors)
+    moderators = [moderators] if isinstance(moderators, str) else list(moderators)
+    pairs = [(pred, mod) for pred in predictors for mod in moderators if pred != mod]
+    if not pairs:
+        raise ValueError("Need at least one predictor/moderator pair with distinct columns")
+
+    X, y, weights, mod_means, mod_sds = _pair_designs(df, pairs, outcome, center)
+    n_obs = weights.sum(axis=1)
+
+    if family == 'logit':
+        beta, cov, converged = _fit_logit(X, y, weights, max_iter, tol)
+        dist = stats.norm
+        dist_args = ()
+    elif family == 'ols':
+        beta, cov, dof = _fit_ols(X, y, weights)
+        converged = np.ones(len(pairs), dtype=bool)
+        dist = stats.t
+        dist_args = (dof,)
+    else:
+        raise ValueError("family must be 'logit' or 'ols'")
+
+    se = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    pvalues = 2 * dist.sf(np.abs(beta / se), *[arg[:, None] for arg in dist_args])
+    crit = dist.isf(alpha / 2, *dist_args)
+
+    result = pd.DataFrame({
+        'predictor': [pred for pred, _ in pairs],
+        'moderator': [mod for _, mod in pairs],
+        'n_obs': n_obs.astype(int),
+        'converged': converged
+    })
+    for j, name in enumerate(COEF_NAMES):
+        result[f'coef_{name}'] = beta[:, j]
+        result[f'se_{name}'] = se[:, j]
+        result[f'p_{name}'] = pvalues[:, j]
+    if family == 'logit':
+        for j, name in enumerate(COEF_NAMES[1:], start=1):
+            result[f'or_{name}'] = np.exp(beta[:, j])
+
+    b1, b3 = beta[:, 1], beta[:, 3]
+    v11, v13, v33 = cov[:, 1, 1], cov[:, 1, 3], cov[:, 3, 3]
+    offset = mod_means if center else np.zeros(len(pairs))
+    for label, shift in [('low', -mod_sds), ('mean', 0.0 * mod_sds), ('high', mod_sds)]:
+        # Moderator value in the units of the design (centered if center=True)
+        m = shift if center else mod_means + shift
+        slope = b1 + b3 * m
+        slope_se = np.sqrt(v11 + m ** 2 * v33 + 2 * m * v13)
+        result[f'slope_{label}'] = slope
+        result[f'slope_{label}_se'] = slope_se
+        result[f'slope_{label}_p'] = 2 * dist.sf(np.abs(slope / slope_se), *dist_args)
+
+    lower, upper, outside = _johnson_neyman(b1, b3, v11, v13, v33, crit)
+    result['jn_lower'] = lower + offset
+    result['jn_upper'] = upper + offset
+    result['jn_significant_outside'] = outside
+    return result
@@ -0,0 +1,16 @@
+# src/modeling/__init__.py
+
+from .training import (FEATURE_COLUMNS, TARGET_COLUMN, model_grid, construct_items, design_matrix, clear_design_cache,
+                       synthetic_panel, train_purchase_model)
+from .scoring import PurchaseScorer, compile_model, benchmark_scorer
+from .service import verify_parity, ServiceStats, MicroBatcher, ScoringService, serve
+from .loadgen import survey_payloads, run_load, fetch_metrics
+
+
+__all__ = [
+    'FEATURE_COLUMNS', 'TARGET_COLUMN', 'model_grid', 'construct_items', 'design_matrix', 'clear_design_cache',
+    'synthetic_panel', 'train_purchase_model',
+    'PurchaseScorer', 'compile_model', 'benchmark_scorer',
+    'verify_parity', 'ServiceStats', 'MicroBatcher', 'ScoringService', 'serve',
+    'survey_payloads', 'run_load', 'fetch_metrics'
+]
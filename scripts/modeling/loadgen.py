@@ -0,0 +1,130 @@
+import json
+import time
+import asyncio
+import argparse
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from ..data_io.paths import DEFAULT_DATA_PATH
+from ..EDA_src.constructs import AVERAGED_CONSTRUCTS
+from ..EDA_src.registry import DEMOGRAPHIC_COLUMNS
+from .service import DEFAULT_HOST, DEFAULT_PORT
+
+
+def survey_payloads(data_path=DEFAULT_DATA_PATH, n_payloads=1000, records_per_request=1, seed=0):
+    """
+    Encoded POST /score bodies built from survey respondents drawn with
+    replacement: the Likert items of the averaged constructs and the
+    encoded demographics of each respondent
+    """
+    df = pd.read_csv(data_path)
+    prefixes = tuple(f'{name}_' for name in AVERAGED_CONSTRUCTS)
+    columns = [col for col in df.columns
+               if (col.startswith(prefixes) and not col.endswith('_avg')) or col in DEMOGRAPHIC_COLUMNS]
+    records = df[columns].to_dict('records')
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(n_payloads):
+        chosen = [records[i] for i in rng.integers(0, len(records), records_per_request)]
+        body = {'records': chosen} if records_per_request > 1 else chosen[0]
+        payloads.append(json.dumps(body).encode('utf-8'))
+    return payloads
+
+
+async def _request(reader, writer, method, path, host, body=b''):
+    writer.write(f'{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _client(host, port, payloads, offset, deadline, remaining, latencies, failures):
+    """One keep-alive connection sending requests back to back until the budget is used up"""
+    reader, writer = await asyncio.open_connection(host, port)
+    k = offset
+    try:
+        while remaining[0] > 0 and time.perf_counter() < deadline:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, 'POST', '/score', host, payloads[k % len(payloads)])
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                failures[0] += 1
+            k += 1
+    finally:
+        writer.close()
+
+
+async def fetch_metrics(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """The service's GET /metrics snapshot"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await _request(reader, writer, 'GET', '/metrics', host)
+    finally:
+        writer.close()
+    return json.loads(body)
+
+
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, concurrency=32, requests=10_000, duration=None,
+                   payloads=None, records_per_request=1, data_path=DEFAULT_DATA_PATH, seed=0):
+    """
+    Closed-loop load test of a running scoring service: ``concurrency``
+    keep-alive connections each send the next request as soon as the last
+    one is answered, until ``requests`` are sent or ``duration`` seconds
+    have passed. Returns client-side counts, throughput and latency
+    percentiles (ms) together with the server's /metrics afterwards.
+    """
+    if payloads is None:
+        payloads = survey_payloads(data_path, records_per_request=records_per_request, seed=seed)
+    latencies, failures, remaining = [], [0], [requests if requests else float('inf')]
+    deadline = time.perf_counter() + duration if duration else float('inf')
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, payloads, c * len(payloads) // concurrency, deadline, remaining, latencies, failures)
+        for c in range(concurrency)
+    ])
+    seconds = time.perf_counter() - start
+
+    latencies = np.asarray(latencies) * 1e3
+    p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (np.nan, np.nan)
+    return {
+        'requests': len(latencies),
+        'failures': failures[0],
+        'seconds': seconds,
+        'requests_per_second': len(latencies) / seconds,
+        'rows_per_second': len(latencies) * records_per_request / seconds,
+        'latency_ms': {'p50': float(p50), 'p99': float(p99),
+                       'max': float(latencies.max()) if len(latencies) else None},
+        'server': await fetch_metrics(host, port)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load-test a running purchase-model scoring service')
+    parser.add_argument('--url', default=f'http://{DEFAULT_HOST}:{DEFAULT_PORT}')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=10_000)
+    parser.add_argument('--duration', type=float, default=None, help='stop after this many seconds instead')
+    parser.add_argument('--records-per-request', type=int, default=1)
+    args = parser.parse_args()
+
+    address = urlsplit(args.url)
+    result = asyncio.run(run_load(address.hostname, address.port or 80, concurrency=args.concurrency,
+                                  requests=None if args.duration else args.requests, duration=args.duration,
+                                  records_per_request=args.records_per_request, data_path=args.data))
+    server = result.pop('server')
+    print(json.dumps(result, indent=1))
+    print('Server:', json.dumps(server, indent=1))
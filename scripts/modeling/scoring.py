@@ -0,0 +1,354 @@
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import joblib
+from scipy.special import expit
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from ..data_io.paths import DEFAULT_DATA_PATH
+from .training import DEFAULT_MODEL_DIR, MODEL_FILENAME, construct_items
+
+BENCHMARK_BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Node visits per traversal chunk of a tree ensemble (rows x trees)
+_TREE_CHUNK_CELLS = 1 << 16
+_LINEAR_CHUNK_ROWS = 1 << 16
+
+
+def _pipeline_steps(model):
+    return [step for _, step in model.steps] if isinstance(model, Pipeline) else [model]
+
+
+def _positive_column(classifier):
+    classes = list(classifier.classes_)
+    if len(classes) != 2 or 1 not in classes:
+        raise ValueError(f"Expected a binary 0/1 classifier, got classes {classes}")
+    return classes.index(1)
+
+
+def _compile_linear(steps):
+    """
+    Scaler means/scales and logistic coefficients as plain arrays, applied
+    in the order of ``Pipeline.predict_proba``. The dot product is a
+    row-wise sum instead of a BLAS matmul, whose rounding depends on where a
+    row sits in the batch, so a respondent gets the same score in any batch
+    """
+    *scalers, classifier = steps
+    return {
+        'scalers': [(scaler.mean_ if scaler.with_mean else None, scaler.scale_ if scaler.with_std else None)
+                    for scaler in scalers],
+        'coef': classifier.coef_[0].astype(np.float64),
+        'intercept': float(classifier.intercept_[0]),
+        'column': _positive_column(classifier)
+    }
+
+
+def _flatten_trees(trees):
+    """
+    Concatenate trees given as (left, right, feature, threshold, leaf value,
+    depth) into one node table, deepest tree first. Leaves point to
+    themselves and never branch, so a row can walk every tree for the same
+    number of levels; 'active' holds how many (leading) trees still branch
+    at each level and 'order' the position of every tree in the original
+    order, in which the leaf values are accumulated.
+    """
+    order = np.argsort([-int(tree[5]) for tree in trees], kind='stable')
+    trees = [trees[t] for t in order]
+    features, thresholds, children, values, roots, depths = [], [], [], [], [], []
+    offset = 0
+    for left, right, feature, threshold, value, tree_depth in trees:
+        ids = np.arange(len(left)) + offset
+        leaf = left < 0
+        children.append(np.column_stack([np.where(leaf, ids, left + offset), np.where(leaf, ids, right + offset)]))
+        features.append(np.where(leaf, 0, feature))
+        thresholds.append(np.where(leaf, np.inf, threshold))
+        values.append(value)
+        roots.append(offset)
+        depths.append(int(tree_depth))
+        offset += len(left)
+    depths = np.asarray(depths)
+    return {
+        'feature': np.concatenate(features).astype(np.intp),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'children': np.concatenate(children).astype(np.intp).ravel(),
+        'value': np.concatenate(values).astype(np.float64),
+        'roots': np.asarray(roots, dtype=np.intp),
+        'order': np.argsort(order),
+        'active': [int((depths > level).sum()) for level in range(depths.max(initial=0))]
+    }
+
+
+def _compile_forest(forest):
+    """Node table of a random forest; leaves hold the class-1 share of the tree"""
+    column = _positive_column(forest)
+    trees = []
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = value[:, column] / value.sum(axis=1)
+        trees.append((tree.children_left, tree.children_right, tree.feature, tree.threshold, share, tree.max_depth))
+    # sklearn trees compare the features in float32
+    return dict(_flatten_trees(trees), link='mean', baseline=0.0, dtype=np.float32)
+
+
+def _compile_boosting(booster):
+    """Node table of a binary histogram gradient boosting model (leaf values are raw log-odds)"""
+    column = _positive_column(booster)
+    trees = []
+    for (predictor,) in booster._predictors:
+        nodes = predictor.nodes
+        left = np.where(nodes['is_leaf'] == 1, -1, nodes['left'].astype(np.int64))
+        trees.append((left, nodes['right'].astype(np.int64), nodes['feature_idx'], nodes['num_threshold'],
+                      nodes['value'], nodes['depth'].max()))
+    baseline = float(booster._baseline_prediction.ravel()[0])
+    table = dict(_flatten_trees(trees), link='logit', baseline=baseline, dtype=np.float64)
+    if column == 0:
+        table['value'], table['baseline'] = -table['value'], -baseline
+    return table
+
+
+def compile_model(model):
+    """
+    Precompiled scoring path of a fitted purchase model: ('linear', scaler
+    and coefficient arrays) for standard scalers followed by a logistic regression,
+    ('trees', flat node table) for a random forest or histogram gradient
+    boosting, and ('estimator', model) for anything else, which is then
+    scored through its own ``predict_proba``
+    """
+    steps = _pipeline_steps(model)
+    final = steps[-1]
+    if isinstance(final, LogisticRegression) and all(isinstance(step, StandardScaler) for step in steps[:-1]):
+        return 'linear', _compile_linear(steps)
+    if len(steps) == 1 and isinstance(final, RandomForestClassifier):
+        return 'trees', _compile_forest(final)
+    if (len(steps) == 1 and isinstance(final, HistGradientBoostingClassifier) and final.n_trees_per_iteration_ == 1
+            and getattr(final, '_preprocessor', None) is None
+            and not any(predictor.nodes['is_categorical'].any() for (predictor,) in final._predictors)):
+        return 'trees', _compile_boosting(final)
+    return 'estimator', model
+
+
+class PurchaseScorer:
+    """
+    Purchase-intention scores of raw survey submissions without pandas.
+
+    ``inputs`` is the order of a raw item vector: the items of every averaged
+    construct followed by the features taken as is (the demographics). The
+    construct averages are one matmul with the (inputs x features)
+    membership matrix divided by the item counts, which reproduces
+    ``compute_aggregate_features`` bit for bit; missing items drop out of
+    their construct's average. The model itself runs through the path of
+    ``compile_model``. Rows with a construct that has no answered item score
+    NaN, as they are dropped from training.
+    """
+
+    def __init__(self, model, features, constructs, metadata=None):
+        self.model = model
+        self.features = list(features)
+        self.constructs = {name: list(items) for name, items in constructs.items()}
+        self.metadata = metadata or {}
+
+        self.inputs = []
+        for col in self.features:
+            if col.endswith('_avg'):
+                name = col[:-len('_avg')]
+                if name not in self.constructs:
+                    raise ValueError(f"No item definition for the construct of feature '{col}'")
+                self.inputs += [item for item in self.constructs[name] if item not in self.inputs]
+            elif col not in self.inputs:
+                self.inputs.append(col)
+        position = {col: i for i, col in enumerate(self.inputs)}
+
+        self._membership = np.zeros((len(self.inputs), len(self.features)))
+        for j, col in enumerate(self.features):
+            items = self.constructs[col[:-len('_avg')]] if col.endswith('_avg') else [col]
+            self._membership[[position[item] for item in items], j] = 1.0
+        self._counts = self._membership.sum(axis=0)
+
+        self.kind, self._compiled = compile_model(model)
+        if self.kind == 'trees':
+            n_trees = len(self._compiled['roots'])
+            self._chunk_rows = max(1, _TREE_CHUNK_CELLS // n_trees)
+        else:
+            self._chunk_rows = _LINEAR_CHUNK_ROWS
+
+    def __repr__(self):
+        return f'PurchaseScorer({self.kind}, {len(self.inputs)} inputs -> {len(self.features)} features)'
+
+    @classmethod
+    def load(cls, model_dir=DEFAULT_MODEL_DIR, data_path=DEFAULT_DATA_PATH):
+        """
+        Load ``purchase_model.joblib`` and its metadata written by
+        ``train_purchase_model``. Models saved without construct definitions
+        take them from the header of the survey CSV at ``data_path``.
+        """
+        model = joblib.load(os.path.join(model_dir, MODEL_FILENAME))
+        metadata_path = os.path.join(model_dir, 'purchase_model.json')
+        metadata = {}
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as handle:
+                metadata = json.load(handle)
+        features = metadata.get('features') or list(getattr(model, 'feature_names_in_', []))
+        if not features:
+            raise ValueError(f"No feature list found for the model in {model_dir}")
+        constructs = metadata.get('constructs')
+        if constructs is None:
+            constructs = construct_items(pd.read_csv(data_path, nrows=0).columns, features)
+        return cls(model, features, constructs, metadata)
+
+    def vector(self, record):
+        """Raw item vector of one submission ({item: value}); absent or None items are NaN"""
+        values = np.full(len(self.inputs), np.nan)
+        for i, col in enumerate(self.inputs):
+            value = record.get(col)
+            if value is not None:
+                values[i] = value
+        return values
+
+    def feature_matrix(self, X):
+        """Model features (rows x features) of a raw item batch in ``inputs`` order"""
+        X = np.asarray(X, dtype=np.float64)
+        missing = np.isnan(X)
+        if not missing.any():
+            return (X @ self._membership) / self._counts
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (np.where(missing, 0.0, X) @ self._membership) / (~missing @ self._membership)
+
+    def _tree_scores(self, F):
+        table = self._compiled
+        n_rows, n_trees = len(F), len(table['roots'])
+        flat = np.ascontiguousarray(F, dtype=table['dtype']).ravel()
+        row_offsets = np.arange(n_rows, dtype=np.intp) * F.shape[1]
+        feature, threshold, children = table['feature'], table['threshold'], table['children']
+        # Trees x rows, so the trees still branching are a contiguous leading block
+        nodes = np.repeat(table['roots'][:, None], n_rows, axis=1)
+        for active in table['active']:
+            branching = nodes[:active]
+            go_right = flat[feature[branching] + row_offsets] > threshold[branching]
+            nodes[:active] = children[2 * branching + go_right]
+        # Accumulate tree by tree in the original order, as sklearn does
+        leaf_values = table['value'][nodes]
+        total = np.full(n_rows, table['baseline'])
+        for position in table['order']:
+            total += leaf_values[position]
+        if table['link'] == 'mean':
+            return total / n_trees
+        return expit(total)
+
+    def _linear_scores(self, F):
+        linear = self._compiled
+        Z = F.copy()
+        for mean, scale in linear['scalers']:
+            if mean is not None:
+                Z -= mean
+            if scale is not None:
+                Z /= scale
+        probability = expit((Z * linear['coef']).sum(axis=1) + linear['intercept'])
+        return probability if linear['column'] == 1 else 1 - probability
+
+    def _score_block(self, X):
+        F = self.feature_matrix(X)
+        complete = ~np.isnan(F).any(axis=1)
+        if self.kind == 'linear':
+            scores = self._linear_scores(F)
+        elif self.kind == 'trees':
+            scores = self._tree_scores(F)
+        else:
+            scores = np.full(len(F), np.nan)
+            if complete.any():
+                column = _positive_column(_pipeline_steps(self.model)[-1])
+                scores[complete] = self.model.predict_proba(F[complete])[:, column]
+        scores[~complete] = np.nan
+        return scores
+
+    def score(self, X):
+        """
+        Purchase probability of every row of a raw item batch (rows x
+        ``inputs``, any numeric dtype such as the int8 survey columns), or a
+        single probability for a 1-D vector. Large batches are scored in
+        chunks so the temporaries stay small.
+        """
+        X = np.asarray(X)
+        if X.shape[-1] != len(self.inputs):
+            raise ValueError(f"Expected {len(self.inputs)} inputs per row, got {X.shape[-1]}")
+        if X.ndim == 1:
+            return float(self._score_block(X[None, :])[0])
+        if len(X) <= self._chunk_rows:
+            return self._score_block(X)
+        scores = np.empty(len(X))
+        for start in range(0, len(X), self._chunk_rows):
+            scores[start:start + self._chunk_rows] = self._score_block(X[start:start + self._chunk_rows])
+        return scores
+
+    def score_records(self, records):
+        """Purchase probabilities of a list of submissions ({item: value} dicts)"""
+        if not len(records):
+            return np.empty(0)
+        return self.score(np.vstack([self.vector(record) for record in records]))
+
+    def score_frame(self, df):
+        """Purchase probabilities of the rows of a survey frame, as a Series"""
+        X = df[self.inputs].to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.Series(self.score(X), index=df.index, name='purchase_probability')
+
+
+def benchmark_scorer(scorer, X=None, batch_sizes=BENCHMARK_BATCH_SIZES, min_seconds=0.5, data_path=DEFAULT_DATA_PATH,
+                     seed=0):
+    """
+    Scoring latency per batch size. Batches are rows of ``X`` (a raw item
+    pool in ``scorer.inputs`` order; by default survey respondents drawn
+    with replacement up to the largest batch size, as int8) and each size is
+    repeated until ``min_seconds`` have passed. Batch size 1 is scored as a
+    1-D vector, the single-submission path. Returns one row per batch size
+    with the median seconds per call, microseconds per row and rows per
+    second.
+    """
+    rng = np.random.default_rng(seed)
+    if X is None:
+        survey = pd.read_csv(data_path, usecols=scorer.inputs)[scorer.inputs].to_numpy(dtype=np.int8)
+        X = survey[rng.integers(0, len(survey), max(batch_sizes))]
+    X = np.asarray(X)
+
+    rows = []
+    for size in batch_sizes:
+        size = min(int(size), len(X))
+        start = int(rng.integers(0, len(X) - size + 1))
+        batch = X[start] if size == 1 else X[start:start + size]
+        timings = []
+        budget_start = time.perf_counter()
+        while not timings or time.perf_counter() - budget_start < min_seconds:
+            call_start = time.perf_counter()
+            scorer.score(batch)
+            timings.append(time.perf_counter() - call_start)
+        seconds = float(np.median(timings))
+        rows.append({
+            'batch_size': size,
+            'calls': len(timings),
+            'seconds_per_call': seconds,
+            'us_per_row': seconds / size * 1e6,
+            'rows_per_second': size / seconds
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the purchase-model scorer over batch sizes')
+    parser.add_argument('--model-dir', default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--max-batch', type=int, default=1_000_000)
+    parser.add_argument('--min-seconds', type=float, default=0.5)
+    args = parser.parse_args()
+
+    scorer = PurchaseScorer.load(args.model_dir, data_path=args.data)
+    sizes = [size for size in BENCHMARK_BATCH_SIZES if size <= args.max_batch]
+    print(scorer)
+    print(benchmark_scorer(scorer, batch_sizes=sizes, min_seconds=args.min_seconds,
+                           data_path=args.data).to_string(index=False))
@@ -0,0 +1,333 @@
+import os
+import json
+import time
+import asyncio
+import argparse
+from http import HTTPStatus
+
+import numpy as np
+import pandas as pd
+
+from ..data_io.paths import DEFAULT_DATA_PATH
+from .training import DEFAULT_MODEL_DIR, design_matrix
+from .scoring import PurchaseScorer, _pipeline_steps, _positive_column
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Largest request body accepted (bytes)
+_MAX_BODY = 16 << 20
+
+
+def verify_parity(scorer, df):
+    """
+    Check the online feature path against the offline one on a survey frame.
+
+    The offline features are ``design_matrix`` (construct averages from
+    ``compute_aggregate_features``) and must equal the scorer's features bit
+    for bit; a mismatch raises ValueError. Also returns the largest gap
+    between the scorer's probabilities and the model's own ``predict_proba``
+    on those features: 0 for tree models, a few ulps at most for the
+    logistic model (sklearn's BLAS matmul rounds by a row's batch position).
+    """
+    design = design_matrix(df, features=scorer.features, use_cache=False)
+    rows = df.index.get_indexer(design['index'])
+    X = df[scorer.inputs].to_numpy(dtype=np.float64, na_value=np.nan)
+    online = scorer.feature_matrix(X)[rows]
+    if not np.array_equal(online, design['X']):
+        worst = np.nanmax(np.abs(online - design['X']))
+        raise ValueError(f"Online features differ from compute_aggregate_features (max gap {worst:.3g})")
+    column = _positive_column(_pipeline_steps(scorer.model)[-1])
+    offline = scorer.model.predict_proba(design['X'])[:, column]
+    return {'rows': len(rows), 'max_score_difference': float(np.abs(scorer.score(X)[rows] - offline).max())}
+
+
+class ServiceStats:
+    """
+    Request counters and a rolling window of the latest request latencies.
+
+    Latencies and completion times go into fixed ring buffers of ``window``
+    slots, so the percentiles and the recent throughput cover the last
+    ``window`` requests whatever the uptime; the totals run from startup.
+    """
+
+    def __init__(self, window=100_000):
+        self.window = window
+        self._latencies = np.zeros(window)
+        self._finished = np.zeros(window)
+        self._filled = 0
+        self._next = 0
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.max_batch_rows = 0
+        self.scoring_seconds = 0.0
+
+    def add_request(self, latency, rows):
+        self._latencies[self._next] = latency
+        self._finished[self._next] = time.perf_counter()
+        self._next = (self._next + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+        self.requests += 1
+        self.rows += rows
+
+    def add_batch(self, rows, seconds):
+        self.batches += 1
+        self.batch_rows += rows
+        self.max_batch_rows = max(self.max_batch_rows, rows)
+        self.scoring_seconds += seconds
+
+    def snapshot(self):
+        """Counters, latency percentiles (ms) and throughput as a JSON-ready dict"""
+        uptime = time.perf_counter() - self.started
+        latencies = self._latencies[:self._filled]
+        finished = self._finished[:self._filled]
+        recent = None
+        if self._filled > 1 and finished.max() > finished.min():
+            recent = (self._filled - 1) / (finished.max() - finished.min())
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e3 if self._filled else (None, None)
+        return {
+            'uptime_seconds': round(uptime, 3),
+            'requests': self.requests,
+            'rows': self.rows,
+            'errors': self.errors,
+            'batches': self.batches,
+            'mean_batch_rows': self.batch_rows / self.batches if self.batches else None,
+            'max_batch_rows': self.max_batch_rows,
+            'scoring_seconds': round(self.scoring_seconds, 6),
+            'latency_ms': {
+                'p50': None if p50 is None else float(p50),
+                'p99': None if p99 is None else float(p99),
+                'max': float(latencies.max()) * 1e3 if self._filled else None,
+                'window': int(self._filled)
+            },
+            'requests_per_second': self.requests / uptime if uptime > 0 else None,
+            'rows_per_second': self.rows / uptime if uptime > 0 else None,
+            'recent_requests_per_second': recent
+        }
+
+
+class MicroBatcher:
+    """
+    Collect concurrent scoring requests into one vectorized ``scorer.score``.
+
+    A batch opens with the first waiting request and closes once it holds
+    ``max_batch`` rows or ``max_wait`` seconds have passed, whichever comes
+    first. Scoring runs on the event loop itself: a batch takes microseconds
+    per row, less than a hop to a worker thread would cost.
+    """
+
+    def __init__(self, scorer, max_batch=256, max_wait=0.002, stats=None):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = stats
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def score(self, X):
+        """Probabilities of the rows of a raw item block, scored with whatever else is waiting"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((X, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        pending = [await self._queue.get()]
+        rows = len(pending[0][0])
+        deadline = loop.time() + self.max_wait
+        while rows < self.max_batch:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            pending.append(item)
+            rows += len(item[0])
+        return pending, rows
+
+    async def _run(self):
+        while True:
+            pending, rows = await self._collect()
+            start = time.perf_counter()
+            try:
+                scores = self.scorer.score(pending[0][0] if len(pending) == 1 else
+                                           np.vstack([X for X, _ in pending]))
+            except Exception as error:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            if self.stats is not None:
+                self.stats.add_batch(rows, time.perf_counter() - start)
+            offset = 0
+            for X, future in pending:
+                if not future.done():
+                    future.set_result(scores[offset:offset + len(X)])
+                offset += len(X)
+
+
+class ScoringService:
+    """
+    Minimal HTTP/1.1 scoring service on ``asyncio.start_server``.
+
+    Routes (keep-alive connections are reused):
+
+    - ``POST /score`` with one submission ({item: value}, or
+      {"record": {...}}) returns {"probability": p}; {"records": [...]}
+      returns {"probabilities": [...]}. Absent items count as missing.
+    - ``GET /metrics`` returns the ``ServiceStats`` snapshot plus the
+      batching settings.
+    - ``GET /health`` returns the model kind and its input count.
+    """
+
+    def __init__(self, scorer, max_batch=256, max_wait=0.002, window=100_000):
+        self.scorer = scorer
+        self.stats = ServiceStats(window)
+        self.batcher = MicroBatcher(scorer, max_batch=max_batch, max_wait=max_wait, stats=self.stats)
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    def metrics(self):
+        metrics = self.stats.snapshot()
+        metrics['max_batch'] = self.batcher.max_batch
+        metrics['max_wait_ms'] = self.batcher.max_wait * 1e3
+        return metrics
+
+    async def _score(self, body):
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object")
+        if 'records' in payload:
+            records = payload['records']
+            if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+                raise ValueError("'records' must be a list of objects")
+            if not records:
+                return {'probabilities': []}, 0
+            scores = await self.batcher.score(np.vstack([self.scorer.vector(record) for record in records]))
+            return {'probabilities': [None if np.isnan(p) else float(p) for p in scores]}, len(records)
+        record = payload.get('record', payload)
+        if not isinstance(record, dict):
+            raise ValueError("'record' must be an object")
+        score = (await self.batcher.score(self.scorer.vector(record)[None, :]))[0]
+        return {'probability': None if np.isnan(score) else float(score)}, 1
+
+    async def _route(self, method, path):
+        if method == 'GET' and path == '/metrics':
+            return HTTPStatus.OK, self.metrics()
+        if method == 'GET' and path == '/health':
+            return HTTPStatus.OK, {'status': 'ok', 'model': self.scorer.kind, 'inputs': len(self.scorer.inputs)}
+        return HTTPStatus.NOT_FOUND, {'error': f'No route for {method} {path}'}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > _MAX_BODY:
+                    raise ValueError(f"Request body of {length} bytes exceeds the limit")
+                body = await reader.readexactly(length) if length else b''
+
+                start = time.perf_counter()
+                rows = 0
+                if method == 'POST' and path == '/score':
+                    try:
+                        payload, rows = await self._score(body)
+                        status = HTTPStatus.OK
+                    except (ValueError, TypeError) as error:
+                        self.stats.errors += 1
+                        status, payload = HTTPStatus.BAD_REQUEST, {'error': str(error)}
+                else:
+                    status, payload = await self._route(method, path)
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                content = json.dumps(payload).encode('utf-8')
+                head = (f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                        f'Content-Type: application/json\r\nContent-Length: {len(content)}\r\n'
+                        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+                writer.write(head.encode('latin-1') + content)
+                await writer.drain()
+                if path == '/score' and status == HTTPStatus.OK:
+                    self.stats.add_request(time.perf_counter() - start, rows)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(scorer, host=DEFAULT_HOST, port=DEFAULT_PORT, max_batch=256, max_wait=0.002):
+    """Run a ``ScoringService`` until cancelled"""
+    service = ScoringService(scorer, max_batch=max_batch, max_wait=max_wait)
+    server = await service.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve the purchase model over HTTP with micro-batching')
+    parser.add_argument('--model-dir', default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch', type=int, default=256, help='rows per micro-batch')
+    parser.add_argument('--max-wait-ms', type=float, default=2.0, help='longest wait to fill a micro-batch')
+    parser.add_argument('--skip-parity', action='store_true', help='skip the startup check against the survey data')
+    args = parser.parse_args()
+
+    scorer = PurchaseScorer.load(args.model_dir, data_path=args.data)
+    if not args.skip_parity and os.path.exists(args.data):
+        parity = verify_parity(scorer, pd.read_csv(args.data))
+        print(f"Parity on {parity['rows']} survey rows: features identical, "
+              f"max score difference {parity['max_score_difference']:.3g}")
+    print(f"Serving {scorer} on http://{args.host}:{args.port} "
+          f"(max batch {args.max_batch}, max wait {args.max_wait_ms} ms)", flush=True)
+    try:
+        asyncio.run(serve(scorer, args.host, args.port, args.max_batch, args.max_wait_ms / 1e3))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import log_loss, roc_auc_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from ..EDA_src.constructs import AVERAGED_CONSTRUCTS, compute_aggregate_features
+from ..EDA_src.decomposition import data_version
+from ..EDA_src.registry import ConstructRegistry, schema_hash
+from ..data_io.paths import REPO_ROOT, DEFAULT_DATA_PATH
+
+DEFAULT_MODEL_DIR = os.path.join(REPO_ROOT, 'outputs', 'models')
+MODEL_FILENAME = 'purchase_model.joblib'
+
+TARGET_COLUMN = 'opi_purchased?'
+DEMOGRAPHIC_FEATURES = ['gender_encoded', 'age_encoded', 'education_encoded']
+FEATURE_COLUMNS = [f'{name}_avg' for name in AVERAGED_CONSTRUCTS] + DEMOGRAPHIC_FEATURES
+
+_DESIGN_CACHE = {}
+_MAX_CACHED_DESIGNS = 4
+
+
+def model_grid(random_state=42):
+    """
+    Candidate pipelines and their hyperparameter grids. Gradient boosting is
+    the histogram implementation, which bins the features once and stays
+    fast on millions of rows; the forest bootstraps a fraction of the rows
+    per tree for the same reason.
+    """
+    return {
+        'logistic': (
+            Pipeline([('scale', StandardScaler()), ('clf', LogisticRegression(max_iter=1000))]),
+            {'clf__C': [0.01, 0.1, 1.0, 10.0]}
+        ),
+        'random_forest': (
+            Pipeline([('clf', RandomForestClassifier(n_estimators=100, max_samples=0.5, n_jobs=1,
+                                                     random_state=random_state))]),
+            {'clf__max_depth': [6, 12], 'clf__min_samples_leaf': [5, 50]}
+        ),
+        'gradient_boosting': (
+            Pipeline([('clf', HistGradientBoostingClassifier(max_iter=200, early_stopping=False,
+                                                             random_state=random_state))]),
+            {'clf__learning_rate': [0.05, 0.1], 'clf__max_leaf_nodes': [15, 31]}
+        )
+    }
+
+
+def construct_items(columns, features=None):
+    """
+    Item columns averaged into every '<construct>_avg' feature, as
+    ``compute_aggregate_features`` picks them from a schema with ``columns``
+    """
+    registry = ConstructRegistry(columns)
+    features = FEATURE_COLUMNS if features is None else features
+    return {col[:-len('_avg')]: [item for item in registry.columns(col[:-len('_avg')]) if not item.endswith('_avg')]
+            for col in features if col.endswith('_avg')}
+
+
+def design_matrix(df, features=None, target=TARGET_COLUMN, version=None, use_cache=True):
+    """
+    Feature matrix and target of the purchase model, built once per data version.
+
+    The construct averages come from ``compute_aggregate_features`` (so they
+    match ``create_aggregate_features``) unless the frame already has them;
+    demographics are taken as encoded. Incomplete rows are dropped. The data
+    version is a content hash of the source columns unless ``version`` is
+    given (e.g. the file hash of the columnar cache).
+
+    Returns a dict with 'X' (float64, rows x features), 'y' (int8), the
+    'features', the kept row 'index' and the 'version'.
+    """
+    features = list(FEATURE_COLUMNS if features is None else features)
+    averaged = [col for col in features if col.endswith('_avg') and col not in df.columns]
+    sources = [col for col in features if col in df.columns] + [target]
+    if averaged:
+        prefixes = tuple(col[:-len('avg')] for col in averaged)
+        sources += [col for col in df.columns if col.startswith(prefixes) and not col.endswith('_avg')]
+    version = version or data_version(df[sources].to_numpy(dtype=np.float64, na_value=np.nan))
+    key = (schema_hash(features + [target]), version)
+    if use_cache and key in _DESIGN_CACHE:
+        return _DESIGN_CACHE[key]
+
+    aggregates = compute_aggregate_features(df) if averaged else None
+    X = np.column_stack([
+        (aggregates[col] if col in averaged else df[col]).to_numpy(dtype=np.float64, na_value=np.nan)
+        for col in features
+    ])
+    y = df[target].to_numpy(dtype=np.float64, na_value=np.nan)
+    complete = ~np.isnan(X).any(axis=1) & ~np.isnan(y)
+    design = {
+        'X': np.ascontiguousarray(X[complete]),
+        'y': y[complete].astype(np.int8),
+        'features': features,
+        'index': df.index[complete],
+        'version': version
+    }
+
+    if use_cache:
+        if key not in _DESIGN_CACHE and len(_DESIGN_CACHE) >= _MAX_CACHED_DESIGNS:
+            _DESIGN_CACHE.pop(next(iter(_DESIGN_CACHE)))
+        _DESIGN_CACHE[key] = design
+    return design
+
+
+def clear_design_cache():
+    _DESIGN_CACHE.clear()
+
+
+def synthetic_panel(df, n_rows, seed=None, jitter=0.1):
+    """
+    Survey-shaped panel of ``n_rows`` respondents for scale tests: rows of
+    ``df`` drawn with replacement, then each Likert item moved one point up
+    or down with probability ``jitter`` (kept inside the observed range).
+    Resampled rows repeat across CV folds, so scores on the panel measure
+    speed, not accuracy.
+    """
+    rng = np.random.default_rng(seed)
+    panel = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    likert = [col for col in panel.columns if col.startswith(tuple(f'{name}_' for name in AVERAGED_CONSTRUCTS))
+              and not col.endswith('_avg')]
+    values = panel[likert].to_numpy(dtype=np.float64)
+    shift = rng.choice([-1.0, 0.0, 1.0], size=values.shape, p=[jitter / 2, 1 - jitter, jitter / 2])
+    panel[likert] = np.clip(values + shift, np.nanmin(values, axis=0), np.nanmax(values, axis=0))
+    return panel
+
+
+def _fit_and_score(estimator, params, X, y, train, test):
+    """Fit one candidate on one fold; ROC AUC and log loss on the held-out rows"""
+    model = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    probability = model.predict_proba(X[test])[:, 1]
+    return {
+        'roc_auc': roc_auc_score(y[test], probability),
+        'log_loss': log_loss(y[test], probability, labels=[0, 1]),
+        'fit_seconds': time.perf_counter() - start
+    }
+
+
+def train_purchase_model(df, models=None, features=None, cv=5, n_jobs=-1, search_rows=200_000,
+                         output_dir=DEFAULT_MODEL_DIR, version=None, random_state=42):
+    """
+    Cross-validated model sweep for ``opi_purchased?``.
+
+    Every (model, hyperparameters, fold) of ``model_grid`` (or the subset
+    named in ``models``) is one joblib task, so all candidates share the
+    worker pool (``n_jobs``, all cores by default); the design matrix is
+    built once (``design_matrix``) and memory-mapped to the workers. Folds
+    are stratified. Above ``search_rows`` rows the sweep runs on a stratified
+    subsample of that size and only the winning pipeline (highest mean ROC
+    AUC) is refitted on all rows.
+
+    The winner is saved with joblib to ``output_dir/purchase_model.joblib``
+    together with ``purchase_model.json`` (features, target, parameters, CV
+    scores, data version, the items of every averaged construct) and
+    ``cv_results.csv``; ``output_dir=None`` skips
+    writing. Returns a dict with the fitted 'model', the 'cv_results'
+    DataFrame, the 'best' row, the design 'features' and the model 'path'.
+    """
+    design = design_matrix(df, features=features, version=version)
+    X, y = design['X'], design['y']
+    if len(np.unique(y)) < 2:
+        raise ValueError(f"{TARGET_COLUMN} has a single class; nothing to model")
+
+    X_search, y_search = X, y
+    if search_rows and len(y) > search_rows:
+        X_search, _, y_search, _ = train_test_split(X, y, train_size=search_rows, stratify=y,
+                                                    random_state=random_state)
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(X_search, y_search))
+
+    grid = model_grid(random_state)
+    names = list(grid) if models is None else list(models)
+    candidates = [(name, params) for name in names for params in ParameterGrid(grid[name][1])]
+    tasks = [(name, params, train, test) for name, params in candidates for train, test in folds]
+
+    start = time.perf_counter()
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_and_score)(grid[name][0], params, X_search, y_search, train, test)
+        for name, params, train, test in tasks
+    )
+    search_seconds = time.perf_counter() - start
+
+    rows = []
+    for c, (name, params) in enumerate(candidates):
+        fold_scores = scores[c * cv:(c + 1) * cv]
+        rows.append({
+            'model': name,
+            'params': json.dumps(params, sort_keys=True),
+            'mean_roc_auc': np.mean([s['roc_auc'] for s in fold_scores]),
+            'std_roc_auc': np.std([s['roc_auc'] for s in fold_scores]),
+            'mean_log_loss': np.mean([s['log_loss'] for s in fold_scores]),
+            'mean_fit_seconds': np.mean([s['fit_seconds'] for s in fold_scores])
+        })
+    cv_results = pd.DataFrame(rows).sort_values('mean_roc_auc', ascending=False, kind='stable').reset_index(drop=True)
+    best = cv_results.iloc[0]
+
+    model = clone(grid[best['model']][0]).set_params(**json.loads(best['params']))
+    start = time.perf_counter()
+    model.fit(X, y)
+    refit_seconds = time.perf_counter() - start
+
+    path = None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, MODEL_FILENAME)
+        joblib.dump(model, path)
+        metadata = {
+            'trained': datetime.now().isoformat(timespec='seconds'),
+            'target': TARGET_COLUMN,
+            'features': design['features'],
+            'constructs': construct_items(df.columns, design['features']),
+            'model': best['model'],
+            'params': json.loads(best['params']),
+            'cv_folds': cv,
+            'mean_roc_auc': float(best['mean_roc_auc']),
+            'mean_log_loss': float(best['mean_log_loss']),
+            'n_train': int(len(y)),
+            'n_search': int(len(y_search)),
+            'search_seconds': round(search_seconds, 3),
+            'refit_seconds': round(refit_seconds, 3),
+            'data_version': design['version']
+        }
+        with open(os.path.join(output_dir, 'purchase_model.json'), 'w') as handle:
+            json.dump(metadata, handle, indent=1)
+        cv_results.to_csv(os.path.join(output_dir, 'cv_results.csv'), index=False)
+
+    return {
+        'model': model,
+        'cv_results': cv_results,
+        'best': best,
+        'features': design['features'],
+        'path': path,
+        'search_seconds': search_seconds,
+        'refit_seconds': refit_seconds
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the opi_purchased? model with a cross-validated sweep')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--output-dir', default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--synthetic-rows', type=int, default=None,
+                        help='train on a resampled panel of this many rows instead')
+    parser.add_argument('--cv', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--search-rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data)
+    if args.synthetic_rows:
+        data = synthetic_panel(data, args.synthetic_rows, seed=0)
+    result = train_purchase_model(data, cv=args.cv, n_jobs=args.n_jobs, search_rows=args.search_rows,
+                                  output_dir=args.output_dir)
+    print(result['cv_results'].to_string(index=False))
+    print(f"Best: {result['best']['model']} (ROC AUC {result['best']['mean_roc_auc']:.3f}); sweep "
+          f"{result['search_seconds']:.1f}s, refit {result['refit_seconds']:.1f}s, saved to {result['path']}")
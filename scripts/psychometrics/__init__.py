@@ -0,0 +1,16 @@
+# src/psychometrics/__init__.py
+
+from .reliability import (cronbach_alpha, reliability_analysis, bootstrap_reliability, alpha_from_covariance,
+                          alpha_confidence_interval, item_covariance, alpha_assessment)
+from .efa import (exploratory_factor_analysis, item_correlation, kmo, bartlett_sphericity, eigenvalues,
+                  parallel_analysis, extract_factors, rotate, varimax, promax)
+from .scores import construct_scores, score_definitions, ConstructScores, clear_score_cache
+
+
+__all__ = [
+    'cronbach_alpha', 'reliability_analysis', 'bootstrap_reliability', 'alpha_from_covariance',
+    'alpha_confidence_interval', 'item_covariance', 'alpha_assessment',
+    'exploratory_factor_analysis', 'item_correlation', 'kmo', 'bartlett_sphericity', 'eigenvalues',
+    'parallel_analysis', 'extract_factors', 'rotate', 'varimax', 'promax',
+    'construct_scores', 'score_definitions', 'ConstructScores', 'clear_score_cache'
+]
@@ -0,0 +1,78 @@
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .reliability import cronbach_alpha, reliability_analysis
+from ..data_io.paths import DEFAULT_DATA_PATH
+from ..EDA_src.constructs import AVERAGED_CONSTRUCTS, create_construct_groups
+
+NAN_POLICIES = ('pairwise', 'listwise')
+
+
+def with_missing_items(df, items, fraction, seed=0):
+    """Copy of ``df`` with ``fraction`` of the item values set to NaN at random"""
+    df = df.copy()
+    values = df[items].to_numpy(dtype=np.float64, copy=True)
+    values[np.random.default_rng(seed).random(values.shape) < fraction] = np.nan
+    df[items] = values
+    return df
+
+
+def compare_with_pingouin(df, constructs, ci=0.95):
+    """
+    Alpha and CI of every construct under both NaN policies, from
+    ``reliability_analysis`` and ``cronbach_alpha`` next to
+    ``pingouin.cronbach_alpha``. pingouin rounds its CI to 3 decimals, and
+    its listwise CI keeps the row count before dropping, so the listwise
+    reference is pingouin on the construct's complete rows.
+    """
+    import pingouin as pg
+
+    rows = []
+    for nan_policy in NAN_POLICIES:
+        summary = reliability_analysis(df, constructs, nan_policy=nan_policy, ci=ci)['summary']
+        for record in summary.to_dict('records'):
+            data = df[constructs[record['construct']]]
+            complete = data.dropna(axis=0, how='any') if nan_policy == 'listwise' else data
+            reference, reference_ci = pg.cronbach_alpha(data=complete, nan_policy=nan_policy, ci=ci)
+            alpha, alpha_ci = cronbach_alpha(data, nan_policy=nan_policy, ci=ci)
+            rows.append({
+                'nan_policy': nan_policy,
+                'construct': record['construct'],
+                'n_obs': record['n_obs'],
+                'pingouin_alpha': reference,
+                'alpha_diff': abs(record['alpha'] - reference),
+                'ci_diff': np.abs(np.round([record['ci_lower'], record['ci_upper']], 3) - reference_ci).max(),
+                'cronbach_alpha_diff': max(abs(alpha - reference), np.abs(alpha_ci - reference_ci).max())
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check construct reliability against pingouin')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--missing', type=float, default=0.03, help='fraction of item values set to NaN')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tol', type=float, default=1e-9)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    groups = create_construct_groups(df)
+    constructs = {name: groups[name] for name in AVERAGED_CONSTRUCTS + ['opi']}
+    items = [item for columns in constructs.values() for item in columns]
+
+    failed = False
+    frames = [('complete', df), (f'{args.missing:.0%} missing', with_missing_items(df, items, args.missing, args.seed))]
+    for label, frame in frames:
+        result = compare_with_pingouin(frame, constructs)
+        worst = result[['alpha_diff', 'ci_diff', 'cronbach_alpha_diff']].max()
+        ok = bool((worst <= args.tol).all()) and not result.isna().any().any()
+        failed |= not ok
+        print(f"{label}: {'ok' if ok else 'MISMATCH'} "
+              f"(max |d alpha| {worst['alpha_diff']:.2e}, max |d CI| {worst['ci_diff']:.2e}, "
+              f"cronbach_alpha {worst['cronbach_alpha_diff']:.2e})")
+        if not ok:
+            print(result.to_string(index=False))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,339 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.optimize import minimize
+
+EXTRACTION_METHODS = ('minres', 'ml')
+ROTATIONS = (None, 'varimax', 'promax')
+
+
+def item_correlation(df, items):
+    """
+    Correlation matrix of ``items`` over the complete rows (listwise), with
+    the number of rows behind it. Every EFA statistic is derived from it.
+    """
+    X = df[items].dropna(axis=0, how='any').to_numpy(dtype=np.float64)
+    Z = X - X.mean(axis=0)
+    Z /= np.sqrt((Z * Z).sum(axis=0))
+    return Z.T @ Z, X.shape[0]
+
+
+def kmo(corr):
+    """
+    Kaiser-Meyer-Olkin sampling adequacy per item and overall, from the
+    correlation matrix and the partial correlations of its inverse
+    """
+    inverse = np.linalg.inv(corr)
+    scale = np.sqrt(np.diag(inverse))
+    partial = -inverse / np.outer(scale, scale)
+    r2 = corr ** 2
+    p2 = partial ** 2
+    np.fill_diagonal(r2, 0.0)
+    np.fill_diagonal(p2, 0.0)
+    r2_sums, p2_sums = r2.sum(axis=0), p2.sum(axis=0)
+    return r2_sums / (r2_sums + p2_sums), r2.sum() / (r2.sum() + p2.sum())
+
+
+def bartlett_sphericity(corr, n):
+    """
+    Bartlett's test that the correlation matrix is an identity matrix;
+    returns (chi-square, p-value)
+    """
+    p = corr.shape[0]
+    _, logdet = np.linalg.slogdet(corr)
+    statistic = -logdet * (n - 1 - (2 * p + 5) / 6)
+    return statistic, stats.chi2.sf(statistic, p * (p - 1) / 2)
+
+
+def eigenvalues(corr):
+    """Eigenvalues of a correlation matrix, largest first"""
+    return np.linalg.eigvalsh(corr)[::-1]
+
+
+def _smc(corr):
+    """Squared multiple correlation of each item with all the others (batched over leading axes)"""
+    return 1.0 - 1.0 / np.diagonal(np.linalg.inv(corr), axis1=-2, axis2=-1)
+
+
+def _random_eigenvalues(task):
+    """
+    Eigenvalues of ``n_iter`` random-normal correlation matrices of shape
+    (n, p), generated and decomposed ``batch_size`` at a time along a batch axis
+    """
+    seed, n_iter, n, p, kind, batch_size = task
+    rng = np.random.default_rng(seed)
+    values = []
+    for start in range(0, n_iter, batch_size):
+        size = min(batch_size, n_iter - start)
+        Z = rng.standard_normal((size, n, p))
+        Z -= Z.mean(axis=1, keepdims=True)
+        Z /= np.sqrt((Z * Z).sum(axis=1, keepdims=True))
+        corr = np.matmul(Z.transpose(0, 2, 1), Z)
+        if kind == 'fa':
+            diag = np.arange(p)
+            corr[:, diag, diag] = _smc(corr)
+        values.append(np.linalg.eigvalsh(corr)[:, ::-1])
+    return np.concatenate(values)
+
+
+def parallel_analysis(n_obs, n_items, observed=None, n_iter=100, percentile=95, kind='pca', batch_size=25,
+                      n_jobs=1, seed=None):
+    """
+    Horn's parallel analysis.
+
+    ``n_iter`` random-normal data sets of shape (``n_obs``, ``n_items``) are
+    drawn; their correlation matrices are built and eigen-decomposed in
+    batches along a leading axis, and the iterations are split over
+    ``n_jobs`` processes (all cores with -1), each with its own seed
+    spawned from ``seed``. ``kind='fa'`` uses the reduced matrices (SMC on
+    the diagonal), in which case ``observed`` should be the reduced
+    eigenvalues as well.
+
+    Returns a dict with the 'mean' and ``percentile`` random eigenvalues
+    and, when ``observed`` eigenvalues are given, 'n_factors': the number of
+    leading observed eigenvalues above the random percentile.
+    """
+    if kind not in ('pca', 'fa'):
+        raise ValueError("kind must be 'pca' or 'fa'")
+    n_workers = n_jobs if n_jobs not in (None, -1) else (os.cpu_count() or 1)
+    n_workers = max(1, min(n_workers, n_iter))
+    splits = [len(part) for part in np.array_split(np.arange(n_iter), n_workers)]
+    seeds = np.random.SeedSequence(seed).spawn(n_workers)
+    tasks = [(seeds[i], splits[i], n_obs, n_items, kind, batch_size) for i in range(n_workers)]
+
+    if n_workers == 1:
+        random_values = _random_eigenvalues(tasks[0])
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            random_values = np.concatenate(list(pool.map(_random_eigenvalues, tasks)))
+
+    result = {
+        'mean': random_values.mean(axis=0),
+        'percentile': np.percentile(random_values, percentile, axis=0),
+        'n_iter': n_iter
+    }
+    if observed is not None:
+        above = np.asarray(observed) > result['percentile']
+        result['n_factors'] = int(np.argmin(above)) if not above.all() else len(above)
+    return result
+
+
+def _minres_objective(psi, corr, n_factors):
+    """
+    Sum of squared residuals of ``corr`` (communalities 1 - psi on the
+    diagonal) around its rank-n_factors eigen approximation, and its
+    analytic gradient: each eigenvalue moves by -v_ij^2 per unit of psi_i.
+    """
+    reduced = corr.copy()
+    np.fill_diagonal(reduced, 1 - psi)
+    values, vectors = np.linalg.eigh(reduced)
+    values, vectors = values[::-1], vectors[:, ::-1]
+    fitted = np.zeros_like(values)
+    fitted[:n_factors] = np.maximum(values[:n_factors], np.finfo(float).eps * 100)
+    residual = values - fitted
+    return (residual ** 2).sum(), -2 * (vectors ** 2) @ residual
+
+
+def _ml_objective(psi, corr, n_factors):
+    """
+    Maximum-likelihood discrepancy (as in R's factanal) and its analytic
+    gradient diag(Lambda Lambda' + Psi - R) / psi^2
+    """
+    scale = 1 / np.sqrt(psi)
+    sstar = corr * np.outer(scale, scale)
+    values, vectors = np.linalg.eigh(sstar)
+    values, vectors = values[::-1], vectors[:, ::-1]
+    rest = values[n_factors:]
+    error = -(np.sum(np.log(rest) - rest) - n_factors + corr.shape[0])
+
+    loadings = np.sqrt(psi)[:, None] * vectors[:, :n_factors] * np.sqrt(np.maximum(values[:n_factors] - 1, 0))
+    gradient = ((loadings ** 2).sum(axis=1) + psi - np.diag(corr)) / psi ** 2
+    return error, gradient
+
+
+def _loadings(psi, corr, n_factors, method):
+    """Unrotated loadings at the optimal uniquenesses"""
+    if method == 'ml':
+        scale = 1 / np.sqrt(psi)
+        values, vectors = np.linalg.eigh(corr * np.outer(scale, scale))
+        values, vectors = values[::-1][:n_factors], vectors[:, ::-1][:, :n_factors]
+        return np.sqrt(psi)[:, None] * vectors * np.sqrt(np.maximum(values - 1, 0))
+    reduced = corr.copy()
+    np.fill_diagonal(reduced, 1 - psi)
+    values, vectors = np.linalg.eigh(reduced)
+    values, vectors = values[::-1][:n_factors], vectors[:, ::-1][:, :n_factors]
+    return vectors * np.sqrt(np.maximum(values, 0))
+
+
+def extract_factors(corr, n_factors, method='minres', bounds=(0.005, 1), max_iter=1000):
+    """
+    Minres (unweighted least squares) or maximum-likelihood factor
+    extraction from a correlation matrix. The uniquenesses start at 1 - SMC
+    and are optimized with L-BFGS-B using the analytic gradient of the
+    objective. Returns a dict with the unrotated 'loadings', the
+    'uniquenesses' and whether the optimizer 'converged'.
+    """
+    if method not in EXTRACTION_METHODS:
+        raise ValueError(f"method must be one of {EXTRACTION_METHODS}")
+    objective = _ml_objective if method == 'ml' else _minres_objective
+    start = 1 - _smc(corr)
+    result = minimize(objective, start, args=(corr, n_factors), jac=True, method='L-BFGS-B',
+                      bounds=[bounds] * corr.shape[0], options={'maxiter': max_iter})
+    if not result.success:
+        warnings.warn(f"Factor extraction did not converge: {result.message}")
+    return {
+        'loadings': _loadings(result.x, corr, n_factors, method),
+        'uniquenesses': result.x,
+        'converged': bool(result.success)
+    }
+
+
+def varimax(loadings, normalize=True, max_iter=1000, tol=1e-5):
+    """
+    Varimax rotation (with Kaiser row normalization by default); returns the
+    rotated loadings and the rotation matrix
+    """
+    X = loadings.copy()
+    n_rows, n_cols = X.shape
+    if normalize:
+        norms = np.sqrt((X ** 2).sum(axis=1))
+        X = X / norms[:, None]
+
+    rotation = np.eye(n_cols)
+    d = 0
+    for _ in range(max_iter):
+        old_d = d
+        basis = X @ rotation
+        transformed = X.T @ (basis ** 3 - basis * ((basis ** 2).sum(axis=0) / n_rows))
+        U, S, Vt = np.linalg.svd(transformed)
+        rotation = U @ Vt
+        d = S.sum()
+        if d < old_d * (1 + tol):
+            break
+
+    X = X @ rotation
+    if normalize:
+        X = X * norms[:, None]
+    return X, rotation
+
+
+def promax(loadings, normalize=True, power=4, max_iter=1000, tol=1e-5):
+    """
+    Promax (oblique) rotation built on varimax; returns the rotated
+    loadings, the rotation matrix and the factor correlations (phi)
+    """
+    if normalize:
+        h2 = (loadings ** 2).sum(axis=1)[:, None]
+        weights = loadings / np.sqrt(h2)
+    else:
+        weights = loadings.copy()
+
+    X, rotation = varimax(weights, normalize=normalize, max_iter=max_iter, tol=tol)
+    Y = X * np.abs(X) ** (power - 1)
+    coef = np.linalg.solve(X.T @ X, X.T @ Y)
+    try:
+        diag_inv = np.diag(np.linalg.inv(coef.T @ coef))
+    except np.linalg.LinAlgError:
+        diag_inv = np.diag(np.linalg.pinv(coef.T @ coef))
+    coef = coef * np.sqrt(diag_inv)
+    z = X @ coef
+    if normalize:
+        z = z * np.sqrt(h2)
+
+    coef_inv = np.linalg.inv(coef)
+    return z, rotation @ coef, coef_inv @ coef_inv.T
+
+
+def rotate(loadings, method='varimax', **kwargs):
+    """
+    Rotate a loading matrix; returns (loadings, phi) where phi is the factor
+    correlation matrix of an oblique rotation (None otherwise). Single-factor
+    solutions are returned unrotated.
+    """
+    if method not in ROTATIONS:
+        raise ValueError(f"rotation must be one of {ROTATIONS}")
+    if method is None or loadings.shape[1] < 2:
+        return loadings, None
+    if method == 'varimax':
+        return varimax(loadings, **kwargs)[0], None
+    rotated, _, phi = promax(loadings, **kwargs)
+    return rotated, phi
+
+
+def exploratory_factor_analysis(df, items, n_factors=None, method='minres', rotation='varimax', retention='parallel',
+                                n_iter=100, percentile=95, n_jobs=1, seed=None, output_path=None):
+    """
+    Full EFA of ``items`` from one correlation matrix.
+
+    The correlation matrix is computed once; KMO, Bartlett's test, the
+    eigenvalues and the starting uniquenesses are all derived from it. When
+    ``n_factors`` is None it is chosen by ``retention``: 'parallel' (Horn's
+    parallel analysis, see ``parallel_analysis``) or 'kaiser' (eigenvalues
+    greater than 1). Factors are extracted with 'minres' or 'ml' and rotated
+    with 'varimax', 'promax' or None. As in factor_analyzer, factor signs
+    are flipped to positive column sums and factors are ordered by the
+    variance they explain.
+
+    Returns a dict of the statistics and the 'loadings' DataFrame (items x
+    'Factor i'), which is also written to ``output_path`` when given (the
+    ``factor_loadings.csv`` format of the reliability notebook).
+    """
+    items = list(items)
+    corr, n = item_correlation(df, items)
+    kmo_per_item, kmo_total = kmo(corr)
+    bartlett_chi2, bartlett_p = bartlett_sphericity(corr, n)
+    observed = eigenvalues(corr)
+
+    parallel = None
+    kaiser_factors = int((observed > 1).sum())
+    if n_factors is None:
+        if retention == 'parallel':
+            parallel = parallel_analysis(n, len(items), observed=observed, n_iter=n_iter, percentile=percentile,
+                                         n_jobs=n_jobs, seed=seed)
+            n_factors = max(parallel['n_factors'], 1)
+        elif retention == 'kaiser':
+            n_factors = max(kaiser_factors, 1)
+        else:
+            raise ValueError("retention must be 'parallel' or 'kaiser'")
+
+    extraction = extract_factors(corr, n_factors, method=method)
+    loadings, phi = rotate(extraction['loadings'], rotation)
+
+    if n_factors > 1:
+        signs = np.sign(loadings.sum(axis=0))
+        signs[signs == 0] = 1
+        loadings = loadings * signs
+        if phi is not None:
+            phi = phi * np.outer(signs, signs)
+    order = np.argsort((loadings ** 2).sum(axis=0))[::-1]
+    loadings = loadings[:, order]
+    if phi is not None:
+        phi = phi[np.ix_(order, order)]
+
+    factor_names = [f'Factor {i+1}' for i in range(n_factors)]
+    loadings_df = pd.DataFrame(loadings, index=items, columns=factor_names)
+    if output_path is not None:
+        loadings_df.to_csv(output_path)
+
+    communalities = (loadings ** 2).sum(axis=1) if phi is None else np.diag(loadings @ phi @ loadings.T)
+    return {
+        'n_obs': n,
+        'correlation': pd.DataFrame(corr, index=items, columns=items),
+        'kmo': kmo_total,
+        'kmo_per_item': pd.Series(kmo_per_item, index=items),
+        'bartlett_chi2': bartlett_chi2,
+        'bartlett_p': bartlett_p,
+        'eigenvalues': observed,
+        'kaiser_factors': kaiser_factors,
+        'parallel': parallel,
+        'n_factors': n_factors,
+        'loadings': loadings_df,
+        'uniquenesses': pd.Series(extraction['uniquenesses'], index=items),
+        'communalities': pd.Series(communalities, index=items),
+        'phi': None if phi is None else pd.DataFrame(phi, index=factor_names, columns=factor_names),
+        'converged': extraction['converged']
+    }
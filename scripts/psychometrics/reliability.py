@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import f
+
+
+def alpha_assessment(alpha):
+    """
+    Conventional label for a Cronbach's alpha value
+    """
+    if alpha >= 0.9:
+        return "Excellent"
+    elif alpha >= 0.8:
+        return "Good"
+    elif alpha >= 0.7:
+        return "Acceptable"
+    elif alpha >= 0.6:
+        return "Questionable"
+    elif alpha >= 0.5:
+        return "Poor"
+    return "Unacceptable"
+
+
+def item_covariance(df, items, nan_policy='pairwise'):
+    """
+    Covariance matrix of ``items`` computed once for all constructs.
+    'pairwise' uses all available pairs (like pingouin's default), 'listwise'
+    drops incomplete rows first. Returns the matrix as an ndarray.
+    """
+    if nan_policy not in ('pairwise', 'listwise'):
+        raise ValueError("nan_policy must be 'pairwise' or 'listwise'")
+    data = df[items]
+    if not data.isna().to_numpy().any():
+        return np.atleast_2d(np.cov(data.to_numpy(dtype=np.float64), rowvar=False))
+    if nan_policy == 'listwise':
+        data = data.dropna(axis=0, how='any')
+    return data.cov().to_numpy()
+
+
+def alpha_from_covariance(cov):
+    """
+    Closed-form reliability statistics from item covariance matrices.
+
+    ``cov`` has shape (..., k, k); any leading axes are treated as a batch
+    (e.g. bootstrap replicates). Returns a dict of arrays with the alpha,
+    standardized alpha and average inter-item correlation (shape (...)), and
+    the corrected item-total correlations and alpha-if-item-deleted
+    (shape (..., k)). No item is ever refitted: removing item i changes the
+    total variance to ``T - 2 * rowsum_i + c_ii`` and the trace to
+    ``trace - c_ii``.
+    """
+    cov = np.asarray(cov, dtype=np.float64)
+    k = cov.shape[-1]
+    diag = np.diagonal(cov, axis1=-2, axis2=-1)
+    trace = diag.sum(axis=-1)
+    row_sums = cov.sum(axis=-1)
+    total = row_sums.sum(axis=-1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        alpha = (k / (k - 1)) * (1 - trace / total)
+
+        sd = np.sqrt(diag)
+        corr = cov / (sd[..., :, None] * sd[..., None, :])
+        mean_corr = (corr.sum(axis=(-2, -1)) - k) / (k * (k - 1))
+        std_alpha = k * mean_corr / (1 + (k - 1) * mean_corr)
+
+        rest_var = total[..., None] - 2 * row_sums + diag
+        rest_cov = row_sums - diag
+        item_total = rest_cov / np.sqrt(diag * rest_var)
+        if k > 2:
+            alpha_if_deleted = ((k - 1) / (k - 2)) * (1 - (trace[..., None] - diag) / rest_var)
+        else:
+            alpha_if_deleted = np.full(diag.shape, np.nan)
+
+    return {
+        'alpha': alpha,
+        'std_alpha': std_alpha,
+        'avg_corr': mean_corr,
+        'item_total_corr': item_total,
+        'alpha_if_deleted': alpha_if_deleted
+    }
+
+
+def alpha_confidence_interval(alpha, n, k, ci=0.95):
+    """
+    F-distribution confidence interval for alpha (Feldt), as in pingouin
+    """
+    tail = 1 - ci
+    df1 = n - 1
+    df2 = df1 * (k - 1)
+    lower = 1 - (1 - alpha) * f.isf(tail / 2, df1, df2)
+    upper = 1 - (1 - alpha) * f.isf(1 - tail / 2, df1, df2)
+    return lower, upper
+
+
+def cronbach_alpha(data, nan_policy='pairwise', ci=0.95):
+    """
+    Cronbach's alpha of the columns of ``data`` with its confidence interval.
+    Drop-in for ``pingouin.cronbach_alpha(data=...)`` and the local
+    reimplementations in the hypothesis notebooks. With 'listwise' the CI
+    uses the number of complete rows (pingouin keeps the row count before
+    dropping).
+    """
+    data = pd.DataFrame(data)
+    if nan_policy == 'listwise':
+        data = data.dropna(axis=0, how='any')
+    n, k = data.shape
+    if k < 2:
+        raise ValueError("Need at least 2 items to calculate reliability")
+    stats = alpha_from_covariance(item_covariance(data, list(data.columns), nan_policy))
+    alpha = float(stats['alpha'])
+    lower, upper = alpha_confidence_interval(alpha, n, k, ci)
+    return alpha, np.round([lower, upper], 3)
+
+
+def _construct_slices(constructs, available):
+    """Keep the items present in the data; skip constructs with fewer than 2 items"""
+    slices = {}
+    all_items = []
+    for name, items in constructs.items():
+        present = [item for item in items if item in available]
+        if len(present) < 2:
+            continue
+        positions = []
+        for item in present:
+            if item not in all_items:
+                all_items.append(item)
+            positions.append(all_items.index(item))
+        slices[name] = (present, np.asarray(positions))
+    return slices, all_items
+
+
+def _complete_row_groups(df, slices, all_items):
+    """
+    Group constructs by the rows that are complete on their own items.
+    Returns a list of (row mask, construct names); without missing values
+    every construct lands in one group covering all rows.
+    """
+    observed = df[all_items].notna().to_numpy()
+    groups = {}
+    for name, (_, positions) in slices.items():
+        rows = observed[:, positions].all(axis=1)
+        key = np.packbits(rows).tobytes()
+        if key not in groups:
+            groups[key] = (rows, [])
+        groups[key][1].append(name)
+    return list(groups.values())
+
+
+def reliability_analysis(df, constructs, nan_policy='pairwise', ci=0.95):
+    """
+    Reliability of every construct from a single covariance matrix over all
+    construct items. With 'listwise', constructs are computed on the rows
+    complete on their own items (one covariance per distinct set of rows),
+    and the CI uses that number of rows.
+
+    Returns a dict with:
+    - 'summary': construct, n_items, n_obs, alpha, CI, std_alpha, avg_corr, assessment
+    - 'items': construct, item, corrected item-total correlation, alpha if deleted
+    - 'covariance': the shared item covariance matrix (pairwise complete)
+    """
+    if nan_policy not in ('pairwise', 'listwise'):
+        raise ValueError("nan_policy must be 'pairwise' or 'listwise'")
+    slices, all_items = _construct_slices(constructs, set(df.columns))
+    cov = item_covariance(df, all_items, 'pairwise')
+    blocks = {name: (cov[np.ix_(positions, positions)], len(df)) for name, (_, positions) in slices.items()}
+    if nan_policy == 'listwise':
+        for rows, names in _complete_row_groups(df, slices, all_items):
+            if rows.all():
+                continue
+            columns = np.unique(np.concatenate([slices[name][1] for name in names]))
+            group_cov = item_covariance(df.loc[rows], [all_items[i] for i in columns], 'pairwise')
+            for name in names:
+                positions = np.searchsorted(columns, slices[name][1])
+                blocks[name] = (group_cov[np.ix_(positions, positions)], int(rows.sum()))
+
+    summary_rows = []
+    item_rows = []
+    for name, (items, positions) in slices.items():
+        block, n = blocks[name]
+        stats = alpha_from_covariance(block)
+        alpha = float(stats['alpha'])
+        lower, upper = alpha_confidence_interval(alpha, n, len(items), ci)
+        summary_rows.append({
+            'construct': name,
+            'n_items': len(items),
+            'n_obs': n,
+            'alpha': alpha,
+            'ci_lower': lower,
+            'ci_upper': upper,
+            'std_alpha': float(stats['std_alpha']),
+            'avg_corr': float(stats['avg_corr']),
+            'assessment': alpha_assessment(alpha)
+        })
+        for item, item_total, if_deleted in zip(items, stats['item_total_corr'], stats['alpha_if_deleted']):
+            item_rows.append({
+                'construct': name,
+                'item': item,
+                'item_total_corr': item_total,
+                'alpha_if_deleted': if_deleted
+            })
+
+    return {
+        'summary': pd.DataFrame(summary_rows),
+        'items': pd.DataFrame(item_rows),
+        'covariance': pd.DataFrame(cov, index=all_items, columns=all_items)
+    }
+
+
+def _weighted_covariances(X, weights):
+    """
+    Covariance matrices of ``X`` (n, p) under each row of frequency ``weights`` (B, n)
+    """
+    totals = weights.sum(axis=1)
+    means = weights @ X / totals[:, None]
+    cross = np.matmul(X.T[None, :, :] * weights[:, None, :], X)
+    cross -= totals[:, None, None] * means[:, :, None] * means[:, None, :]
+    return cross / (totals - 1)[:, None, None]
+
+
+def bootstrap_reliability(df, constructs, n_boot=1000, ci=0.95, seed=None, batch_size=128):
+    """
+    Bootstrap percentile intervals for every construct's alpha and standardized
+    alpha. Resamples are drawn as multinomial frequency weights, their
+    covariance matrices are built in batches and all statistics come from the
+    closed-form expressions of ``alpha_from_covariance``. Each construct drops
+    the rows incomplete on its own items (listwise); constructs sharing the
+    same complete rows share their resamples.
+    """
+    slices, all_items = _construct_slices(constructs, set(df.columns))
+    values = df[all_items].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(seed)
+
+    alphas = {name: [] for name in slices}
+    std_alphas = {name: [] for name in slices}
+    for rows, names in _complete_row_groups(df, slices, all_items):
+        columns = np.unique(np.concatenate([slices[name][1] for name in names]))
+        local = {name: np.searchsorted(columns, slices[name][1]) for name in names}
+        X = values[rows][:, columns]
+        n = X.shape[0]
+        X = X - X.mean(axis=0)
+        for start in range(0, n_boot, batch_size):
+            size = min(batch_size, n_boot - start)
+            weights = rng.multinomial(n, np.full(n, 1.0 / n), size=size).astype(np.float64)
+            covs = _weighted_covariances(X, weights)
+            for name in names:
+                positions = local[name]
+                stats = alpha_from_covariance(covs[:, positions[:, None], positions[None, :]])
+                alphas[name].append(stats['alpha'])
+                std_alphas[name].append(stats['std_alpha'])
+
+    tail = 100 * (1 - ci) / 2
+    rows = []
+    for name in slices:
+        boot_alpha = np.concatenate(alphas[name])
+        boot_std = np.concatenate(std_alphas[name])
+        rows.append({
+            'construct': name,
+            'alpha_mean': boot_alpha.mean(),
+            'alpha_ci_lower': np.percentile(boot_alpha, tail),
+            'alpha_ci_upper': np.percentile(boot_alpha, 100 - tail),
+            'std_alpha_ci_lower': np.percentile(boot_std, tail),
+            'std_alpha_ci_upper': np.percentile(boot_std, 100 - tail)
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ..data_io.paths import DEFAULT_DATA_PATH
+
+SCORE_CACHE_VERSION = 1
+DEFAULT_SCORE_CACHE = os.path.join(os.path.dirname(DEFAULT_DATA_PATH), '.construct_scores')
+SCORE_FORMS = ('raw', 'imputed', 'standardized')
+
+# Likert constructs scored as composites, and their item prefixes
+SCORED_CONSTRUCTS = {
+    'peou': 'peou_', 'pu': 'pu_', 'sa': 'sa_', 'si': 'si_',
+    'att': 'att_', 'risk': 'risk_', 'opi': 'opi_'
+}
+
+_MEMORY_CACHE = OrderedDict()
+_MAX_CACHED_SCORES = 16
+
+
+def score_definitions(columns):
+    """
+    Composite definitions for every construct and sub-dimension found in
+    ``columns``: 'peou' holds all peou_ items, 'peou_navigation' the
+    peou_navigation_<k> items, and so on. Items without a numeric suffix
+    (e.g. opi_satisfaction) only enter their construct. One-hot and binary
+    columns such as 'opi_purchased?' and the '<construct>_avg' aggregates
+    are not Likert items and are skipped.
+    """
+    definitions = {}
+    for name, prefix in SCORED_CONSTRUCTS.items():
+        items = [col for col in columns if col.startswith(prefix) and not col.endswith('_avg')
+                 and re.fullmatch(r'[a-z_]+(_\d+)?', col)]
+        if not items:
+            continue
+        definitions[name] = items
+        for col in items:
+            match = re.fullmatch(rf'{prefix}([a-z_]+)_\d+', col)
+            if match:
+                definitions.setdefault(f'{name}_{match.group(1)}', []).append(col)
+    return definitions
+
+
+def _definition_hash(definitions):
+    payload = json.dumps([[name, list(items)] for name, items in definitions.items()])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _data_hash(X):
+    digest = hashlib.sha1(str(X.shape).encode('utf-8'))
+    digest.update(np.ascontiguousarray(X).view(np.uint8).ravel())
+    return digest.hexdigest()
+
+
+def _compute_scores(X, membership):
+    """
+    Raw, imputed and standardized composites of all definitions at once.
+
+    Raw scores are row means over the available items (NaN when none is
+    answered); imputed scores first fill each missing item with its column
+    mean; standardized scores are the imputed scores as z-scores (ddof=0,
+    like StandardScaler). Item sums and counts come from matmuls with the
+    (items x composites) membership matrix.
+    """
+    valid = ~np.isnan(X)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw = (np.where(valid, X, 0.0) @ membership) / (valid.astype(np.float64) @ membership)
+        column_sums = np.where(valid, X, 0.0).sum(axis=0)
+        column_means = column_sums / valid.sum(axis=0)
+        imputed = (np.where(valid, X, column_means) @ membership) / membership.sum(axis=0)
+        std = imputed.std(axis=0)
+        standardized = (imputed - imputed.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    return {'raw': raw, 'imputed': imputed, 'standardized': standardized}
+
+
+class ConstructScores:
+    """
+    Raw, imputed and standardized composite scores of a frame; each form
+    is a DataFrame (rows of the frame x composites)
+    """
+
+    def __init__(self, arrays, names, index, key):
+        self.names = list(names)
+        self.key = key
+        self.forms = {form: pd.DataFrame(arrays[form], index=index, columns=self.names) for form in SCORE_FORMS}
+
+    def __repr__(self):
+        return f'ConstructScores({len(self.names)} composites, key={self.key[:12]})'
+
+    def __getitem__(self, name):
+        return self.forms['raw'][name]
+
+    def frame(self, form='raw', names=None):
+        """All (or the selected) composites in one form"""
+        if form not in SCORE_FORMS:
+            raise ValueError(f"form must be one of {SCORE_FORMS}")
+        scores = self.forms[form]
+        return scores if names is None else scores[list(names)]
+
+    def get(self, name, form='raw'):
+        """One composite score as a Series"""
+        return self.frame(form)[name]
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, f'{key}.npz')
+
+
+def _read_disk(cache_dir, key):
+    path = _cache_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as stored:
+            if int(stored['version']) != SCORE_CACHE_VERSION:
+                return None
+            return {form: stored[form] for form in SCORE_FORMS}, stored['names'].tolist()
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_disk(cache_dir, key, arrays, names):
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = _cache_path(cache_dir, key) + '.tmp.npz'
+    np.savez(tmp_path, version=SCORE_CACHE_VERSION, names=np.array(names), **arrays)
+    os.replace(tmp_path, _cache_path(cache_dir, key))
+
+
+def construct_scores(df, definitions=None, cache_dir=DEFAULT_SCORE_CACHE, use_cache=True):
+    """
+    Composite scores of every construct and sub-dimension, computed once.
+
+    ``definitions`` maps score names to item lists (``score_definitions``
+    of the frame by default). Results are memoized under a key made of the
+    content hash of the items and the hash of the definitions: first in an
+    in-memory LRU of the last 16 results, then as an .npz file in
+    ``cache_dir`` (``None`` disables the disk cache). Returns a
+    ``ConstructScores``; ``scores.frame('standardized')`` or
+    ``scores.get('peou_navigation', 'imputed')`` give the forms.
+    """
+    if definitions is None:
+        definitions = score_definitions(df.columns)
+    definitions = {name: list(items) for name, items in definitions.items()}
+    items = list(dict.fromkeys(col for cols in definitions.values() for col in cols))
+    names = list(definitions)
+
+    X = df[items].to_numpy(dtype=np.float64, na_value=np.nan)
+    key = hashlib.sha1(f'{_data_hash(X)}:{_definition_hash(definitions)}'.encode('utf-8')).hexdigest()
+
+    if use_cache and key in _MEMORY_CACHE:
+        _MEMORY_CACHE.move_to_end(key)
+        arrays, names = _MEMORY_CACHE[key]
+        return ConstructScores(arrays, names, df.index, key)
+
+    stored = _read_disk(cache_dir, key) if use_cache and cache_dir else None
+    if stored is not None:
+        arrays, names = stored
+    else:
+        position = {col: i for i, col in enumerate(items)}
+        membership = np.zeros((len(items), len(names)))
+        for j, name in enumerate(names):
+            membership[[position[col] for col in definitions[name]], j] = 1.0
+        arrays = _compute_scores(X, membership)
+        if use_cache and cache_dir:
+            _write_disk(cache_dir, key, arrays, names)
+
+    if use_cache:
+        _MEMORY_CACHE[key] = (arrays, names)
+        if len(_MEMORY_CACHE) > _MAX_CACHED_SCORES:
+            _MEMORY_CACHE.popitem(last=False)
+    return ConstructScores(arrays, names, df.index, key)
+
+
+def clear_score_cache(cache_dir=DEFAULT_SCORE_CACHE, memory=True, disk=True):
+    """
+    Empty the in-memory LRU and/or remove the cached .npz files of ``cache_dir``
+    """
+    if memory:
+        _MEMORY_CACHE.clear()
+    if disk and cache_dir and os.path.isdir(cache_dir):
+        for filename in os.listdir(cache_dir):
+            if filename.endswith('.npz'):
+                os.remove(os.path.join(cache_dir, filename))
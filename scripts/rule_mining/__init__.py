@@ -0,0 +1,14 @@
+# src/rule_mining/__init__.py
+
+from .transactions import encode_transactions, prepare_transactions, item_domains, column_domain
+from .itemsets import frequent_itemsets, pack_transactions
+from .discretize import discretize_likert, classify_scales, bin_labels
+from .rules import generate_rules, label_rule_topics, item_topic_flags
+
+
+__all__ = [
+    'encode_transactions', 'prepare_transactions', 'item_domains', 'column_domain',
+    'frequent_itemsets', 'pack_transactions',
+    'discretize_likert', 'classify_scales', 'bin_labels',
+    'generate_rules', 'label_rule_topics', 'item_topic_flags'
+]
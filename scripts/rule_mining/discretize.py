@@ -0,0 +1,172 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+from .transactions import DOMAIN_PREFIXES
+
+RATING_PREFIXES = DOMAIN_PREFIXES['perception'] + DOMAIN_PREFIXES['outcome']
+
+# Highest point of the supported Likert scales; other columns fall back to quantile bins
+LIKERT_SCALES = (5, 7)
+
+# Right-closed bin edges per (scale, number of bins), as in the notebook's discretize_ratings
+LIKERT_EDGES = {
+    (5, 3): [0.5, 2.5, 3.5, 5.5],
+    (5, 5): [0.5, 1.5, 2.5, 3.5, 4.5, 5.5],
+    (7, 3): [0.5, 3, 5, 7.5],
+    (7, 5): [0.5, 2, 3.5, 4.5, 5.5, 7.5]
+}
+
+
+def bin_labels(num_bins):
+    """Semantic bin labels (Low/Medium/High, Very_Low..Very_High or Bin_<k>)"""
+    if num_bins == 3:
+        return ['Low', 'Medium', 'High']
+    if num_bins == 5:
+        return ['Very_Low', 'Low', 'Medium', 'High', 'Very_High']
+    return [f'Bin_{i+1}' for i in range(num_bins)]
+
+
+def classify_scales(mins, maxs):
+    """
+    Scale of every column from its min/max vectors: 5 for a 1-5 Likert
+    item, 7 for a 1-7 item and 0 for anything else
+    """
+    mins = np.asarray(mins, dtype=np.float64)
+    maxs = np.asarray(maxs, dtype=np.float64)
+    likert = (mins >= 1) & (maxs <= 7) & (maxs - mins <= 6)
+    return np.where(likert, np.where(maxs <= 5, 5, 7), 0)
+
+
+def scale_lookup(scale, num_bins):
+    """
+    256-slot lookup table from a rating (as uint8) to its bin code on a
+    1-``scale`` item; 0 (missing) and anything outside the scale map to -1
+    """
+    lut = np.full(256, -1, dtype=np.int8)
+    values = np.arange(1, scale + 1)
+    lut[values] = np.searchsorted(LIKERT_EDGES[(scale, 3 if num_bins == 3 else 5)], values, side='left') - 1
+    return lut
+
+
+def _take_codes(ratings, lut, chunk_cells=1 << 20):
+    """
+    ``np.take`` of a uint8 rating block into ``lut``, walked in memory order
+    one flat chunk at a time so the intp index buffer stays small
+    """
+    order = 'F' if ratings.flags['F_CONTIGUOUS'] and not ratings.flags['C_CONTIGUOUS'] else 'C'
+    ratings = np.asarray(ratings, order=order)
+    codes = np.empty(ratings.shape, dtype=np.int8, order=order)
+    flat, flat_codes = ratings.ravel(order='K'), codes.ravel(order='K')
+    for start in range(0, flat.size, chunk_cells):
+        np.take(lut, flat[start:start + chunk_cells], out=flat_codes[start:start + chunk_cells])
+    return codes
+
+
+def _rating_block(df, columns):
+    """The columns as one array in their own dtype (no float copy of int8 items)"""
+    block = df[columns].to_numpy()
+    if block.dtype.kind not in 'iuf':
+        block = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    return block
+
+
+def _fallback_codes(series, num_bins, labels):
+    """The notebook's quantile-then-equal-width bins for a non-Likert column"""
+    try:
+        bins = pd.qcut(series, q=num_bins, labels=labels, duplicates='drop')
+        if len(bins.unique()) < num_bins:
+            bins = pd.cut(series, bins=num_bins, labels=labels)
+    except ValueError:
+        bins = pd.cut(series, bins=num_bins, labels=labels)
+    return bins.cat.codes.to_numpy(dtype=np.int8)
+
+
+def discretize_likert(df, columns=None, num_bins=3, prefix='', output='category', ranges=None):
+    """
+    Vectorized drop-in for the rule-mining notebook's ``discretize_ratings``.
+
+    ``columns`` defaults to every numeric peou_/pu_/sa_/si_/att_/risk_/opi_
+    column. Their scales are classified once from a min/max vector
+    (``ranges``, a frame with 'min' and 'max' columns indexed by column
+    name such as ``describe().T`` or the streamed summaries, or one scan of
+    the block). Integer-valued Likert columns of a scale are binned together by
+    ``np.take`` into a 256-slot lookup table; non-integer Likert
+    columns (averages) use ``np.searchsorted`` on the same edges per scale,
+    and other numeric columns keep the notebook's quantile fallback.
+
+    Only the new ``f"{prefix}{col}_cat"`` columns are returned (join them
+    to the frame if needed; the input is never copied). ``output='category'``
+    gives ordered categoricals with the Low/Medium/High labels,
+    ``output='codes'`` one int8 block of bin codes with -1 for missing.
+    """
+    if output not in ('category', 'codes'):
+        raise ValueError("output must be 'category' or 'codes'")
+    if num_bins not in (3, 5):
+        raise ValueError("Likert scales are binned into 3 or 5 bins")
+    if columns is None:
+        columns = [col for col in df.columns if col.startswith(RATING_PREFIXES)]
+    columns = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+    labels = bin_labels(num_bins)
+
+    block = _rating_block(df, columns)
+    is_float = block.dtype.kind == 'f'
+    if ranges is not None:
+        mins = ranges['min'].reindex(columns).to_numpy(dtype=np.float64)
+        maxs = ranges['max'].reindex(columns).to_numpy(dtype=np.float64)
+    elif not len(block):
+        mins = maxs = np.full(len(columns), np.nan)
+    elif is_float:
+        with warnings.catch_warnings():
+            # All-missing columns have no range and are left to the fallback
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mins, maxs = np.nanmin(block, axis=0), np.nanmax(block, axis=0)
+    else:
+        mins, maxs = block.min(axis=0), block.max(axis=0)
+    scales = classify_scales(mins, maxs)
+
+    codes = np.full(block.shape, -1, dtype=np.int8)
+    likert = np.flatnonzero(scales > 0)
+    if is_float:
+        part = block[:, likert]
+        integral = np.all(np.isnan(part) | (part == np.round(part)), axis=0)
+    else:
+        integral = np.ones(len(likert), dtype=bool)
+
+    lut_columns = likert[integral]
+    for scale in LIKERT_SCALES:
+        cols = lut_columns[scales[lut_columns] == scale]
+        if not len(cols):
+            continue
+        values = block if len(cols) == block.shape[1] else block[:, cols]
+        if values.dtype.itemsize == 1 and values.dtype.kind in 'iu':
+            # Out-of-range int8 ratings land on -1 slots of the 256-slot table
+            ratings = values.view(np.uint8)
+        else:
+            with np.errstate(invalid='ignore'):
+                ratings = np.where((values >= 1) & (values <= 7), values, 0).astype(np.uint8)
+        coded = _take_codes(ratings, scale_lookup(scale, num_bins))
+        if len(cols) == block.shape[1]:
+            codes = coded
+        else:
+            codes[:, cols] = coded
+
+    edges_key = 3 if num_bins == 3 else 5
+    for scale in LIKERT_SCALES:
+        cols = likert[~integral][scales[likert[~integral]] == scale]
+        if len(cols):
+            values = block[:, cols]
+            edges = np.asarray(LIKERT_EDGES[(scale, edges_key)])
+            found = np.searchsorted(edges, values, side='left') - 1
+            inside = ~np.isnan(values) & (found >= 0) & (found < len(edges) - 1)
+            codes[:, cols] = np.where(inside, found, -1)
+
+    for j in np.flatnonzero(scales == 0):
+        codes[:, j] = _fallback_codes(df[columns[j]], num_bins, labels)
+
+    names = [f'{prefix}{col}_cat' for col in columns]
+    if output == 'codes':
+        return pd.DataFrame(codes, index=df.index, columns=names)
+    categories = pd.CategoricalDtype(labels, ordered=True)
+    return pd.DataFrame({name: pd.Categorical.from_codes(codes[:, j], dtype=categories)
+                         for j, name in enumerate(names)}, index=df.index)
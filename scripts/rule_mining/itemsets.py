@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Rows packed per block when building bitsets (a multiple of 64)
+PACK_BLOCK_ROWS = 1 << 16
+
+
+def _as_matrix(transactions):
+    """Return (matrix, items) where matrix is a dense bool array or CSR matrix"""
+    if isinstance(transactions, pd.DataFrame):
+        items = list(transactions.columns)
+        if all(isinstance(dtype, pd.SparseDtype) for dtype in transactions.dtypes):
+            return transactions.sparse.to_coo().tocsr().astype(bool), items
+        return transactions.to_numpy(dtype=bool), items
+    if sparse.issparse(transactions):
+        matrix = sparse.csr_matrix(transactions, dtype=bool)
+    else:
+        matrix = np.asarray(transactions, dtype=bool)
+    return matrix, list(range(matrix.shape[1]))
+
+
+def pack_transactions(transactions):
+    """
+    Pack the item columns of a boolean transaction matrix into bitsets.
+
+    ``transactions`` is a boolean DataFrame (dense or sparse, as returned by
+    ``encode_transactions``), a scipy sparse matrix or a 2-D array. Returns
+    ``(bits, items, n_transactions)`` where ``bits`` has one row of uint64
+    words per item; bit ``r`` of row ``i`` is set when transaction ``r``
+    holds item ``i``. Rows are packed in blocks, so a sparse input is never
+    densified as a whole.
+    """
+    matrix, items = _as_matrix(transactions)
+    n, k = matrix.shape
+    n_words = -(-n // 64)
+    bits = np.zeros((k, n_words), dtype=np.uint64)
+    as_bytes = bits.view(np.uint8)
+
+    for start in range(0, n, PACK_BLOCK_ROWS):
+        stop = min(start + PACK_BLOCK_ROWS, n)
+        block = matrix[start:stop]
+        if sparse.issparse(block):
+            block = block.toarray()
+        packed = np.packbits(block.T, axis=1, bitorder='little')
+        as_bytes[:, start // 8:start // 8 + packed.shape[1]] = packed
+    return bits, items, n
+
+
+def _popcount(bits):
+    return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+
+
+def _eclat(bits, counts, min_count, max_len, is_target, restrict):
+    """
+    Depth-first Eclat over bitsets. Each equivalence class intersects its
+    head with all remaining members in one vectorized AND + popcount.
+
+    With ``restrict`` the item order puts target items last, so an itemset
+    without a target item is kept (and expanded) only when one of its target
+    extensions is frequent. By anti-monotonicity nothing below a rejected
+    node can reach a frequent target superset, and the kept itemsets stay
+    closed under subsets, as ``association_rules`` needs.
+    """
+    found_items = []
+    found_counts = []
+
+    def expand(prefix, prefix_has_target, members, member_bits, member_counts):
+        for i, item in enumerate(members):
+            itemset = prefix + (item,)
+            has_target = prefix_has_target or is_target[item]
+            depth = len(itemset)
+
+            candidates = members[i + 1:]
+            candidate_bits = member_bits[i + 1:]
+            if max_len is not None and depth >= max_len:
+                candidates = candidates[:0]
+            elif restrict and not has_target and max_len is not None and depth == max_len - 1:
+                # Only a target item can still be added
+                keep = is_target[candidates]
+                candidates = candidates[keep]
+                candidate_bits = candidate_bits[keep]
+
+            if len(candidates):
+                new_bits = candidate_bits & member_bits[i]
+                new_counts = _popcount(new_bits)
+                frequent = new_counts >= min_count
+            else:
+                frequent = np.zeros(0, dtype=bool)
+
+            if restrict and not has_target and not (frequent & is_target[candidates]).any():
+                continue
+
+            found_items.append(itemset)
+            found_counts.append(member_counts[i])
+            if frequent.any():
+                expand(itemset, has_target, candidates[frequent], new_bits[frequent], new_counts[frequent])
+
+    frequent_items = np.flatnonzero(counts >= min_count)
+    # Rarest items first keeps the intersected bitsets sparse; targets go last
+    order = np.lexsort((counts[frequent_items], is_target[frequent_items]))
+    members = frequent_items[order]
+    expand((), False, members, bits[members], counts[members])
+    return found_items, found_counts
+
+
+def frequent_itemsets(transactions, min_support=0.1, max_len=None, consequent_prefixes=None,
+                      use_colnames=True):
+    """
+    Frequent itemsets of a boolean transaction matrix mined with bitset Eclat.
+
+    Items are packed into uint64 words and supports come from AND +
+    popcount over those words, so memory grows with the number of frequent
+    itemsets rather than with a dense candidate frame. ``max_len`` limits
+    the itemset size.
+
+    With ``consequent_prefixes`` (e.g. ``('opi_',)``) only the itemsets that
+    can take part in a rule whose consequent is a matching item are kept:
+    itemsets holding a matching item plus the antecedents needed for their
+    confidence.
+
+    Returns a DataFrame with ``support`` and ``itemsets`` (frozensets of
+    item names, or column positions when ``use_colnames=False``) in the
+    layout of mlxtend's ``apriori``, ready for ``association_rules``.
+    """
+    if not 0 < min_support <= 1:
+        raise ValueError("min_support must be in (0, 1]")
+    bits, items, n = pack_transactions(transactions)
+    if n == 0 or not items:
+        return pd.DataFrame({'support': pd.Series(dtype=np.float64), 'itemsets': pd.Series(dtype=object)})
+
+    counts = _popcount(bits)
+    min_count = int(np.ceil(min_support * n - 1e-9))
+    restrict = consequent_prefixes is not None
+    if restrict:
+        prefixes = (consequent_prefixes,) if isinstance(consequent_prefixes, str) else tuple(consequent_prefixes)
+        is_target = np.array([str(item).startswith(prefixes) for item in items], dtype=bool)
+    else:
+        is_target = np.zeros(len(items), dtype=bool)
+
+    found_items, found_counts = _eclat(bits, counts, min_count, max_len, is_target, restrict)
+
+    labels = items if use_colnames else list(range(len(items)))
+    lengths = np.array([len(itemset) for itemset in found_items], dtype=np.int64)
+    order = np.argsort(lengths, kind='stable')
+    return pd.DataFrame({
+        'support': np.asarray(found_counts, dtype=np.float64)[order] / n,
+        'itemsets': [frozenset(labels[i] for i in found_items[j]) for j in order]
+    })
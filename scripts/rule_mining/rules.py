@@ -0,0 +1,173 @@
+import heapq
+from itertools import count
+
+import numpy as np
+import pandas as pd
+
+# Topic flags checked against item names; the first matching topic wins
+TOPIC_ORDER = ['satisfaction', 'behavior', 'risk', 'platform', 'other']
+TOPIC_FLAGS = {
+    'satisfaction': 1,
+    'behavior': 2,
+    'risk': 4,
+    'platform': 8
+}
+PLATFORM_MARKERS = ('gecp_', 'gds_')
+
+
+def item_topic_flags(items):
+    """
+    Bit flags per item: satisfaction/behavior/risk/platform markers in its name
+    """
+    flags = np.zeros(len(items), dtype=np.uint8)
+    for i, item in enumerate(items):
+        name = str(item)
+        if 'satisfaction' in name:
+            flags[i] |= TOPIC_FLAGS['satisfaction']
+        if 'behavior' in name:
+            flags[i] |= TOPIC_FLAGS['behavior']
+        if 'risk' in name:
+            flags[i] |= TOPIC_FLAGS['risk']
+        if any(marker in name for marker in PLATFORM_MARKERS):
+            flags[i] |= TOPIC_FLAGS['platform']
+    return flags
+
+
+def _reduce_flags(flags, members):
+    """OR the item flags of every rule side; ``members`` is a list of index tuples"""
+    lengths = np.array([len(side) for side in members], dtype=np.int64)
+    if len(lengths) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    flat = np.fromiter((i for side in members for i in side), dtype=np.int64, count=int(lengths.sum()))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    return np.bitwise_or.reduceat(flags[flat], starts)
+
+
+def label_rule_topics(antecedent_flags, consequent_flags):
+    """
+    Vectorized topic of each rule: satisfaction or behavior in the
+    consequent, then risk on either side, then platform items in the
+    antecedent, otherwise 'other'
+    """
+    conditions = [
+        (consequent_flags & TOPIC_FLAGS['satisfaction']) > 0,
+        (consequent_flags & TOPIC_FLAGS['behavior']) > 0,
+        ((antecedent_flags | consequent_flags) & TOPIC_FLAGS['risk']) > 0,
+        (antecedent_flags & TOPIC_FLAGS['platform']) > 0
+    ]
+    return np.select(conditions, TOPIC_ORDER[:-1], default='other')
+
+
+def generate_rules(frequent_itemsets, consequents=None, min_confidence=0.7, min_lift=1.2, max_rules=1000):
+    """
+    Association rules whose consequent only holds target items.
+
+    ``consequents`` is a list of item names or name prefixes (e.g.
+    ``['opi_satisfaction', 'opi_behavior_change', 'risk_']``); None allows
+    any item. For every itemset the consequents are grown level-wise from
+    single target items, and only consequents whose rule passed
+    ``min_confidence`` are extended: moving an item from the antecedent to
+    the consequent can only lower the confidence, so this prunes exactly.
+    Rules passing ``min_lift`` go through a bounded min-heap that keeps the
+    ``max_rules`` rules with the highest lift, so memory stays O(max_rules).
+
+    ``frequent_itemsets`` must contain the support of every subset of its
+    itemsets (as returned by ``frequent_itemsets`` or mlxtend). Returns the
+    columns of mlxtend's ``association_rules`` plus a ``topic`` label,
+    sorted by lift.
+    """
+    itemsets = list(frequent_itemsets['itemsets'])
+    supports = frequent_itemsets['support'].to_numpy(dtype=np.float64)
+
+    items = sorted({item for itemset in itemsets for item in itemset}, key=str)
+    index = {item: i for i, item in enumerate(items)}
+    support_of = {frozenset(index[item] for item in itemset): support
+                  for itemset, support in zip(itemsets, supports)}
+
+    if consequents is None:
+        is_target = np.ones(len(items), dtype=bool)
+    else:
+        markers = tuple(consequents)
+        is_target = np.array([str(item).startswith(markers) for item in items], dtype=bool)
+
+    def lookup(itemset):
+        try:
+            return support_of[itemset]
+        except KeyError:
+            raise ValueError("frequent_itemsets is missing the support of a subset; "
+                             "mine it without post-filtering") from None
+
+    heap = []
+    tiebreak = count()
+    for itemset, support in support_of.items():
+        if len(itemset) < 2:
+            continue
+        level = [(item,) for item in sorted(itemset) if is_target[item]]
+        while level:
+            passed = []
+            for consequent in level:
+                if len(consequent) == len(itemset):
+                    continue
+                consequent_set = frozenset(consequent)
+                antecedent_set = itemset - consequent_set
+                antecedent_support = lookup(antecedent_set)
+                confidence = support / antecedent_support
+                if confidence < min_confidence:
+                    continue
+                passed.append(consequent)
+                consequent_support = lookup(consequent_set)
+                lift = confidence / consequent_support
+                if lift < min_lift:
+                    continue
+                entry = (lift, next(tiebreak), antecedent_set, consequent_set,
+                         antecedent_support, consequent_support, support, confidence)
+                if len(heap) < max_rules:
+                    heapq.heappush(heap, entry)
+                elif lift > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+
+            # Apriori-style join: only confident consequents are extended
+            passed_set = set(passed)
+            next_level = set()
+            for a in range(len(passed)):
+                for b in range(a + 1, len(passed)):
+                    if passed[a][:-1] != passed[b][:-1]:
+                        continue
+                    merged = passed[a] + (passed[b][-1],) if passed[a][-1] < passed[b][-1] \
+                        else passed[b] + (passed[a][-1],)
+                    if all(merged[:j] + merged[j + 1:] in passed_set for j in range(len(merged))):
+                        next_level.add(merged)
+            level = sorted(next_level)
+
+    entries = sorted(heap, key=lambda entry: (-entry[0], entry[1]))
+    columns = ['antecedents', 'consequents', 'antecedent support', 'consequent support',
+               'support', 'confidence', 'lift', 'leverage', 'conviction', 'topic']
+    if not entries:
+        return pd.DataFrame(columns=columns)
+
+    lift, _, antecedents, consequent_sets, antecedent_support, consequent_support, support, confidence = \
+        map(list, zip(*entries))
+    lift = np.array(lift)
+    antecedent_support = np.array(antecedent_support)
+    consequent_support = np.array(consequent_support)
+    support = np.array(support)
+    confidence = np.array(confidence)
+
+    flags = item_topic_flags(items)
+    topics = label_rule_topics(_reduce_flags(flags, [tuple(side) for side in antecedents]),
+                               _reduce_flags(flags, [tuple(side) for side in consequent_sets]))
+
+    with np.errstate(divide='ignore'):
+        conviction = np.where(confidence < 1, (1 - consequent_support) / (1 - confidence), np.inf)
+    return pd.DataFrame({
+        'antecedents': [frozenset(items[i] for i in side) for side in antecedents],
+        'consequents': [frozenset(items[i] for i in side) for side in consequent_sets],
+        'antecedent support': antecedent_support,
+        'consequent support': consequent_support,
+        'support': support,
+        'confidence': confidence,
+        'lift': lift,
+        'leverage': support - antecedent_support * consequent_support,
+        'conviction': conviction,
+        'topic': topics
+    }, columns=columns)
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Prefix -> item domain, checked in this order; anything else is demographic
+DOMAIN_PREFIXES = {
+    'perception': ('peou_', 'pu_', 'sa_', 'si_', 'att_', 'risk_'),
+    'outcome': ('opi_',),
+    'platform': ('gecp_', 'sos_', 'op_', 'fabr_', 'gds_')
+}
+DOMAIN_ORDER = ['perception', 'outcome', 'platform', 'demographic']
+
+ONE_HOT_LABELS = ['No', 'Yes']
+
+
+def column_domain(col):
+    """
+    Domain of a transaction column (perception, outcome, platform or demographic)
+    """
+    for domain, prefixes in DOMAIN_PREFIXES.items():
+        if col.startswith(prefixes):
+            return domain
+    return 'demographic'
+
+
+def item_domains(items):
+    """
+    Domain of every item. Items start with their source column name, so the
+    prefix map resolves them once per item rather than once per cell.
+    """
+    return pd.Series([column_domain(item) for item in items], index=pd.Index(items, name='item'), name='domain')
+
+
+def _column_codes(series, one_hot):
+    """
+    Integer codes (-1 for missing) and level labels of one column. One-hot
+    0/1 columns become the No/Yes labels used for the ``*_used`` columns.
+    """
+    if one_hot:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.where(np.isnan(values), -1, values).astype(np.int8)
+        return codes, ONE_HOT_LABELS
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), [str(level) for level in series.cat.categories]
+    codes, levels = pd.factorize(series, sort=True)
+    return codes, [str(level) for level in levels]
+
+
+def _balanced_truncation(present, domains, max_items):
+    """
+    Vectorized ``max_items_per_transaction``: rows with too many items keep
+    the first ``max_items // 4`` items of each domain (in column order), then
+    the first ``max_items`` of those
+    """
+    per_domain = max(1, max_items // 4)
+    order = np.argsort([DOMAIN_ORDER.index(domain) for domain in domains], kind='stable')
+    ordered = present[:, order]
+    domain_codes = np.array([DOMAIN_ORDER.index(domains[j]) for j in order])
+
+    rank = np.zeros(ordered.shape, dtype=np.int32)
+    for code in np.unique(domain_codes):
+        block = domain_codes == code
+        rank[:, block] = np.cumsum(ordered[:, block], axis=1, dtype=np.int32)
+    balanced = ordered & (rank <= per_domain)
+    balanced &= np.cumsum(balanced, axis=1, dtype=np.int32) <= max_items
+
+    too_long = ordered.sum(axis=1) > max_items
+    ordered = np.where(too_long[:, None], balanced, ordered)
+    result = np.empty_like(present)
+    result[:, order] = ordered
+    return result
+
+
+def encode_transactions(df, columns, one_hot_columns=(), min_occurrences=10,
+                        max_items_per_transaction=None, drop_empty=True, sparse_output=True):
+    """
+    Build the one-hot item matrix for rule mining straight from the columns.
+
+    Every value of ``columns`` (the ``*_cat`` columns of the discretized
+    frame, demographic categories, ...) becomes the item ``f"{col}_{value}"``.
+    Raw 0/1 platform columns in ``one_hot_columns`` become
+    ``f"{col}_used_Yes"``/``f"{col}_used_No"``. Items seen fewer than
+    ``min_occurrences`` times are dropped, items are sorted by name like
+    mlxtend's ``TransactionEncoder`` and empty transactions are dropped.
+
+    Returns a boolean DataFrame indexed by the original rows, backed by a
+    sparse matrix unless ``sparse_output=False``.
+    """
+    one_hot_columns = list(one_hot_columns)
+    sources = [(col, False) for col in columns] + [(col, True) for col in one_hot_columns]
+    n = len(df)
+
+    item_names = []
+    codes_by_column = []
+    domains = []
+    for col, one_hot in sources:
+        codes, levels = _column_codes(df[col], one_hot)
+        counts = np.bincount(codes[codes >= 0], minlength=len(levels))
+        name = f'{col}_used' if one_hot else col
+
+        # Lookup table from level code to global item id; slot -1 is "no item"
+        lut = np.full(len(levels) + 1, -1, dtype=np.int32)
+        for level, (label, count) in enumerate(zip(levels, counts)):
+            if count >= min_occurrences:
+                lut[level] = len(item_names)
+                item_names.append(f'{name}_{label}')
+        codes_by_column.append(lut[codes])
+        domains.append(column_domain(name))
+
+    item_ids = np.column_stack(codes_by_column) if codes_by_column else np.empty((n, 0), dtype=np.int32)
+    present = item_ids >= 0
+    if max_items_per_transaction and present.shape[1]:
+        present = _balanced_truncation(present, domains, max_items_per_transaction)
+
+    # Sort items by name and remap ids so columns follow TransactionEncoder order
+    order = np.argsort(np.array(item_names, dtype=object), kind='stable')
+    rename = np.empty(len(item_names), dtype=np.int32)
+    rename[order] = np.arange(len(item_names), dtype=np.int32)
+    items = [item_names[i] for i in order]
+
+    rows, cols = np.nonzero(present)
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=bool), (rows, rename[item_ids[rows, cols]])),
+                               shape=(n, len(items)))
+
+    if max_items_per_transaction:
+        # Truncation can leave items with no transaction at all
+        used = np.bincount(matrix.indices, minlength=len(items)) > 0
+        matrix = matrix[:, used]
+        items = [item for item, keep in zip(items, used) if keep]
+
+    index = df.index
+    if drop_empty:
+        keep = np.diff(matrix.indptr) > 0
+        matrix = matrix[keep]
+        index = index[keep]
+
+    if sparse_output:
+        return pd.DataFrame.sparse.from_spmatrix(matrix, index=index, columns=items)
+    return pd.DataFrame(matrix.toarray(), index=index, columns=items)
+
+
+def prepare_transactions(df, columns, min_occurrences=10, max_items_per_transaction=None):
+    """
+    Drop-in for the notebook's ``prepare_transactions``: dense boolean frame
+    with a fresh RangeIndex, one column per frequent item
+    """
+    encoded = encode_transactions(df, columns, min_occurrences=min_occurrences,
+                                  max_items_per_transaction=max_items_per_transaction,
+                                  sparse_output=False)
+    return encoded.reset_index(drop=True)